@@ -35,7 +35,14 @@ from fastoad.openmdao.problem import FASTOADProblem
 from fastoad.io import DataFile
 from fastoad.openmdao.variables import Variable, VariableList
 
-from fastoad.model_base import Atmosphere, AtmosphereSI, FlightPoint
+from fastoad.model_base import (
+    Atmosphere,
+    AtmosphereSI,
+    FlightPoint,
+    ScalarAtmosphereSI,
+    TabulatedAtmosphere,
+    TabulatedAtmosphereSI,
+)
 
 from fastoad.module_management.service_registry import (
     RegisterOpenMDAOSystem,
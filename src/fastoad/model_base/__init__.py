@@ -15,5 +15,12 @@ Base features for FAST-OAD models
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from .atmosphere import Atmosphere, AtmosphereSI
+from .atmosphere import (
+    Atmosphere,
+    AtmosphereSI,
+    AtmosphereTable,
+    ScalarAtmosphereSI,
+    TabulatedAtmosphere,
+    TabulatedAtmosphereSI,
+)
 from .flight_point import FlightPoint
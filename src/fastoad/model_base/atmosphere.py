@@ -14,8 +14,10 @@ Simple implementation of International Standard Atmosphere.
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from functools import lru_cache
+from math import sqrt
 from numbers import Number
-from typing import Sequence, Union
+from typing import Dict, Sequence, Tuple, Union
 
 import numpy as np
 from scipy.constants import R, atmosphere, foot
@@ -25,6 +27,7 @@ AIR_GAS_CONSTANT = R / AIR_MOLAR_MASS
 SEA_LEVEL_PRESSURE = atmosphere
 SEA_LEVEL_TEMPERATURE = 288.15
 TROPOPAUSE = 11000
+SEA_LEVEL_DENSITY = SEA_LEVEL_PRESSURE / AIR_GAS_CONSTANT / SEA_LEVEL_TEMPERATURE
 
 
 class Atmosphere:
@@ -254,3 +257,507 @@ class AtmosphereSI(Atmosphere):
     def altitude(self):
         """Altitude in meters."""
         return self.get_altitude(altitude_in_feet=False)
+
+
+def get_altitude_from_pressure(
+    pressure: Union[float, Sequence[float]]
+) -> Union[float, Sequence[float]]:
+    """
+    Computes the altitude where provided pressure is obtained, by inverting the pressure
+    formulas of :class:`Atmosphere`.
+
+    As pressure does not depend on temperature increment, the result is valid for any
+    value of delta_t.
+
+    Pressure formulas are slightly discontinuous at tropopause. Pressure values that are
+    between the two values at tropopause give the tropopause altitude.
+
+    :param pressure: pressure in Pa, as float or numpy array
+    :return: altitude in meters, with same shape as pressure
+    """
+    float_expected = isinstance(pressure, Number)
+    pressure = np.asarray(pressure, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tropo_altitude = 44330.78 * (1.0 - (pressure / SEA_LEVEL_PRESSURE) ** (1.0 / 5.25587611))
+        strato_altitude = (1.7345725 - np.log(pressure / 22632) / np.log(2.718281)) / 0.0001576883
+    altitude = np.where(
+        tropo_altitude < TROPOPAUSE, tropo_altitude, np.maximum(TROPOPAUSE, strato_altitude)
+    )
+
+    if float_expected:
+        return float(altitude)
+    return altitude
+
+
+#: Default altitude step, in meters, of :class:`AtmosphereTable`.
+DEFAULT_TABLE_ALTITUDE_STEP = 100.0
+
+#: Default minimum altitude, in meters, of :class:`AtmosphereTable`.
+DEFAULT_TABLE_MIN_ALTITUDE = -1000.0
+
+#: Default maximum altitude, in meters, of :class:`AtmosphereTable`.
+DEFAULT_TABLE_MAX_ALTITUDE = 25000.0
+
+#: Minimum altitude step, in meters, of :class:`AtmosphereTable` when defined by a tolerance.
+MIN_TABLE_ALTITUDE_STEP = 1.0
+
+#: Maximum number of tables kept by :meth:`AtmosphereTable.get` and
+#: :meth:`AtmosphereTable.get_for_tolerance`.
+TABLE_CACHE_SIZE = 32
+
+
+class AtmosphereTable:
+    """
+    Atmosphere properties precomputed on a regular altitude grid, for one temperature increment.
+
+    Temperature and speed of sound are interpolated linearly. Pressure, density and kinematic
+    viscosity are interpolated linearly in logarithmic scale. Tropopause is always a node of
+    the grid.
+
+    A table should be obtained with :meth:`get` or :meth:`get_for_tolerance`, so that it is
+    computed only once for a given set of parameters (the last :data:`TABLE_CACHE_SIZE` used
+    sets of parameters are kept).
+    """
+
+    #: Properties that are provided by the table.
+    PROPERTIES = ("temperature", "pressure", "density", "speed_of_sound", "kinematic_viscosity")
+
+    #: Properties that are interpolated in logarithmic scale.
+    LOG_SCALED_PROPERTIES = ("pressure", "density", "kinematic_viscosity")
+
+    def __init__(
+        self,
+        delta_t: float = 0.0,
+        altitude_step: float = DEFAULT_TABLE_ALTITUDE_STEP,
+        min_altitude: float = DEFAULT_TABLE_MIN_ALTITUDE,
+        max_altitude: float = DEFAULT_TABLE_MAX_ALTITUDE,
+    ):
+        """
+        :param delta_t: temperature increment (°C) applied to whole temperature profile
+        :param altitude_step: distance between table nodes, in meters
+        :param min_altitude: lower bound of the table, in meters
+        :param max_altitude: upper bound of the table, in meters
+        """
+        #: Temperature increment applied to whole temperature profile.
+        self.delta_t = delta_t
+
+        #: Distance between table nodes, in meters.
+        self.altitude_step = altitude_step
+
+        below_count = np.ceil((TROPOPAUSE - min_altitude) / altitude_step)
+        above_count = np.ceil((max_altitude - TROPOPAUSE) / altitude_step)
+
+        #: Altitudes of table nodes, in meters.
+        self.altitudes = TROPOPAUSE + np.arange(-below_count, above_count + 1) * altitude_step
+
+        # Interpolation is done in each cell from value at its lower node with a slope. Pressure
+        # formula is slightly discontinuous at tropopause, so slopes of the cell below tropopause
+        # use troposphere formula at its upper node.
+        lower_values = self._compute_values(self.altitudes[:-1])
+        upper_values = self._compute_values(self.altitudes[1:])
+        below_tropopause = self._compute_values(np.nextafter(TROPOPAUSE, 0.0))
+        tropopause_cell = int(below_count) - 1
+        self._lower_values = lower_values
+        self._slopes = {}
+        for name, values in upper_values.items():
+            if 0 <= tropopause_cell < len(values):
+                values[tropopause_cell] = below_tropopause[name]
+            self._slopes[name] = values - lower_values[name]
+
+        #: Maximum relative interpolation error, as estimated between table nodes.
+        self.max_relative_error = self._estimate_max_relative_error()
+
+    @staticmethod
+    @lru_cache(maxsize=TABLE_CACHE_SIZE)
+    def get(
+        delta_t: float = 0.0,
+        altitude_step: float = DEFAULT_TABLE_ALTITUDE_STEP,
+        min_altitude: float = DEFAULT_TABLE_MIN_ALTITUDE,
+        max_altitude: float = DEFAULT_TABLE_MAX_ALTITUDE,
+    ) -> "AtmosphereTable":
+        """
+        Same parameters as class constructor.
+
+        :return: the table for provided parameters, computed at first call only
+        """
+        return AtmosphereTable(delta_t, altitude_step, min_altitude, max_altitude)
+
+    @staticmethod
+    @lru_cache(maxsize=TABLE_CACHE_SIZE)
+    def get_for_tolerance(
+        tolerance: float,
+        delta_t: float = 0.0,
+        min_altitude: float = DEFAULT_TABLE_MIN_ALTITUDE,
+        max_altitude: float = DEFAULT_TABLE_MAX_ALTITUDE,
+    ) -> "AtmosphereTable":
+        """
+        Provides a table whose :attr:`max_relative_error` is below tolerance.
+
+        Altitude step is obtained by halving :data:`DEFAULT_TABLE_ALTITUDE_STEP` as much as needed.
+
+        :param tolerance: maximum allowed relative interpolation error
+        :param delta_t: temperature increment (°C) applied to whole temperature profile
+        :param min_altitude: lower bound of the table, in meters
+        :param max_altitude: upper bound of the table, in meters
+        :return: the table, computed at first call only
+        :raise ValueError: if tolerance cannot be achieved with altitude step above
+                           :data:`MIN_TABLE_ALTITUDE_STEP`
+        """
+        altitude_step = DEFAULT_TABLE_ALTITUDE_STEP
+        table = AtmosphereTable.get(delta_t, altitude_step, min_altitude, max_altitude)
+        while table.max_relative_error > tolerance:
+            altitude_step /= 2.0
+            if altitude_step < MIN_TABLE_ALTITUDE_STEP:
+                raise ValueError(
+                    "Atmosphere table cannot achieve a relative error of %g." % tolerance
+                )
+            table = AtmosphereTable.get(delta_t, altitude_step, min_altitude, max_altitude)
+        return table
+
+    def locate(self, altitude: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param altitude: altitudes in meters, as numpy array
+        :return: a mask of altitudes that are within table bounds, and for these altitudes,
+                 indices of table cells and relative positions in cells
+        """
+        position = (altitude - self.altitudes[0]) / self.altitude_step
+        indices = np.floor(position).astype(np.intp)
+        in_table = (indices >= 0) & (indices < len(self.altitudes) - 1)
+        if not np.all(in_table):
+            indices = indices[in_table]
+            position = position[in_table]
+        return in_table, indices, position - indices
+
+    def interpolate(
+        self, name: str, altitude: np.ndarray, location: Tuple[np.ndarray, ...] = None
+    ) -> np.ndarray:
+        """
+        Altitudes out of table bounds are computed with :class:`AtmosphereSI`.
+
+        :param name: one of :attr:`PROPERTIES`
+        :param altitude: altitudes in meters, as numpy array
+        :param location: result of :meth:`locate` for provided altitudes (computed if None)
+        :return: values of property for provided altitudes, with same shape
+        """
+        if location is None:
+            location = self.locate(altitude)
+        in_table, indices, offsets = location
+
+        table_values = self._lower_values[name][indices] + offsets * self._slopes[name][indices]
+        if name in self.LOG_SCALED_PROPERTIES:
+            table_values = np.exp(table_values)
+
+        if np.all(in_table):
+            return np.reshape(table_values, np.shape(altitude))
+
+        values = np.empty(np.shape(altitude))
+        values[in_table] = table_values
+        values[~in_table] = getattr(AtmosphereSI(altitude[~in_table], self.delta_t), name)
+        return values
+
+    def _compute_values(self, altitude: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        :return: exact values of :attr:`PROPERTIES`, with log scale where needed
+        """
+        atm = AtmosphereSI(altitude, self.delta_t)
+        values = {name: getattr(atm, name) for name in self.PROPERTIES}
+        for name in self.LOG_SCALED_PROPERTIES:
+            values[name] = np.log(values[name])
+        return values
+
+    def _estimate_max_relative_error(self) -> float:
+        middle_altitudes = 0.5 * (self.altitudes[:-1] + self.altitudes[1:])
+        location = self.locate(middle_altitudes)
+        atm = AtmosphereSI(middle_altitudes, self.delta_t)
+        return max(
+            np.max(
+                np.abs(
+                    self.interpolate(name, middle_altitudes, location) / getattr(atm, name) - 1.0
+                )
+            )
+            for name in self.PROPERTIES
+        )
+
+
+class TabulatedAtmosphere(Atmosphere):
+    """
+    Same as :class:`Atmosphere`, except that atmosphere properties are interpolated in a
+    precomputed :class:`AtmosphereTable`.
+
+    Tables are computed once for each temperature increment and table setting, and shared
+    between instances. This class is intended for large arrays of altitudes.
+
+    Setting :attr:`delta_t` after instantiation switches to the table of the new temperature
+    increment. As a table is computed for one temperature increment, delta_t has to be the same
+    for all altitudes (a one-element array is accepted).
+
+    Usage:
+
+    .. code-block::
+
+        >>> atm = TabulatedAtmosphere(np.linspace(0., 40000., 100000)) # default table
+        >>> atm = TabulatedAtmosphere(altitudes, 15, altitude_step=50.) # finer table, dISA = 15K
+        >>> atm = TabulatedAtmosphere(altitudes, tolerance=1e-6) # relative error below 1e-6
+    """
+
+    def __init__(
+        self,
+        altitude: Union[float, Sequence[float]],
+        delta_t: float = 0.0,
+        altitude_in_feet: bool = True,
+        altitude_step: float = DEFAULT_TABLE_ALTITUDE_STEP,
+        tolerance: float = None,
+    ):
+        """
+        :param altitude: altitude (units decided by altitude_in_feet)
+        :param delta_t: temperature increment (°C) applied to whole temperature profile
+        :param altitude_in_feet: if True, altitude should be provided in feet. Otherwise,
+                                 it should be provided in meters.
+        :param altitude_step: distance between table nodes, in meters
+        :param tolerance: if provided, altitude_step is ignored and the table is chosen
+                          so that maximum relative interpolation error is below this value
+        :raise ValueError: if delta_t is a sequence of several values
+        """
+        super().__init__(altitude, delta_t, altitude_in_feet)
+
+        self._altitude_step = altitude_step
+        self._tolerance = tolerance
+        self._table = self._get_table(delta_t)
+        self._location = None
+
+    @property
+    def table(self) -> AtmosphereTable:
+        """The table used for interpolation."""
+        return self._table
+
+    @Atmosphere.delta_t.setter
+    def delta_t(self, value: float):
+        self._table = self._get_table(value)
+        self._delta_t = value
+        self._location = None
+        self._temperature = None
+        self._pressure = None
+        self._density = None
+        self._speed_of_sound = None
+        self._kinematic_viscosity = None
+
+    @property
+    def temperature(self) -> Union[float, Sequence[float]]:
+        """Temperature in K."""
+        if self._temperature is None:
+            self._temperature = self._get_interpolated_value("temperature")
+        return self._return_value(self._temperature)
+
+    @property
+    def pressure(self) -> Union[float, Sequence[float]]:
+        """Pressure in Pa."""
+        if self._pressure is None:
+            self._pressure = self._get_interpolated_value("pressure")
+        return self._return_value(self._pressure)
+
+    @property
+    def density(self) -> Union[float, Sequence[float]]:
+        """Density in kg/m3."""
+        if self._density is None:
+            self._density = self._get_interpolated_value("density")
+        return self._return_value(self._density)
+
+    @property
+    def speed_of_sound(self) -> Union[float, Sequence[float]]:
+        """Speed of sound in m/s."""
+        if self._speed_of_sound is None:
+            self._speed_of_sound = self._get_interpolated_value("speed_of_sound")
+        return self._return_value(self._speed_of_sound)
+
+    @property
+    def kinematic_viscosity(self) -> Union[float, Sequence[float]]:
+        """Kinematic viscosity in m2/s."""
+        if self._kinematic_viscosity is None:
+            self._kinematic_viscosity = self._get_interpolated_value("kinematic_viscosity")
+        return self._return_value(self._kinematic_viscosity)
+
+    def _get_table(self, delta_t: float) -> AtmosphereTable:
+        # Tables are cached by temperature increment, so it has to be a (hashable) float
+        if np.size(delta_t) != 1:
+            raise ValueError(
+                "TabulatedAtmosphere needs the same temperature increment for all altitudes. "
+                "Use Atmosphere for per-point temperature increments."
+            )
+        delta_t = float(np.asarray(delta_t).item())
+
+        if self._tolerance is None:
+            return AtmosphereTable.get(delta_t, self._altitude_step)
+        return AtmosphereTable.get_for_tolerance(self._tolerance, delta_t)
+
+    def _get_interpolated_value(self, name: str) -> np.ndarray:
+        if self._location is None:
+            self._location = self._table.locate(self._altitude)
+        return self._table.interpolate(name, self._altitude, self._location)
+
+
+class TabulatedAtmosphereSI(TabulatedAtmosphere):
+    """Same as :class:`TabulatedAtmosphere` except that altitudes are always in meters."""
+
+    def __init__(
+        self,
+        altitude: Union[float, Sequence[float]],
+        delta_t: float = 0.0,
+        altitude_step: float = DEFAULT_TABLE_ALTITUDE_STEP,
+        tolerance: float = None,
+    ):
+        """
+        :param altitude: altitude in meters
+        :param delta_t: temperature increment (°C) applied to whole temperature profile
+        :param altitude_step: distance between table nodes, in meters
+        :param tolerance: if provided, altitude_step is ignored and the table is chosen
+                          so that maximum relative interpolation error is below this value
+        """
+        super().__init__(altitude, delta_t, False, altitude_step, tolerance)
+
+    @property
+    def altitude(self):
+        """Altitude in meters."""
+        return self.get_altitude(altitude_in_feet=False)
+
+
+class ScalarAtmosphereSI:
+    """
+    Fast implementation of :class:`AtmosphereSI` for one altitude, provided as a float.
+
+    Temperature, pressure, density and speed of sound are computed at instantiation, in one pass,
+    using plain floats. They use the same formulas as :class:`Atmosphere`, so results are the
+    same.
+
+    This class is intended for computations that are done one altitude at a time, like the ones
+    of mission segments, where the cost of numpy arrays is not worth it for a single value.
+    :class:`Atmosphere` and :class:`AtmosphereSI` should be preferred for sequences of altitudes.
+
+    Speed conversions are done the same way as with :class:`Atmosphere`:
+
+    .. code-block::
+
+        >>> atm = ScalarAtmosphereSI(10000.0) # init for altitude 10,000 meters, dISA = 0 K
+        >>> atm.mach = 0.78
+        >>> tas = atm.true_airspeed
+    """
+
+    __slots__ = [
+        "altitude",
+        "delta_t",
+        "temperature",
+        "pressure",
+        "density",
+        "speed_of_sound",
+        "_mach",
+        "_true_airspeed",
+        "_equivalent_airspeed",
+        "_unitary_reynolds",
+    ]
+
+    def __init__(self, altitude: float, delta_t: float = 0.0):
+        """
+        :param altitude: altitude in meters
+        :param delta_t: temperature increment (°C) applied to whole temperature profile
+        """
+        altitude = float(altitude)
+
+        #: Altitude in meters.
+        self.altitude = altitude
+
+        #: Temperature increment applied to whole temperature profile.
+        self.delta_t = delta_t
+
+        if altitude < TROPOPAUSE:
+            temperature = SEA_LEVEL_TEMPERATURE - 0.0065 * altitude + delta_t
+            pressure = SEA_LEVEL_PRESSURE * (1 - (altitude / 44330.78)) ** 5.25587611
+        else:
+            temperature = 216.65 + delta_t
+            pressure = 22632 * 2.718281 ** (1.7345725 - 0.0001576883 * altitude)
+
+        #: Temperature in K.
+        self.temperature = temperature
+
+        #: Pressure in Pa.
+        self.pressure = pressure
+
+        #: Density in kg/m3.
+        self.density = pressure / AIR_GAS_CONSTANT / temperature
+
+        #: Speed of sound in m/s.
+        self.speed_of_sound = (1.4 * AIR_GAS_CONSTANT * temperature) ** 0.5
+
+        self._mach = None
+        self._true_airspeed = None
+        self._equivalent_airspeed = None
+        self._unitary_reynolds = None
+
+    @property
+    def kinematic_viscosity(self) -> float:
+        """Kinematic viscosity in m2/s."""
+        return (
+            (0.000017894 * (self.temperature / SEA_LEVEL_TEMPERATURE) ** (3 / 2))
+            * ((SEA_LEVEL_TEMPERATURE + 110.4) / (self.temperature + 110.4))
+        ) / self.density
+
+    @property
+    def mach(self) -> float:
+        """Mach number."""
+        if self._mach is None and self.true_airspeed is not None:
+            self._mach = self.true_airspeed / self.speed_of_sound
+        return self._mach
+
+    @property
+    def true_airspeed(self) -> float:
+        """True airspeed (TAS) in m/s."""
+        if self._true_airspeed is None:
+            if self._mach is not None:
+                self._true_airspeed = self._mach * self.speed_of_sound
+            if self._equivalent_airspeed is not None:
+                self._true_airspeed = self._equivalent_airspeed * sqrt(
+                    SEA_LEVEL_DENSITY / self.density
+                )
+            if self._unitary_reynolds is not None:
+                self._true_airspeed = self._unitary_reynolds * self.kinematic_viscosity
+        return self._true_airspeed
+
+    @property
+    def equivalent_airspeed(self) -> float:
+        """Equivalent airspeed (EAS) in m/s."""
+        if self._equivalent_airspeed is None and self.true_airspeed is not None:
+            self._equivalent_airspeed = self.true_airspeed / sqrt(SEA_LEVEL_DENSITY / self.density)
+        return self._equivalent_airspeed
+
+    @property
+    def unitary_reynolds(self) -> float:
+        """Unitary Reynolds number in 1/m."""
+        if self._unitary_reynolds is None and self.true_airspeed is not None:
+            self._unitary_reynolds = self.true_airspeed / self.kinematic_viscosity
+        return self._unitary_reynolds
+
+    @mach.setter
+    def mach(self, value: float):
+        self._reset_speeds()
+        self._mach = value
+
+    @true_airspeed.setter
+    def true_airspeed(self, value: float):
+        self._reset_speeds()
+        self._true_airspeed = value
+
+    @equivalent_airspeed.setter
+    def equivalent_airspeed(self, value: float):
+        self._reset_speeds()
+        self._equivalent_airspeed = value
+
+    @unitary_reynolds.setter
+    def unitary_reynolds(self, value: float):
+        self._reset_speeds()
+        self._unitary_reynolds = value
+
+    def _reset_speeds(self):
+        """To be used before setting a new speed value as private attribute."""
+        self._mach = None
+        self._true_airspeed = None
+        self._equivalent_airspeed = None
+        self._unitary_reynolds = None
@@ -12,8 +12,9 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from dataclasses import asdict, dataclass
-from typing import Any, List, Mapping
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, List, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
@@ -30,6 +31,7 @@ class FlightPoint:
 
     - pandas friendliness: data exchange with pandas DataFrames is simple
     - extensibility: any user might add fields to the **class** using :meth:`add_field`
+    - compactness: instances have no `__dict__`, as their fields are stored in slots
 
     **Exchanges with pandas DataFrame**
 
@@ -55,9 +57,10 @@ class FlightPoint:
         FlightPoint class is bundled with several fields that are commonly used in trajectory
         assessment, but one might need additional fields.
 
-        Python allows to add attributes to any instance at runtime, but for FlightPoint to run
-        smoothly, especially when exchanging data with pandas, you have to work at class level.
-        This can be done using :meth:`add_field`, preferably outside of any class or function::
+        Attributes cannot be added to FlightPoint instances at runtime, and for FlightPoint to
+        run smoothly, especially when exchanging data with pandas, you have to work at class
+        level. This can be done using :meth:`add_field`, preferably outside of any class or
+        function::
 
             # Adds a float field with None as default value
             >>> FlightPoint.add_field("ion_drive_power")
@@ -71,12 +74,29 @@ class FlightPoint:
             # Removes a field, even an original one (useful only to avoid having it in outputs)
             >>> FlightPoint.remove_field("sfc")
 
+    **Compactness**
+
+        Instantiating FlightPoint actually provides an instance of a subclass where fields are
+        declared in `__slots__`. This subclass is generated again each time a field is added or
+        removed, so instances created before that keep their previous fields.
+
+        As a consequence, `type(flight_point) is FlightPoint` is False, though
+        `isinstance(flight_point, FlightPoint)` is True.
+
+        Also, equality requires instances of the same class, so an instance created before
+        a call to :meth:`add_field` or :meth:`remove_field` is never equal to an instance
+        created after it, even with the same field values. Such instances can be compared
+        with :func:`dataclasses.astuple`.
+
     .. note::
 
         All parameters in FlightPoint instances are expected to be in SI units.
 
     """
 
+    # Fields are stored in slots of the generated subclass
+    __slots__ = ()
+
     time: float = 0.0  #: Time in seconds.
     altitude: float = None  #: Altitude in meters.
     ground_distance: float = 0.0  #: Covered ground distance in meters.
@@ -120,6 +140,10 @@ class FlightPoint:
         acceleration="m/s**2",
     )
 
+    def __new__(cls, *args, **kwargs):  # pylint: disable=unused-argument
+        # Instances of FlightPoint are instances of the generated subclass.
+        return object.__new__(FlightPoint._slotted_class if cls is FlightPoint else cls)
+
     @classmethod
     def get_units(cls) -> dict:
         """
@@ -139,8 +163,27 @@ class FlightPoint:
         :param data: a dict-like instance where keys are FlightPoint attribute names
         :return: the created FlightPoint instance
         """
+        if isinstance(data, pd.Series):
+            # Much faster than iterating over the Series
+            return cls.create_from_values(data.index, data.values)
         return cls(**dict(data))
 
+    @classmethod
+    def create_from_values(cls, names: Sequence[str], values: Sequence) -> "FlightPoint":
+        """
+        Instantiate FlightPoint from field names and matching values.
+
+        It is the fast way to build a FlightPoint instance from a row of columnar data, like
+        DataFrame columns or
+        :class:`~fastoad.models.performances.mission.trajectory.TrajectoryBuffer` columns,
+        as no dict-like instance is needed.
+
+        :param names: FlightPoint attribute names
+        :param values: values in the same order as names
+        :return: the created FlightPoint instance
+        """
+        return cls(**dict(zip(names, values)))
+
     @classmethod
     def create_list(cls, data: pd.DataFrame) -> List["FlightPoint"]:
         """
@@ -149,7 +192,8 @@ class FlightPoint:
         :param data: a dict-like instance where keys are FlightPoint attribute names
         :return: the created FlightPoint instance
         """
-        return [cls.create(row) for row in data.iloc]
+        names = data.columns
+        return [cls.create_from_values(names, row) for row in data.itertuples(index=False)]
 
     @classmethod
     def add_field(cls, name: str, annotation_type=float, default_value: Any = None, unit=None):
@@ -170,6 +214,7 @@ class FlightPoint:
         setattr(cls, name, default_value)
         cls.__annotations__[name] = annotation_type
         dataclass(cls)
+        cls._update_slotted_class()
         if unit:
             cls._units[name] = unit
 
@@ -185,6 +230,7 @@ class FlightPoint:
             delattr(cls, name)
             del cls.__annotations__[name]
             dataclass(cls)
+            cls._update_slotted_class()
             if name in cls._units:
                 del cls._units[name]
 
@@ -193,7 +239,50 @@ class FlightPoint:
         Convenience method for converting to scalars all fields that have a
         one-item array-like value.
         """
-        self_as_dict = asdict(self)
-        for field_name, value in self_as_dict.items():
+        for field_name in self.__dataclass_fields__:
+            value = getattr(self, field_name)
+            # Python floats, strings and None are already scalars and are skipped for speed.
+            if value is None or type(value) in (float, str):
+                continue
             if np.size(value) == 1:
                 setattr(self, field_name, np.asarray(value).item())
+
+    @classmethod
+    def _update_slotted_class(cls):
+        """
+        Generates the subclass of FlightPoint that is actually instantiated, with current
+        fields as slots.
+        """
+        field_names = tuple(field.name for field in fields(cls))
+        init = cls.__init__
+        if len(field_names) > 1:
+            get_values = attrgetter(*field_names)
+        else:  # attrgetter() would not provide a tuple
+
+            def get_values(flight_point):
+                return tuple(getattr(flight_point, field_name) for field_name in field_names)
+
+        def __copy__(self):
+            flight_point = object.__new__(type(self))
+            init(flight_point, *get_values(self))
+            return flight_point
+
+        def __reduce__(self):
+            # The generated class cannot be found by pickle, so FlightPoint is used to
+            # instantiate, and slot values are the state.
+            return cls, (), (None, dict(zip(field_names, get_values(self))))
+
+        cls._slotted_class = type(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": field_names,
+                "__module__": cls.__module__,
+                "__qualname__": cls.__qualname__,
+                "__copy__": __copy__,
+                "__reduce__": __reduce__,
+            },
+        )
+
+
+FlightPoint._update_slotted_class()
@@ -47,6 +47,11 @@ class IPropulsion(ABC):
         :class`FlightPoint class` documentation.
     """
 
+    #: Should be True if results of :meth:`compute_flight_points` depend on aircraft mass in
+    #: a non-smooth way. Flight segments will then not use computations that assume
+    #: smooth variations of fuel flow with mass.
+    has_non_smooth_mass_dependency = False
+
     @abstractmethod
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
         """
@@ -212,6 +217,10 @@ class FuelEngineSet(AbstractFuelPropulsion):
         self.engine = engine
         self.engine_count = engine_count
 
+    @property
+    def has_non_smooth_mass_dependency(self) -> bool:
+        return self.engine.has_non_smooth_mass_dependency
+
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
         if flight_points.thrust is not None:
             flight_points.thrust = flight_points.thrust / self.engine_count
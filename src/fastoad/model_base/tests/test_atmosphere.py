@@ -19,7 +19,16 @@ import pytest
 from numpy.testing import assert_allclose
 from scipy.constants import foot
 
-from ..atmosphere import Atmosphere
+from ..atmosphere import (
+    Atmosphere,
+    AtmosphereSI,
+    AtmosphereTable,
+    ScalarAtmosphereSI,
+    TabulatedAtmosphere,
+    TabulatedAtmosphereSI,
+    TABLE_CACHE_SIZE,
+    get_altitude_from_pressure,
+)
 
 
 def test_atmosphere():
@@ -197,3 +206,137 @@ def test_speed_conversions():
     assert_allclose(atm.true_airspeed, TAS, rtol=2e-3)
     assert_allclose(atm.equivalent_airspeed, expected_EAS, rtol=2e-3)
     assert_allclose(atm.mach, expected_Mach, rtol=2.5e-3)
+
+
+def test_scalar_atmosphere():
+    """Tests ScalarAtmosphereSI against AtmosphereSI."""
+    for altitude in [0.0, 500.0, 5000.0, 10999.0, 11000.0, 15000.0, 20000.0]:
+        for delta_t in [0.0, 10.0]:
+            reference = AtmosphereSI(altitude, delta_t)
+            atm = ScalarAtmosphereSI(altitude, delta_t)
+            for name in [
+                "temperature",
+                "pressure",
+                "density",
+                "speed_of_sound",
+                "kinematic_viscosity",
+            ]:
+                value = getattr(atm, name)
+                assert isinstance(value, float)
+                assert_allclose(value, getattr(reference, name), rtol=1e-14)
+
+            for name, value in [
+                ("true_airspeed", 200.0),
+                ("equivalent_airspeed", 150.0),
+                ("mach", 0.78),
+                ("unitary_reynolds", 1.0e7),
+            ]:
+                reference = AtmosphereSI(altitude, delta_t)
+                atm = ScalarAtmosphereSI(altitude, delta_t)
+                setattr(reference, name, value)
+                setattr(atm, name, value)
+                for speed_name in [
+                    "true_airspeed",
+                    "equivalent_airspeed",
+                    "mach",
+                    "unitary_reynolds",
+                ]:
+                    assert_allclose(
+                        getattr(atm, speed_name), getattr(reference, speed_name), rtol=1e-14
+                    )
+
+    # Speed can be modified
+    atm = ScalarAtmosphereSI(10000.0)
+    atm.mach = 0.5
+    assert_allclose(atm.true_airspeed, 149.7, atol=0.1)
+    atm.true_airspeed = 100.0
+    assert_allclose(atm.mach, 0.334, atol=1e-3)
+
+
+def test_tabulated_atmosphere():
+    """Tests TabulatedAtmosphere and TabulatedAtmosphereSI against Atmosphere."""
+    names = ["temperature", "pressure", "density", "speed_of_sound", "kinematic_viscosity"]
+    altitudes = np.linspace(-2000.0, 30000.0, 10000).reshape((1000, -1))
+    for delta_t in [0.0, 15.0]:
+        reference = AtmosphereSI(altitudes, delta_t)
+        atm = TabulatedAtmosphereSI(altitudes, delta_t)
+        assert atm.table.max_relative_error < 1.0e-5
+        for name in names:
+            value = getattr(atm, name)
+            assert value.shape == altitudes.shape
+            assert_allclose(value, getattr(reference, name), rtol=atm.table.max_relative_error)
+
+        # Tables are computed once
+        assert TabulatedAtmosphereSI(0.0, delta_t).table is atm.table
+
+        # Finer tables
+        atm = TabulatedAtmosphereSI(altitudes, delta_t, altitude_step=10.0)
+        assert atm.table.altitude_step == 10.0
+        assert atm.table.max_relative_error < 1.0e-7
+        for name in names:
+            assert_allclose(getattr(atm, name), getattr(reference, name), rtol=1.0e-7)
+
+        atm = TabulatedAtmosphereSI(altitudes, delta_t, tolerance=1.0e-8)
+        assert atm.table.max_relative_error <= 1.0e-8
+        for name in names:
+            assert_allclose(getattr(atm, name), getattr(reference, name), rtol=1.0e-8)
+
+    # Altitude in feet, float values and speed conversions
+    atm = TabulatedAtmosphere(35000.0, 10.0)
+    reference = Atmosphere(35000.0, 10.0)
+    assert isinstance(atm.density, float)
+    assert_allclose(atm.density, reference.density, rtol=1.0e-5)
+    atm.mach = reference.mach = 0.78
+    assert_allclose(atm.true_airspeed, reference.true_airspeed, rtol=1.0e-5)
+    assert_allclose(atm.equivalent_airspeed, reference.equivalent_airspeed, rtol=1.0e-5)
+    assert_allclose(atm.unitary_reynolds, reference.unitary_reynolds, rtol=1.0e-5)
+
+    # Changing temperature increment changes the table
+    for tolerance in [None, 1.0e-8]:
+        atm = TabulatedAtmosphereSI(altitudes, 0.0, tolerance=tolerance)
+        assert_allclose(atm.temperature, AtmosphereSI(altitudes, 0.0).temperature, rtol=1.0e-5)
+        atm.delta_t = 15.0
+        assert atm.delta_t == 15.0
+        assert atm.table is TabulatedAtmosphereSI(0.0, 15.0, tolerance=tolerance).table
+        reference = AtmosphereSI(altitudes, 15.0)
+        for name in names:
+            assert_allclose(getattr(atm, name), getattr(reference, name), rtol=1.0e-5)
+
+    # Temperature increment can be provided as a one-element array, but not per point
+    atm = TabulatedAtmosphereSI(np.array([1000.0]), delta_t=np.array([15.0]))
+    assert atm.table is TabulatedAtmosphereSI(0.0, 15.0).table
+    assert_allclose(atm.temperature, AtmosphereSI(1000.0, 15.0).temperature, rtol=1.0e-5)
+    atm.delta_t = np.array(0.0)
+    assert atm.table is TabulatedAtmosphereSI(0.0, 0.0).table
+    with pytest.raises(ValueError):
+        TabulatedAtmosphereSI(np.array([1000.0, 2000.0]), delta_t=np.array([5.0, 10.0]))
+    with pytest.raises(ValueError):
+        atm.delta_t = [5.0, 10.0]
+    assert atm.delta_t == 0.0
+
+    # Number of kept tables is bounded
+    assert AtmosphereTable.get.cache_info().maxsize == TABLE_CACHE_SIZE
+    for delta_t in range(TABLE_CACHE_SIZE + 1):
+        AtmosphereTable.get(float(delta_t), altitude_step=1000.0)
+    assert AtmosphereTable.get.cache_info().currsize == TABLE_CACHE_SIZE
+
+    # Unreachable tolerance
+    with pytest.raises(ValueError):
+        AtmosphereTable.get_for_tolerance(1.0e-15)
+
+
+def test_get_altitude_from_pressure():
+    altitudes = np.linspace(-1000.0, 30000.0, 3101)
+    for delta_t in [0.0, 15.0]:
+        pressures = AtmosphereSI(altitudes, delta_t).pressure
+        assert_allclose(get_altitude_from_pressure(pressures), altitudes, atol=1e-8)
+
+    altitude = get_altitude_from_pressure(AtmosphereSI(5000.0).pressure)
+    assert isinstance(altitude, float)
+    assert_allclose(altitude, 5000.0, atol=1e-8)
+
+    # Pressure between the two values given at tropopause by the pressure formulas
+    pressure = 0.5 * (
+        AtmosphereSI(11000.0).pressure + AtmosphereSI(np.nextafter(11000.0, 0.0)).pressure
+    )
+    assert get_altitude_from_pressure(pressure) == 11000.0
@@ -11,6 +11,10 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import pickle
+from copy import copy, deepcopy
+from dataclasses import astuple
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -50,6 +54,17 @@ def test_create():
     assert flight_point.time == 1.0
     assert flight_point.mach == 0.02
 
+    flight_point = FlightPoint.create(dict(time=1.0, mach=0.02))
+    assert flight_point.time == 1.0
+    assert flight_point.mach == 0.02
+
+    flight_point = FlightPoint.create_from_values(["time", "mach"], [1.0, 0.02])
+    assert flight_point.time == 1.0
+    assert flight_point.mach == 0.02
+    assert flight_point.mass is None
+    with pytest.raises(TypeError):
+        FlightPoint.create_from_values(["time", "foo"], [1.0, 42])
+
 
 def test_create_list():
     df = pd.DataFrame(dict(time=[0.0, 1.0, 2.0], mach=[0.0, 0.02, 0.05]))
@@ -81,3 +96,40 @@ def test_scalarize():
     assert fp.mass == 70000.0
     assert fp.altitude == 1000.0
     assert_allclose(fp.mach, [0.7, 0.8])
+
+
+def test_slots():
+    fp = FlightPoint(time=100.0, mass=70000.0, name="climb")
+    assert isinstance(fp, FlightPoint)
+    assert not hasattr(fp, "__dict__")
+    with pytest.raises(AttributeError):
+        fp.foo = 42.0
+    assert repr(fp).startswith("FlightPoint(time=100.0")
+
+    # Copies and pickled instances are equal to the original one.
+    assert copy(fp) == fp
+    assert copy(fp) is not fp
+    assert deepcopy(fp) == fp
+    assert pickle.loads(pickle.dumps(fp)) == fp
+    assert fp == FlightPoint(time=100.0, mass=70000.0, name="climb")
+
+    # Slots follow added and removed fields
+    FlightPoint.add_field("foo", default_value=5.0)
+    fp2 = FlightPoint(foo=42.0)
+    assert isinstance(fp2, FlightPoint)
+    assert not hasattr(fp2, "__dict__")
+    fp2.foo = 43.0
+    assert copy(fp2).foo == 43.0
+    assert pickle.loads(pickle.dumps(fp2)).foo == 43.0
+    assert fp.foo == 5.0  # Previous instances get the default value of added fields
+
+    FlightPoint.remove_field("foo")
+    with pytest.raises(AttributeError):
+        FlightPoint().foo = 42.0
+
+    # Instances created before and after adding or removing a field are never equal
+    fp3 = FlightPoint(time=100.0, mass=70000.0, name="climb")
+    assert type(fp3) is not type(fp)
+    assert fp3 != fp
+    assert astuple(fp3) == astuple(fp)
+    assert fp3 == FlightPoint(time=100.0, mass=70000.0, name="climb")
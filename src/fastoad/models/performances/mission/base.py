@@ -13,12 +13,15 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from abc import ABC, abstractmethod
+from copy import copy
 from dataclasses import dataclass
-from typing import List
+from typing import List, Sequence
 
 import pandas as pd
 
 from fastoad.model_base import FlightPoint
+from .profiling import MISSION_PROFILER
+from .trajectory import DEFAULT_CAPACITY, TrajectoryBuffer
 
 
 class IFlightPart(ABC):
@@ -37,6 +40,32 @@ class IFlightPart(ABC):
                  :class:`~fastoad.model_base.flight_point.FlightPoint`
         """
 
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
+        """
+        Same as :meth:`compute_from`, but computed flight points are provided as a
+        :class:`~fastoad.models.performances.mission.trajectory.TrajectoryBuffer` instance.
+
+        The default implementation converts the result of :meth:`compute_from`. Classes that
+        can write directly in a TrajectoryBuffer instance should overload this method.
+
+        :param start: the initial flight point (see :meth:`compute_from`)
+        :return: the computed flight points
+        """
+        return TrajectoryBuffer.from_dataframe(self.compute_from(start))
+
+    def compute_batch(self, starts: Sequence[FlightPoint]) -> List[TrajectoryBuffer]:
+        """
+        Computes the flight sequence from each of provided start points.
+
+        The default implementation calls :meth:`compute_trajectory` for each start point.
+        Classes that can do better, e.g. by computing all flight sequences at once,
+        should overload this method.
+
+        :param starts: the initial flight points (see :meth:`compute_from`)
+        :return: the computed flight points, one TrajectoryBuffer instance per start point
+        """
+        return [self.compute_trajectory(start) for start in starts]
+
 
 @dataclass
 class FlightSequence(IFlightPart):
@@ -47,24 +76,71 @@ class FlightSequence(IFlightPart):
     def __post_init__(self):
         self._flight_sequence = []
 
+        #: Expected number of flight points, used as initial capacity of the trajectory
+        #: computed by :meth:`compute_trajectory`. Default capacity is used if None.
+        self.point_count_hint = None
+
     def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        parts = []
+        return self.compute_trajectory(start).to_dataframe()
+
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
+        trajectory = TrajectoryBuffer(self.point_count_hint or DEFAULT_CAPACITY)
         part_start = start
         for part in self.flight_sequence:
-            flight_points = part.compute_from(part_start)
-            if len(parts) > 0:
+            is_profiled = MISSION_PROFILER.enabled and getattr(part, "name", "")
+            if is_profiled:
+                MISSION_PROFILER.start_part(part.name)
+            if isinstance(part, IFlightPart):
+                part_trajectory = part.compute_trajectory(part_start)
+            else:
+                # Any object that provides compute_from() can be used
+                part_trajectory = TrajectoryBuffer.from_dataframe(part.compute_from(part_start))
+            if is_profiled:
+                MISSION_PROFILER.end_part()
+            part_start_index = len(trajectory)
+            if len(trajectory) > 0:
                 # First point of the segment is omitted, as it is the
                 # last of previous segment.
-                if len(flight_points) > 1:
-                    parts.append(flight_points.iloc[1:])
+                trajectory.extend(part_trajectory, start=1)
             else:
                 # But it is kept if the computed segment is the first one.
-                parts.append(flight_points)
+                trajectory.extend(part_trajectory)
+            if getattr(part, "name", ""):
+                trajectory.set_part_bounds(part.name, part_start_index, len(trajectory))
+
+            # The next part will complete its start point, so a copy is needed
+            part_start = copy(part_trajectory[-1])
+
+        return trajectory
+
+    def compute_batch(self, starts: Sequence[FlightPoint]) -> List[TrajectoryBuffer]:
+        trajectories = [TrajectoryBuffer() for _ in starts]
+        part_starts = list(starts)
+        for part in self.flight_sequence:
+            is_profiled = MISSION_PROFILER.enabled and getattr(part, "name", "")
+            if is_profiled:
+                MISSION_PROFILER.start_part(part.name)
+            if isinstance(part, IFlightPart):
+                part_trajectories = part.compute_batch(part_starts)
+            else:
+                part_trajectories = [
+                    TrajectoryBuffer.from_dataframe(part.compute_from(part_start))
+                    for part_start in part_starts
+                ]
+            if is_profiled:
+                MISSION_PROFILER.end_part()
+
+            for trajectory, part_trajectory in zip(trajectories, part_trajectories):
+                # As in compute_trajectory(), first point of the segment is omitted if
+                # it is not the first segment.
+                part_start_index = len(trajectory)
+                trajectory.extend(part_trajectory, start=1 if len(trajectory) > 0 else 0)
+                if getattr(part, "name", ""):
+                    trajectory.set_part_bounds(part.name, part_start_index, len(trajectory))
 
-            part_start = FlightPoint.create(flight_points.iloc[-1])
+            part_starts = [copy(part_trajectory[-1]) for part_trajectory in part_trajectories]
 
-        if parts:
-            return pd.concat(parts).reset_index(drop=True)
+        return trajectories
 
     @property
     def flight_sequence(self) -> List[IFlightPart]:
@@ -15,8 +15,8 @@ Mission generator.
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from collections import OrderedDict
-from copy import deepcopy
-from typing import Dict, List, Mapping, Optional, Tuple, Union
+from copy import copy, deepcopy
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
 import openmdao.api as om
 import pandas as pd
@@ -29,6 +29,8 @@ from .schema import (
     CLIMB_PARTS_TAG,
     CRUISE_PART_TAG,
     DESCENT_PARTS_TAG,
+    INTEGRATOR_TAG,
+    IntegratorNames,
     MISSION_DEFINITION_TAG,
     MissionDefinition,
     PARTS_TAG,
@@ -40,9 +42,10 @@ from .schema import (
     SegmentNames,
 )
 from ..base import FlightSequence, IFlightPart
-from ..polar import Polar
+from ..polar import POLAR_CACHE
 from ..routes import RangedRoute
 from ..segments.base import FlightSegment
+from ..segments.integrators import IIntegrator
 
 BASE_UNITS = {
     "altitude": "m",
@@ -51,6 +54,11 @@ BASE_UNITS = {
     "range": "m",
     "time": "s",
     "ground_distance": "m",
+    "mass_tolerance": "kg",
+    "distance_tolerance": "m",
+    "minimum_time_step": "s",
+    "maximum_time_step": "s",
+    "closed_form_time_step": "s",
 }
 
 
@@ -75,6 +83,9 @@ class MissionBuilder:
         self.definition = mission_definition
         self._base_kwargs = {"reference_area": reference_area, "propulsion": propulsion}
 
+        # If not None, parameters bound to inputs are recorded here during build
+        self._recorded_bindings: Optional[List[_PartBindings]] = None
+
     @property
     def definition(self) -> MissionDefinition:
         """
@@ -130,6 +141,21 @@ class MissionBuilder:
         self._propagate_name(mission, mission.name)
         return mission
 
+    def compile(self, mission_name: str = None) -> "MissionPlan":
+        """
+        Prepares the mission definition for repeated computations with different input values.
+
+        Units are converted and input variables are identified here, once for all.
+
+        :param mission_name: mission name (can be omitted if only one mission is defined)
+        :return: the mission plan, that provides the mission instance for given inputs
+        """
+        self._parse_values_and_units(self._structure)
+        self.get_input_variables(mission_name)  # Needed to process "contextual" variable names
+        if mission_name is None:
+            mission_name = self.get_unique_mission_name()
+        return MissionPlan(self, mission_name)
+
     def get_route_ranges(
         self, inputs: Optional[Mapping] = None, mission_name: str = None
     ) -> List[float]:
@@ -143,13 +169,22 @@ class MissionBuilder:
         routes = self.build(inputs, mission_name).flight_sequence
         return [route.flight_distance for route in routes if isinstance(route, RangedRoute)]
 
-    def get_reserve(self, flight_points: pd.DataFrame, mission_name: str = None) -> float:
+    def get_reserve(
+        self,
+        flight_points: pd.DataFrame,
+        mission_name: str = None,
+        part_bounds: Optional[Mapping[str, Tuple[int, int]]] = None,
+    ) -> float:
         """
         Computes the reserve fuel according to definition in mission input file.
 
         :param flight_points: the dataframe returned by compute_from() method of the
                               instance returned by :meth:`build`
         :param mission_name: mission name (can be omitted if only one mission is defined)
+        :param part_bounds: if provided, the row bounds of flight parts in `flight_points`, as
+                            provided by the TrajectoryBuffer instance of the computation.
+                            Otherwise, flight points of the reference route are identified
+                            by their name.
         :return: the reserve fuel mass in kg, or 0.0 if no reserve is defined.
         """
 
@@ -161,9 +196,12 @@ class MissionBuilder:
             ref_name = last_part_spec[RESERVE_TAG]["ref"]
             multiplier = last_part_spec[RESERVE_TAG]["multiplier"]
 
-            route_points = flight_points.loc[
-                flight_points.name.str.contains("%s:%s" % (mission_name, ref_name))
-            ]
+            route_name = "%s:%s" % (mission_name, ref_name)
+            if part_bounds is not None and route_name in part_bounds:
+                start, stop = part_bounds[route_name]
+                route_points = flight_points.iloc[start:stop]
+            else:
+                route_points = flight_points.loc[flight_points.name.str.contains(route_name)]
             consumed_mass = route_points.mass.iloc[0] - route_points.mass.iloc[-1]
             return consumed_mass * multiplier
 
@@ -326,14 +364,19 @@ class MissionBuilder:
         """
         mission = FlightSequence()
 
+        # Mission-wide settings, that can be overridden at phase or segment level.
+        kwargs = {}
+        if INTEGRATOR_TAG in mission_structure:
+            kwargs[INTEGRATOR_TAG] = mission_structure[INTEGRATOR_TAG]
+
         mission.name = mission_structure["mission"]
         for part_spec in mission_structure[PARTS_TAG]:
             if "route" in part_spec:
-                part = self._build_route(part_spec, inputs)
+                part = self._build_route(part_spec, inputs, kwargs)
             elif "phase" in part_spec:
-                part = self._build_phase(part_spec, inputs)
+                part = self._build_phase(part_spec, inputs, kwargs)
             elif "segment" in part_spec:
-                part = self._build_segment(part_spec, {}, inputs)
+                part = self._build_segment(part_spec, kwargs, inputs)
             else:  # reserve definition is used differently
                 continue
             part.name = list(part_spec.values())[0]
@@ -341,31 +384,32 @@ class MissionBuilder:
 
         return mission
 
-    def _build_route(self, route_structure: OrderedDict, inputs: Optional[Mapping] = None):
+    def _build_route(
+        self, route_structure: OrderedDict, inputs: Optional[Mapping] = None, kwargs: dict = None
+    ):
         """
         Builds route instance.
 
         :param route_structure: structure of the route to build
         :param inputs: if provided, variable inputs will be replaced by their value.
+        :param kwargs: a preset of keyword arguments for FlightSegment instantiation
         :return: the route instance
         """
         climb_phases = []
         descent_phases = []
+        cruise_kwargs = dict(kwargs or {})
+        cruise_kwargs.update({"name": "cruise", "target": FlightPoint(ground_distance=0.0)})
 
         for part_structure in route_structure[CLIMB_PARTS_TAG]:
-            phase = self._build_phase(part_structure, inputs)
+            phase = self._build_phase(part_structure, inputs, kwargs)
             climb_phases.append(phase)
             phase.name = list(part_structure.values())[0]
 
-        cruise_phase = self._build_segment(
-            route_structure[CRUISE_PART_TAG],
-            {"name": "cruise", "target": FlightPoint(ground_distance=0.0)},
-            inputs,
-        )
+        cruise_phase = self._build_segment(route_structure[CRUISE_PART_TAG], cruise_kwargs, inputs)
         cruise_phase.name = "cruise"
 
         for part_structure in route_structure[DESCENT_PARTS_TAG]:
-            phase = self._build_phase(part_structure, inputs)
+            phase = self._build_phase(part_structure, inputs, kwargs)
             descent_phases.append(phase)
             phase.name = list(part_structure.values())[0]
 
@@ -376,26 +420,34 @@ class MissionBuilder:
             route = RangedRoute(
                 climb_phases, cruise_phase, descent_phases, flight_distance=flight_range
             )
+            if self._recorded_bindings is not None and isinstance(route_structure["range"], str):
+                bindings = _PartBindings(route)
+                bindings.parameters["flight_distance"] = route_structure["range"]
+                self._recorded_bindings.append(bindings)
         else:
             route = FlightSequence()
             route.flight_sequence.extend(climb_phases)
 
         return route
 
-    def _build_phase(self, phase_structure, inputs: Optional[Mapping] = None):
+    def _build_phase(self, phase_structure, inputs: Optional[Mapping] = None, kwargs: dict = None):
         """
         Builds phase instance
 
         :param phase_structure: structure of the phase to build
         :param inputs: if provided, variable inputs will be replaced by their value.
+        :param kwargs: a preset of keyword arguments for FlightSegment instantiation
         :return: the phase instance
         """
         phase = FlightSequence()
-        kwargs = {name: value for name, value in phase_structure.items() if name != PARTS_TAG}
-        del kwargs[PHASE_TAG]
+        phase_kwargs = dict(kwargs or {})
+        phase_kwargs.update(
+            {name: value for name, value in phase_structure.items() if name != PARTS_TAG}
+        )
+        del phase_kwargs[PHASE_TAG]
 
         for part_structure in phase_structure[PARTS_TAG]:
-            segment = self._build_segment(part_structure, kwargs, inputs)
+            segment = self._build_segment(part_structure, phase_kwargs, inputs)
             phase.flight_sequence.append(segment)
 
         return phase
@@ -419,27 +471,75 @@ class MissionBuilder:
             {name: value for name, value in segment_definition.items() if name != tag}
         )
         part_kwargs.update(self._base_kwargs)
+        bindings = _PartBindings()
         for key, value in part_kwargs.items():
             if key == "polar":
                 polar = {}
                 for coeff in ["CL", "CD"]:
                     polar[coeff] = value[coeff]
-                self._replace_by_inputs(polar, inputs)
-                value = Polar(polar["CL"], polar["CD"])
+                polar_bindings = {}
+                self._replace_by_inputs(polar, inputs, polar_bindings)
+                if polar_bindings:
+                    bindings.polar = value
+                value = POLAR_CACHE.get(polar["CL"], polar["CD"])
             elif key == "target":
                 if not isinstance(value, FlightPoint):
-                    self._replace_by_inputs(value, inputs)
+                    # A copy is needed to keep variable names in mission structure
+                    value = dict(value)
+                    self._replace_by_inputs(value, inputs, bindings.target_parameters)
                     value = FlightPoint(**value)
+            elif key == INTEGRATOR_TAG:
+                integrator_bindings = {}
+                integrator = self._build_integrator(value, inputs, integrator_bindings)
+                if integrator_bindings:
+                    bindings.integrator = value
+                value = integrator
 
             part_kwargs[key] = value
 
         if "engine_setting" in part_kwargs:
             part_kwargs["engine_setting"] = EngineSetting.convert(part_kwargs["engine_setting"])
 
-        self._replace_by_inputs(part_kwargs, inputs)
+        self._replace_by_inputs(part_kwargs, inputs, bindings.parameters)
+
+        if self._recorded_bindings is None or not bindings.is_bound:
+            return segment_class(**part_kwargs)
+
+        # Segment instantiation may modify the target, so it is copied before
+        bindings.segment_class = segment_class
+        bindings.segment_kwargs = dict(part_kwargs, target=copy(part_kwargs["target"]))
+        bindings.part = segment_class(**part_kwargs)
+        bindings.instantiation_state = dict(vars(bindings.part))
+        self._recorded_bindings.append(bindings)
+        return bindings.part
+
+    def _build_integrator(
+        self,
+        integrator_definition: Union[IIntegrator, str, dict],
+        inputs: Optional[Mapping],
+        bindings: Optional[Dict[str, str]] = None,
+    ) -> IIntegrator:
+        """
+        Builds the time integration scheme according to provided definition.
+
+        :param integrator_definition: the integrator name, or a dict with the integrator name
+                                      as "method" and integrator options
+        :param inputs: if provided, any option that is a string which matches
+                       a key of `inputs` will be replaced by the corresponding value
+        :param bindings: if provided, will be filled with names of replaced options as keys
+                         and matching input names as values
+        :return: the IIntegrator instance
+        """
+        if isinstance(integrator_definition, IIntegrator):
+            return integrator_definition
 
-        segment = segment_class(**part_kwargs)
-        return segment
+        if isinstance(integrator_definition, str):
+            integrator_definition = {"method": integrator_definition}
+
+        options = dict(integrator_definition)
+        integrator_class = IntegratorNames.get_integrator_class(options.pop("method"))
+        self._replace_by_inputs(options, inputs, bindings)
+        return integrator_class(**options)
 
     def _propagate_name(self, part: IFlightPart, new_name: str):
         """
@@ -484,15 +584,212 @@ class MissionBuilder:
                 cls._parse_values_and_units(value)
 
     @staticmethod
-    def _replace_by_inputs(parameter_definition: dict, inputs: Optional[Mapping]):
+    def _replace_by_inputs(
+        parameter_definition: dict,
+        inputs: Optional[Mapping],
+        bindings: Optional[Dict[str, str]] = None,
+    ):
         """
         In provided dict, if a value is a string that matches a key of `inputs`, replaces
         it by the value provided in `inputs`.
 
         :param parameter_definition:
         :param inputs:
+        :param bindings: if provided, will be filled with replaced keys as keys and matching
+                         input names as values
         """
         if inputs:
             for key, value in parameter_definition.items():
                 if isinstance(value, str) and value in inputs:
                     parameter_definition[key] = inputs[value]
+                    if bindings is not None:
+                        bindings[key] = value
+
+
+class MissionPlan:
+    """
+    Provides a mission instance that is built only once and is updated for each new set
+    of input values.
+
+    Instances are obtained with :meth:`MissionBuilder.compile`.
+
+    On first call of :meth:`get_mission`, the mission is built and the parameters that are
+    bound to inputs are recorded. On next calls, the same mission instance is returned: the
+    state of each of its flight parts is reset to the one it had just after build, and only
+    bound parameters are updated, along with propulsion model and reference area of the
+    builder. Only flight segments with bound parameters are instantiated again with updated
+    values, so that any processing done at instantiation is applied to them. Other flight
+    segments are updated in place.
+    """
+
+    def __init__(self, builder: MissionBuilder, mission_name: str):
+        """
+        :param builder: the builder that has been used for producing this plan
+        :param mission_name: the mission name
+        """
+        #: The mission name
+        self.mission_name = mission_name
+
+        #: Number of calls to :meth:`get_mission` where the mission has been built.
+        self.build_count = 0
+
+        #: Number of calls to :meth:`get_mission` where the existing mission has been updated.
+        self.rebind_count = 0
+
+        self._builder = builder
+        self._mission: Optional[FlightSequence] = None
+        self._bindings: List[_PartBindings] = []
+        self._initial_states: List[Tuple[IFlightPart, dict]] = []
+
+    def get_mission(self, inputs: Optional[Mapping] = None) -> FlightSequence:
+        """
+        :param inputs: any input parameter that is a string which matches a key of `inputs`
+                       will be replaced by the corresponding value
+        :return: the mission instance, ready for computation
+        """
+        if self._mission is None:
+            self._build(inputs)
+            self.build_count += 1
+        else:
+            self._rebind(inputs)
+            self.rebind_count += 1
+        return self._mission
+
+    def _build(self, inputs: Optional[Mapping]):
+        self._builder._recorded_bindings = []
+        try:
+            self._mission = self._builder.build(inputs, self.mission_name)
+            self._bindings = self._builder._recorded_bindings
+        finally:
+            self._builder._recorded_bindings = None
+
+        for bindings in self._bindings:
+            if bindings.instantiation_state is not None:
+                bindings.post_build_attributes = [
+                    name
+                    for name, value in vars(bindings.part).items()
+                    if bindings.instantiation_state.get(name, _MISSING) is not value
+                ]
+                bindings.instantiation_state = None
+
+        self._initial_states = [
+            (part, _copy_state(vars(part))) for part in _iter_flight_parts(self._mission)
+        ]
+
+    def _rebind(self, inputs: Optional[Mapping]):
+        for part, state in self._initial_states:
+            part_state = vars(part)
+            part_state.clear()
+            part_state.update(_copy_state(state))
+            if isinstance(part, FlightSegment):
+                part_state.update(self._builder._base_kwargs)
+
+        inputs = inputs or {}
+        polars = {}
+        for bindings in self._bindings:
+            part = bindings.part
+            if not isinstance(part, FlightSegment):
+                for name, input_name in bindings.parameters.items():
+                    if input_name in inputs:
+                        setattr(part, name, inputs[input_name])
+                continue
+
+            # Bound values may be processed at instantiation, so the segment is instantiated
+            # again, and its state is transferred to the existing instance.
+            segment_kwargs = dict(bindings.segment_kwargs)
+            segment_kwargs.update(self._builder._base_kwargs)
+            segment_kwargs["target"] = copy(segment_kwargs["target"])
+
+            if bindings.polar is not None:
+                key = (bindings.polar["CL"], bindings.polar["CD"])
+                if key not in polars:
+                    polar = {coeff: bindings.polar[coeff] for coeff in ["CL", "CD"]}
+                    self._builder._replace_by_inputs(polar, inputs)
+                    polars[key] = POLAR_CACHE.get(polar["CL"], polar["CD"])
+                segment_kwargs["polar"] = polars[key]
+
+            if bindings.integrator is not None:
+                segment_kwargs[INTEGRATOR_TAG] = self._builder._build_integrator(
+                    bindings.integrator, inputs
+                )
+
+            for name, input_name in bindings.parameters.items():
+                if input_name in inputs:
+                    segment_kwargs[name] = inputs[input_name]
+
+            for name, input_name in bindings.target_parameters.items():
+                if input_name in inputs:
+                    setattr(segment_kwargs["target"], name, inputs[input_name])
+
+            part_state = vars(part)
+            post_build_state = {name: part_state[name] for name in bindings.post_build_attributes}
+            part_state.clear()
+            part_state.update(vars(bindings.segment_class(**segment_kwargs)))
+            part_state.update(post_build_state)
+
+
+class _PartBindings:
+    """Parameters of a flight part that are bound to inputs."""
+
+    def __init__(self, part: IFlightPart = None):
+        #: The flight part
+        self.part = part
+
+        #: Attribute names as keys, input names as values
+        self.parameters: Dict[str, str] = {}
+
+        #: Target field names as keys, input names as values
+        self.target_parameters: Dict[str, str] = {}
+
+        #: Polar definition, if it uses inputs
+        self.polar: Optional[dict] = None
+
+        #: Integrator definition, if it uses inputs
+        self.integrator: Optional[Union[str, dict]] = None
+
+        #: Class of the flight segment
+        self.segment_class: Optional[type] = None
+
+        #: Keyword arguments used for instantiating the flight segment, with a copy of the
+        #: target as it was provided
+        self.segment_kwargs: Optional[dict] = None
+
+        #: Attributes of the flight segment just after instantiation, until mission is built
+        self.instantiation_state: Optional[dict] = None
+
+        #: Names of attributes of the flight segment that have been set after its
+        #: instantiation, during mission build (e.g. name, or preliminary climb segment)
+        self.post_build_attributes: List[str] = []
+
+    @property
+    def is_bound(self) -> bool:
+        """True if any parameter of the flight part is bound to inputs."""
+        return bool(
+            self.parameters
+            or self.target_parameters
+            or self.polar is not None
+            or self.integrator is not None
+        )
+
+
+#: Marker for attributes that do not exist
+_MISSING = object()
+
+
+def _iter_flight_parts(part: IFlightPart) -> Iterator[IFlightPart]:
+    """Iterates over provided flight part and all its sub-parts."""
+    yield part
+    if isinstance(part, FlightSequence):
+        for subpart in part.flight_sequence:
+            yield from _iter_flight_parts(subpart)
+
+
+def _copy_state(state: dict) -> dict:
+    """
+    Copies the attributes of a flight part. Containers and flight points are copied, so that
+    the copy is not modified by computations.
+    """
+    return {
+        name: copy(value) if isinstance(value, (dict, list, FlightPoint)) else value
+        for name, value in state.items()
+    }
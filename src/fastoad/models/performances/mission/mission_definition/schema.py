@@ -40,6 +40,11 @@ from fastoad.model_base import FlightPoint
 from ..segments.altitude_change import AltitudeChangeSegment
 from ..segments.cruise import BreguetCruiseSegment, ClimbAndCruiseSegment, OptimalCruiseSegment
 from ..segments.hold import HoldSegment
+from ..segments.integrators import (
+    BogackiShampineIntegrator,
+    ExplicitEulerIntegrator,
+    HeunEulerIntegrator,
+)
 from ..segments.speed_change import SpeedChangeSegment
 from ..segments.taxi import TaxiSegment
 from ..segments.transition import DummyTransitionSegment
@@ -57,6 +62,7 @@ MISSION_DEFINITION_TAG = "missions"
 ROUTE_DEFINITIONS_TAG = "routes"
 PHASE_DEFINITIONS_TAG = "phases"
 POLAR_TAG = "polar"
+INTEGRATOR_TAG = "integrator"
 
 
 class MissionDefinition(dict):
@@ -192,6 +198,7 @@ class MissionDefinition(dict):
                         }
                     )
                 ),
+                Optional(INTEGRATOR_TAG, default=None): cls._get_integrator_schema(),
             }
         )
 
@@ -219,6 +226,19 @@ class MissionDefinition(dict):
             target_schema_map[Optional(key, default=None)] = cls._get_value_schema()
         return Map(target_schema_map)
 
+    @classmethod
+    def _get_integrator_schema(cls) -> Validator:
+        """Schema for time integration scheme."""
+        return Str() | Map(
+            {
+                "method": Str(),
+                Optional("mass_tolerance", default=None): cls._get_value_schema(),
+                Optional("distance_tolerance", default=None): cls._get_value_schema(),
+                Optional("minimum_time_step", default=None): cls._get_value_schema(),
+                Optional("maximum_time_step", default=None): cls._get_value_schema(),
+            }
+        )
+
     @classmethod
     def _get_base_part_mapping(cls) -> dict:
         """Base mapping for segment/phase schemas."""
@@ -233,10 +253,13 @@ class MissionDefinition(dict):
             Optional("thrust_rate", default=None): cls._get_value_schema(has_unit=False),
             Optional("climb_thrust_rate", default=None): cls._get_value_schema(has_unit=False),
             Optional("time_step", default=None): cls._get_value_schema(),
+            Optional(INTEGRATOR_TAG, default=None): cls._get_integrator_schema(),
             Optional("maximum_flight_level", default=None): cls._get_value_schema(has_unit=False),
             Optional("mass_ratio", default=None): cls._get_value_schema(has_unit=False),
             Optional("reserve_mass_ratio", default=None): cls._get_value_schema(has_unit=False),
             Optional("use_max_lift_drag_ratio", default=None): cls._get_value_schema(Bool(), False),
+            Optional("use_closed_form", default=None): cls._get_value_schema(Bool(), False),
+            Optional("closed_form_time_step", default=None): cls._get_value_schema(),
         }
 
 
@@ -282,3 +305,38 @@ class SegmentNames(Enum):
             cls.TAXI.value: TaxiSegment,
         }
         return segments[value]
+
+
+class IntegratorNames(Enum):
+    """
+    Class that lists available time integration schemes for flight segments.
+
+    Enum values are linked to matching implementation with :meth:`get_integrator_class`.
+    """
+
+    EULER = "euler"
+    HEUN_EULER = "heun_euler"
+    BOGACKI_SHAMPINE = "bogacki_shampine"
+
+    @classmethod
+    def string_values(cls) -> Set[str]:
+        """
+
+        :return: the list of available integrators as strings
+        """
+        return {part.value for part in cls}
+
+    @classmethod
+    def get_integrator_class(cls, value: Union["IntegratorNames", str]) -> type:
+        """
+
+        :param value: an IntegratorNames instance or a string among possible values of
+                      IntegratorNames
+        :return: the matching implementation class
+        """
+        integrators = {
+            cls.EULER.value: ExplicitEulerIntegrator,
+            cls.HEUN_EULER.value: HeunEulerIntegrator,
+            cls.BOGACKI_SHAMPINE.value: BogackiShampineIntegrator,
+        }
+        return integrators[value]
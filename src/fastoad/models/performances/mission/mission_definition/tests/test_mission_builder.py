@@ -12,6 +12,8 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os.path as pth
+from copy import copy
+from itertools import zip_longest
 from unittest.mock import Mock
 
 import numpy as np
@@ -19,14 +21,21 @@ import pytest
 from numpy.testing import assert_allclose
 from scipy.constants import foot, knot
 
-from fastoad.model_base.propulsion import IPropulsion
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import FuelEngineSet, IPropulsion
 from fastoad.models.performances.mission.base import FlightSequence
 from fastoad.models.performances.mission.segments.altitude_change import AltitudeChangeSegment
 from fastoad.models.performances.mission.segments.hold import HoldSegment
+from fastoad.models.performances.mission.segments.integrators import (
+    BogackiShampineIntegrator,
+    ExplicitEulerIntegrator,
+    HeunEulerIntegrator,
+)
 from fastoad.models.performances.mission.segments.speed_change import SpeedChangeSegment
 from fastoad.models.performances.mission.segments.taxi import TaxiSegment
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import RubberEngine
 from ..exceptions import FastMissionFileMissingMissionNameError
-from ..mission_builder import MissionBuilder
+from ..mission_builder import MissionBuilder, _iter_flight_parts
 from ..schema import MissionDefinition
 
 DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
@@ -148,6 +157,9 @@ def test_build():
     assert_allclose(climb2.polar.definition_cl, cl)
     assert_allclose(climb2.polar.cd(), cd)
 
+    # Segments with same polar data share the same Polar instance
+    assert climb2.polar is acceleration.polar
+
     holding_phase = mission.flight_sequence[2]
     assert isinstance(holding_phase, FlightSequence)
     assert len(holding_phase.flight_sequence) == 1
@@ -192,3 +204,138 @@ def test_get_flight_ranges():
 
     assert_allclose(mission_builder.get_route_ranges(inputs, "sizing"), [8000.0e3, 926.0e3])
     assert_allclose(mission_builder.get_route_ranges(inputs, "operational"), [500.0e3])
+
+
+def test_build_with_integrators():
+    mission_builder = MissionBuilder(
+        pth.join(DATA_FOLDER_PATH, "mission_integrator.yml"),
+        propulsion=Mock(IPropulsion),
+        reference_area=100.0,
+    )
+    assert mission_builder.get_input_variables() == {
+        "data:mission:tolerance:distance": ("m", "Input defined by the mission.")
+    }
+
+    mission = mission_builder.build({"data:mission:tolerance:distance": 5.0})
+    route = mission.flight_sequence[0]
+
+    # Phase setting overrides mission setting
+    climb_segment = route.flight_sequence[0].flight_sequence[0]
+    assert isinstance(climb_segment.integrator, BogackiShampineIntegrator)
+    assert_allclose(climb_segment.integrator.mass_tolerance, 0.1)
+    assert_allclose(climb_segment.integrator.distance_tolerance, 5.0)
+
+    # Segment setting overrides phase setting
+    speed_change_segment = route.flight_sequence[0].flight_sequence[1]
+    assert isinstance(speed_change_segment.integrator, ExplicitEulerIntegrator)
+
+    # Mission setting is used when nothing else is specified
+    cruise_segment = route.flight_sequence[1]
+    assert isinstance(cruise_segment.integrator, HeunEulerIntegrator)
+    descent_segment = route.flight_sequence[2].flight_sequence[0]
+    assert isinstance(descent_segment.integrator, HeunEulerIntegrator)
+
+
+def _assert_same_mission(mission, expected_mission):
+    """Checks that all flight parts have same class and same attributes."""
+    for part, expected_part in zip_longest(
+        _iter_flight_parts(mission), _iter_flight_parts(expected_mission)
+    ):
+        assert type(part) is type(expected_part)
+        assert vars(part).keys() == vars(expected_part).keys()
+        for name, expected_value in vars(expected_part).items():
+            value = getattr(part, name)
+            if name == "polar" and expected_value is not None:
+                assert_allclose(value.definition_cl, expected_value.definition_cl)
+                assert_allclose(value.cd(), expected_value.cd())
+            elif name == "integrator":
+                assert type(value) is type(expected_value)
+                assert getattr(value, "__dict__", None) == getattr(expected_value, "__dict__", None)
+            elif name == "flight_sequence":
+                assert len(value) == len(expected_value)
+            elif isinstance(expected_value, list):
+                assert [type(item) for item in value] == [type(item) for item in expected_value]
+            else:
+                assert value == expected_value, name
+
+
+def test_mission_plan():
+    mission_builder = MissionBuilder(
+        pth.join(DATA_FOLDER_PATH, "mission.yml"),
+        propulsion=Mock(IPropulsion),
+        reference_area=100.0,
+    )
+    plan = mission_builder.compile("sizing")
+
+    cl = np.linspace(0.0, 1.5, 16)
+    cd = 0.02 + 0.05 * cl ** 2
+
+    inputs = {
+        "data:TLAR:cruise_mach": 0.78,
+        "data:mission:sizing:main:range": 8000.0e3,
+        "data:mission:sizing:diversion:range": 926.0e3,
+        "data:aerodynamics:aircraft:cruise:CD": cd,
+        "data:aerodynamics:aircraft:cruise:CL": cl,
+        "data:aerodynamics:aircraft:takeoff:CD": cd,
+        "data:aerodynamics:aircraft:takeoff:CL": cl,
+        "data:propulsion:climb:thrust_rate": 0.9,
+        "data:propulsion:descent:thrust_rate": 0.5,
+        "data:mission:sizing:holding:duration": 2000.0,
+        "data:mission:sizing:taxi_in:duration": 300.0,
+        "data:mission:sizing:taxi_in:thrust_rate": 0.5,
+    }
+    mission = plan.get_mission(inputs)
+    _assert_same_mission(mission, mission_builder.build(inputs, "sizing"))
+
+    # Only flight parts with bound values are recorded
+    bound_parts = [id(bindings.part) for bindings in plan._bindings]
+    first_segment = mission.flight_sequence[0].flight_sequence[0].flight_sequence[0]
+    assert id(first_segment) not in bound_parts
+    assert id(mission.flight_sequence[2].flight_sequence[0]) in bound_parts
+
+    # Computations can modify the state of flight parts
+    main_route = mission.flight_sequence[0]
+    holding = mission.flight_sequence[2].flight_sequence[0]
+    main_route.cruise_distance_guess = 5000.0e3
+    holding.target.time += 1000.0
+    holding.cruise_altitude = 10000.0
+
+    new_inputs = dict(inputs)
+    new_inputs["data:mission:sizing:main:range"] = 6000.0e3
+    new_inputs["data:aerodynamics:aircraft:cruise:CD"] = 0.02 + 0.06 * cl ** 2
+    new_inputs["data:propulsion:climb:thrust_rate"] = 0.8
+    new_inputs["data:mission:sizing:holding:duration"] = 1500.0
+    mission_builder.propulsion = FuelEngineSet(
+        RubberEngine(5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0), 2
+    )
+    mission_builder.reference_area = 120.0
+
+    # Same instance is updated
+    assert plan.get_mission(new_inputs) is mission
+    assert (plan.build_count, plan.rebind_count) == (1, 1)
+
+    assert main_route.flight_distance == 6000.0e3
+    assert main_route.cruise_distance_guess is None
+    assert holding.target.time == 1500.0
+    assert "cruise_altitude" not in vars(holding)
+    assert holding.propulsion is mission_builder.propulsion
+    assert holding.reference_area == 120.0
+    assert first_segment.propulsion is mission_builder.propulsion
+    assert first_segment.reference_area == 120.0
+    assert_allclose(main_route.cruise_segment.polar.cd(), 0.02 + 0.06 * cl ** 2)
+    assert main_route.climb_phases[1].flight_sequence[0].thrust_rate == 0.8
+    # Modifications of target done at instantiation are kept
+    assert holding.target.mach == "constant"
+    _assert_same_mission(mission, mission_builder.build(new_inputs, "sizing"))
+
+    # Rebound mission gives the same results as a newly built one
+    assert plan.get_mission(new_inputs) is mission
+    _assert_same_mission(mission, mission_builder.build(new_inputs, "sizing"))
+    start = FlightPoint(altitude=5000.0, mach=0.5, mass=60000.0, ground_distance=0.0, time=0.0)
+    flight_points = mission.flight_sequence[2].compute_from(copy(start))
+    expected_flight_points = (
+        mission_builder.build(new_inputs, "sizing").flight_sequence[2].compute_from(copy(start))
+    )
+    assert len(flight_points) > 2
+    for name in ["time", "altitude", "mach", "true_airspeed", "ground_distance", "mass"]:
+        assert_allclose(flight_points[name], expected_flight_points[name], rtol=1e-12)
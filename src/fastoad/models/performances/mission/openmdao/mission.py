@@ -17,6 +17,7 @@ OpenMDAO component for time-step computation of missions.
 import logging
 from enum import Enum
 from importlib.resources import path
+from typing import Optional
 
 import numpy as np
 import openmdao.api as om
@@ -27,10 +28,18 @@ from fastoad.model_base import FlightPoint
 from fastoad.model_base.propulsion import FuelEngineSet, IOMPropulsionWrapper
 from fastoad.module_management.constants import ModelDomain
 from fastoad.module_management.service_registry import RegisterOpenMDAOSystem, RegisterPropulsion
+from fastoad.openmdao.result_cache import DEFAULT_RESULT_CACHE_MEMORY, ResultCache
 from . import resources
-from .mission_wrapper import MissionWrapper
+from .mission_wrapper import (
+    DEFAULT_REFINEMENT_THRESHOLD,
+    DEFAULT_WARM_START_TOLERANCE,
+    MissionFidelitySchedule,
+    MissionWarmStart,
+    MissionWrapper,
+)
 from ..mission_definition.schema import MissionDefinition
-from ..polar import Polar
+from ..polar import POLAR_CACHE, Polar
+from ..profiling import MISSION_PROFILER
 from ..segments.cruise import BreguetCruiseSegment
 from ..segments.taxi import TaxiSegment
 
@@ -85,6 +94,73 @@ class Mission(om.Group):
             "dummy, formula instead of the specified mission.\n"
             "Set this option to False if you do expect this model to be computed only once.",
         )
+        self.options.declare(
+            "use_warm_start",
+            default=False,
+            types=bool,
+            desc="If True, results of each mission computation (cruise distance and flight level\n"
+            "of routes) are used as initial guesses for the next one, as long as inputs do not\n"
+            "change by more than warm_start_tolerance.",
+        )
+        self.options.declare(
+            "warm_start_tolerance",
+            default=DEFAULT_WARM_START_TOLERANCE,
+            types=float,
+            desc="Maximum relative change of each input value for using results of previous\n"
+            "mission computation as initial guesses.",
+        )
+        self.options.declare(
+            "result_cache_size",
+            default=0,
+            types=int,
+            desc="If strictly positive, results of mission computation are kept for this number\n"
+            "of input sets, so that computing again with same inputs is immediate.",
+        )
+        self.options.declare(
+            "result_cache_memory",
+            default=DEFAULT_RESULT_CACHE_MEMORY / 2 ** 20,
+            types=float,
+            desc="Maximum memory used by cached results of mission computation, in megabytes.",
+        )
+        self.options.declare(
+            "fidelity_level_count",
+            default=1,
+            types=int,
+            desc="If greater than 1, mission is computed with coarser time steps and tolerances\n"
+            "while inputs change a lot between computations (e.g. during first iterations of\n"
+            "a sizing loop), using this number of fidelity levels. Final results are computed\n"
+            "with nominal settings, as inputs stop changing when the loop converges.",
+        )
+        self.options.declare(
+            "fidelity_refinement_threshold",
+            default=DEFAULT_REFINEMENT_THRESHOLD,
+            types=float,
+            desc="Maximum relative change of input values for computing mission with nominal\n"
+            "settings. Used only if fidelity_level_count is greater than 1.",
+        )
+        self.options.declare(
+            "collect_computation_stats",
+            default=False,
+            types=bool,
+            desc="If True, wall time and numbers of integration steps, flight point completions,\n"
+            "propulsion calls and solver iterations are collected for each flight part during\n"
+            "mission computation (see computation_stats property).",
+        )
+        self.options.declare(
+            "computation_stats_file",
+            default="",
+            types=str,
+            desc="If provided, statistics of each mission computation are collected and written\n"
+            "in a csv file at provided path.",
+        )
+        self.options.declare(
+            "approximate_partials",
+            default=False,
+            types=bool,
+            desc="If True, partial derivatives of mission computation are approximated by finite\n"
+            "differences. Otherwise, they are not computed. With the fd_process_count option\n"
+            "of registered systems, perturbed points are computed in parallel.",
+        )
         self.options.declare(
             "adjust_fuel",
             default=True,
@@ -168,6 +244,14 @@ class Mission(om.Group):
         """Dataframe that lists all computed flight point data."""
         return self.mission_computation.flight_points
 
+    @property
+    def computation_stats(self) -> Optional[pd.DataFrame]:
+        """
+        Dataframe that lists statistics of last mission computation for each flight part, if
+        activated with collect_computation_stats or computation_stats_file option.
+        """
+        return self.mission_computation.computation_stats
+
     def _get_zfw_component(self, mission_name: str) -> om.AddSubtractComp:
         """
 
@@ -248,9 +332,35 @@ class MissionComponent(om.ExplicitComponent):
                                        computed only once.
           - is_sizing: if True, TOW will be considered equal to MTOW and mission payload will be
                        considered equal to design payload.
+          - use_warm_start: if True, results of each mission computation are used as initial
+                            guesses for the next one.
+          - warm_start_tolerance: maximum relative change of each input value for using
+                                  results of previous mission computation as initial guesses.
+          - result_cache_size: if strictly positive, results of mission computation are kept
+                               for this number of input sets.
+          - result_cache_memory: maximum memory used by cached results, in megabytes.
+          - fidelity_level_count: if greater than 1, mission is computed with coarser settings
+                                  while inputs change a lot between computations.
+          - fidelity_refinement_threshold: maximum relative change of input values for
+                                           computing mission with nominal settings.
+          - collect_computation_stats: if True, statistics of mission computation are
+                                       collected for each flight part.
+          - computation_stats_file: if provided, statistics of mission computation are
+                                    collected and written in a csv file at provided path.
+          - approximate_partials: if True, partial derivatives are approximated by finite
+                                  differences. Otherwise, they are not computed.
         """
         super().__init__(**kwargs)
         self.flight_points = None
+
+        #: Statistics of last mission computation for each flight part (see
+        #: :meth:`~fastoad.models.performances.mission.profiling.MissionProfiler.get_stats`),
+        #: if activated with collect_computation_stats or computation_stats_file option.
+        self.computation_stats: Optional[pd.DataFrame] = None
+
+        #: Cache of computation results, if activated with result_cache_size option.
+        self.result_cache: ResultCache = None
+
         self._engine_wrapper = None
         self._mission_wrapper: MissionWrapper = None
         self._mission_vars: type = None
@@ -262,12 +372,39 @@ class MissionComponent(om.ExplicitComponent):
         self.options.declare("mission_wrapper", types=MissionWrapper)
         self.options.declare("mission_name", types=str)
         self.options.declare("is_sizing", default=False, types=bool)
+        self.options.declare("use_warm_start", default=False, types=bool)
+        self.options.declare(
+            "warm_start_tolerance", default=DEFAULT_WARM_START_TOLERANCE, types=float
+        )
+        self.options.declare("result_cache_size", default=0, types=int)
+        self.options.declare(
+            "result_cache_memory", default=DEFAULT_RESULT_CACHE_MEMORY / 2 ** 20, types=float
+        )
+        self.options.declare("fidelity_level_count", default=1, types=int)
+        self.options.declare(
+            "fidelity_refinement_threshold", default=DEFAULT_REFINEMENT_THRESHOLD, types=float
+        )
+        self.options.declare("collect_computation_stats", default=False, types=bool)
+        self.options.declare("computation_stats_file", default="", types=str)
+        self.options.declare("approximate_partials", default=False, types=bool)
 
     def setup(self):
         self._engine_wrapper = self._get_engine_wrapper()
         self._engine_wrapper.setup(self)
         self._mission_wrapper = self.options["mission_wrapper"]
         self._mission_wrapper.setup(self, self.options["mission_name"])
+        if self.options["use_warm_start"]:
+            self._mission_wrapper.warm_start = MissionWarmStart(
+                self.options["warm_start_tolerance"]
+            )
+        if self.options["result_cache_size"] > 0:
+            self.result_cache = ResultCache(
+                self.options["result_cache_size"], self.options["result_cache_memory"] * 2 ** 20
+            )
+        if self.options["fidelity_level_count"] > 1:
+            self._mission_wrapper.fidelity_schedule = MissionFidelitySchedule(
+                self.options["fidelity_level_count"], self.options["fidelity_refinement_threshold"]
+            )
 
         mission_name = self.options["mission_name"]
 
@@ -342,17 +479,72 @@ class MissionComponent(om.ExplicitComponent):
             self.add_output("data:weight:aircraft:sizing_block_fuel", units="kg")
             self.add_output("data:weight:aircraft:sizing_onboard_fuel_at_takeoff", units="kg")
 
-        self.declare_partials(["*"], ["*"])
+        if self.options["approximate_partials"]:
+            self.declare_partials(["*"], ["*"], method="fd")
+        else:
+            self.declare_partials(["*"], ["*"])
+
+    @property
+    def fidelity_schedule(self) -> Optional[MissionFidelitySchedule]:
+        """
+        The schedule that chooses the fidelity level of each mission computation, or None if
+        not activated with fidelity_level_count option.
+
+        Its `level` and `input_change` attributes give the fidelity level of the last
+        computation and the input change that triggered it.
+        """
+        return self._mission_wrapper.fidelity_schedule if self._mission_wrapper else None
+
+    @property
+    def fidelity_level(self) -> Optional[int]:
+        """
+        Fidelity level of the last mission computation (see :attr:`fidelity_schedule`), or
+        None if fidelity schedule is not activated.
+        """
+        return self.fidelity_schedule.level if self.fidelity_schedule else None
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         iter_count = self.iter_count_without_approx
         message_prefix = "Mission computation - iteration %i : " % iter_count
+        mission_message = "Using mission definition."
+        is_nominal = True
+        if self.fidelity_schedule:
+            level = self.fidelity_schedule.update(inputs)
+            is_nominal = level == self.fidelity_schedule.nominal_level
+            if not is_nominal:
+                mission_message = (
+                    "Using mission definition with fidelity level %i (nominal: %i)."
+                    % (level, self.fidelity_schedule.nominal_level,)
+                )
+
         if iter_count == 0 and self.options["use_initializer_iteration"]:
             _LOGGER.info(message_prefix + "Using initializer computation. OTHER ITERATIONS NEEDED.")
             self._compute_breguet(inputs, outputs)
+        elif self.result_cache is None:
+            _LOGGER.info(message_prefix + mission_message)
+            self._compute_mission_with_stats(inputs, outputs)
         else:
-            _LOGGER.info(message_prefix + "Using mission definition.")
-            self._compute_mission(inputs, outputs)
+            key = self.result_cache.get_key(inputs)
+            result = self.result_cache.get(key)
+            if result is None:
+                _LOGGER.info(message_prefix + mission_message)
+                self._compute_mission_with_stats(inputs, outputs)
+                # Only results of nominal computations are reused. Flight points are copied
+                # so that cached ones cannot be modified through self.flight_points.
+                if is_nominal:
+                    self.result_cache.add(key, outputs, self.flight_points.copy())
+            else:
+                _LOGGER.info(message_prefix + "Using cached results.")
+                self.flight_points = self.result_cache.restore(result, outputs).copy()
+                if self.options["out_file"]:
+                    self.flight_points.to_csv(self.options["out_file"])
+
+        _LOGGER.debug("Polar cache: %i hits, %i misses", POLAR_CACHE.hits, POLAR_CACHE.misses)
+        _LOGGER.debug(
+            "Propulsion model cache: %i hits, %i misses",
+            RegisterPropulsion.model_cache.hits,
+            RegisterPropulsion.model_cache.misses,
+        )
 
     def _compute_breguet(self, inputs, outputs):
         """
@@ -369,9 +561,9 @@ class MissionComponent(om.ExplicitComponent):
         )
 
         high_speed_polar = self._get_initial_polar(inputs)
-        distance = np.asscalar(
-            np.sum(self._mission_wrapper.get_route_ranges(inputs, self.options["mission_name"]))
-        )
+        distance = np.sum(
+            self._mission_wrapper.get_route_ranges(inputs, self.options["mission_name"])
+        ).item()
 
         altitude = 100.0
         cruise_mach = 0.1
@@ -382,12 +574,10 @@ class MissionComponent(om.ExplicitComponent):
             polar=high_speed_polar,
             use_max_lift_drag_ratio=True,
         )
-        start_point = FlightPoint(
-            mass=inputs[self._mission_vars.TOW.value], altitude=altitude, mach=cruise_mach
+        fuel, _ = breguet.compute_cruises(
+            inputs[self._mission_vars.TOW.value], distance, altitude, cruise_mach
         )
-        flight_points = breguet.compute_from(start_point)
-        end_point = FlightPoint.create(flight_points.iloc[-1])
-        outputs[self._mission_vars.NEEDED_BLOCK_FUEL.value] = start_point.mass - end_point.mass
+        outputs[self._mission_vars.NEEDED_BLOCK_FUEL.value] = fuel
 
     @staticmethod
     def _get_initial_polar(inputs) -> Polar:
@@ -397,7 +587,7 @@ class MissionComponent(om.ExplicitComponent):
         In that case, this method returns a fake polar that has 10.0 as max lift drag ratio.
         Otherwise, the actual cruise polar is returned.
         """
-        high_speed_polar = Polar(
+        high_speed_polar = POLAR_CACHE.get(
             inputs["data:aerodynamics:aircraft:cruise:CL"],
             inputs["data:aerodynamics:aircraft:cruise:CD"],
         )
@@ -411,11 +601,39 @@ class MissionComponent(om.ExplicitComponent):
         except ZeroDivisionError:
             use_minimum_l_d_ratio = True
         if use_minimum_l_d_ratio:
-            # We replace by a polar that has at least 10.0 as max L/D ratio
-            high_speed_polar = Polar(np.array([0.0, 0.5, 1.0]), np.array([0.1, 0.05, 1.0]))
+            # We replace by a polar that has 10.0 as max L/D ratio (CD = 0.025 + 0.1 * CL**2)
+            high_speed_polar = POLAR_CACHE.get(
+                np.array([0.0, 0.5, 1.0]), np.array([0.025, 0.05, 0.125])
+            )
 
         return high_speed_polar
 
+    def _compute_mission_with_stats(self, inputs, outputs):
+        """
+        Computes mission using time-step integration, and collects statistics of computation
+        if activated.
+
+        :param inputs: OpenMDAO input vector
+        :param outputs: OpenMDAO output vector
+        """
+        stats_file = self.options["computation_stats_file"]
+        if not (self.options["collect_computation_stats"] or stats_file):
+            self._compute_mission(inputs, outputs)
+            return
+
+        MISSION_PROFILER.reset()
+        MISSION_PROFILER.enabled = True
+        MISSION_PROFILER.start_part(self.options["mission_name"])
+        try:
+            self._compute_mission(inputs, outputs)
+            MISSION_PROFILER.end_part()
+        finally:
+            MISSION_PROFILER.enabled = False
+
+        self.computation_stats = MISSION_PROFILER.get_stats()
+        if stats_file:
+            self.computation_stats.to_csv(stats_file, index_label="name")
+
     def _compute_mission(self, inputs, outputs):
         """
         Computes mission using time-step integration.
@@ -446,7 +664,7 @@ class MissionComponent(om.ExplicitComponent):
         # Final ================================================================
         end_of_mission = FlightPoint.create(self.flight_points.iloc[-1])
         reserve = self._mission_wrapper.get_reserve(
-            self.flight_points, self.options["mission_name"]
+            self.flight_points, self.options["mission_name"], self._mission_wrapper.part_bounds
         )
         zfw = end_of_mission.mass - reserve
         reserve_name = self._mission_wrapper.get_reserve_variable_name()
@@ -473,10 +691,12 @@ class MissionComponent(om.ExplicitComponent):
 
         def as_scalar(value):
             if isinstance(value, np.ndarray):
-                return np.asscalar(value)
+                return value.item()
             return value
 
-        self.flight_points = self.flight_points.applymap(as_scalar)
+        # The categorical name column is kept as is.
+        object_columns = self.flight_points.select_dtypes(object).columns
+        self.flight_points[object_columns] = self.flight_points[object_columns].applymap(as_scalar)
         rename_dict = {
             field_name: "%s [%s]" % (field_name, unit)
             for field_name, unit in FlightPoint.get_units().items()
@@ -501,8 +721,7 @@ class MissionComponent(om.ExplicitComponent):
             thrust_rate=inputs[self._mission_vars.TAXI_OUT_THRUST_RATE.value],
             propulsion=propulsion_model,
         )
-        flight_points = taxi_segment.compute_from(start_of_taxi_out)
-        end_of_taxi_out = flight_points.iloc[-1]
+        end_of_taxi_out = taxi_segment.compute_trajectory(start_of_taxi_out)[-1]
         outputs[self._mission_vars.TAXI_OUT_FUEL.value] = (
             start_of_taxi_out.mass - end_of_taxi_out.mass
         )
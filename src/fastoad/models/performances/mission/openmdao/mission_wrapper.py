@@ -14,7 +14,7 @@ Mission wrapper.
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Dict, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 
 import numpy as np
 import openmdao.api as om
@@ -24,7 +24,7 @@ from openmdao.vectors.vector import Vector
 from fastoad.model_base import FlightPoint
 from fastoad.models.aerodynamics.constants import POLAR_POINT_COUNT
 from ..base import FlightSequence
-from ..mission_definition.mission_builder import MissionBuilder
+from ..mission_definition.mission_builder import MissionBuilder, MissionPlan
 from ..mission_definition.schema import (
     CLIMB_PARTS_TAG,
     DESCENT_PARTS_TAG,
@@ -35,6 +35,9 @@ from ..mission_definition.schema import (
     ROUTE_DEFINITIONS_TAG,
     ROUTE_TAG,
 )
+from ..routes import RangedRoute
+from ..segments.base import FlightSegment
+from ..segments.cruise import ClimbAndCruiseSegment
 
 BASE_UNITS = {
     "altitude": "m",
@@ -45,6 +48,228 @@ BASE_UNITS = {
     "ground_distance": "m",
 }
 
+#: Default maximum relative change of inputs for keeping results of a previous mission
+#: computation as initial guesses.
+DEFAULT_WARM_START_TOLERANCE = 0.05
+
+#: Default maximum relative change of inputs for computing a mission at nominal fidelity.
+DEFAULT_REFINEMENT_THRESHOLD = 1.0e-3
+
+
+class MissionWarmStart:
+    """
+    Keeps results of the last mission computation to use them as initial guesses for the
+    next one.
+
+    Kept results are the solved cruise distance and the chosen cruise altitude of each route,
+    and the number of computed flight points. They are discarded when an input value has
+    changed by more than :attr:`max_relative_change` since the computation they come from.
+    """
+
+    def __init__(self, max_relative_change: float = DEFAULT_WARM_START_TOLERANCE):
+        """
+        :param max_relative_change: maximum relative change of each input value for keeping
+                                    stored results
+        """
+        #: Maximum relative change of each input value for keeping stored results.
+        self.max_relative_change = max_relative_change
+
+        #: Solved cruise distance for each route name.
+        self.cruise_distances: Dict[str, float] = {}
+
+        #: Chosen cruise altitude for each route name.
+        self.cruise_altitudes: Dict[str, float] = {}
+
+        #: Number of flight points of the last computed mission.
+        self.point_count: Optional[int] = None
+
+        #: Number of computations where stored results have been used as initial guesses.
+        self.use_count = 0
+
+        #: Number of times stored results have been discarded because of input change.
+        self.invalidation_count = 0
+
+        self._reference_inputs: Optional[np.ndarray] = None
+
+    def clear(self):
+        """Removes stored results."""
+        self.cruise_distances.clear()
+        self.cruise_altitudes.clear()
+        self.point_count = None
+        self._reference_inputs = None
+
+    def apply(self, mission: FlightSequence, inputs: Mapping):
+        """
+        Sets stored results as initial guesses in provided mission, if inputs are close enough
+        to the ones of the computation they come from. Otherwise, stored results are discarded.
+
+        :param mission: the mission that will be computed
+        :param inputs: input values for the mission computation
+        """
+        input_values = self._get_input_values(inputs)
+        if self._reference_inputs is not None and (
+            input_values.shape != self._reference_inputs.shape
+            or np.any(
+                np.abs(input_values - self._reference_inputs)
+                > self.max_relative_change * np.abs(self._reference_inputs)
+            )
+        ):
+            self.invalidation_count += 1
+            self.clear()
+
+        if self._reference_inputs is None:
+            return
+
+        self.use_count += 1
+        mission.point_count_hint = self.point_count
+        for route in self._get_routes(mission):
+            route.cruise_distance_guess = self.cruise_distances.get(route.name)
+            if isinstance(route.cruise_segment, ClimbAndCruiseSegment):
+                route.cruise_segment.flight_level_guess = self.cruise_altitudes.get(route.name)
+
+    def store(self, mission: FlightSequence, inputs: Mapping, point_count: int):
+        """
+        Stores results of provided mission, that has been computed with provided inputs.
+
+        :param mission: the computed mission
+        :param inputs: input values for the mission computation
+        :param point_count: the number of computed flight points
+        """
+        self._reference_inputs = self._get_input_values(inputs)
+        self.point_count = point_count
+        for route in self._get_routes(mission):
+            if route.solved_cruise_distance is not None:
+                self.cruise_distances[route.name] = route.solved_cruise_distance
+            if getattr(route.cruise_segment, "cruise_altitude", None) is not None:
+                self.cruise_altitudes[route.name] = route.cruise_segment.cruise_altitude
+
+    @staticmethod
+    def _get_routes(mission: FlightSequence):
+        return [part for part in mission.flight_sequence if isinstance(part, RangedRoute)]
+
+    @staticmethod
+    def _get_input_values(inputs: Mapping) -> np.ndarray:
+        return np.concatenate([np.ravel(value) for value in inputs.values()] or [[]]).astype(float)
+
+
+class MissionFidelitySchedule:
+    """
+    Chooses the fidelity level of each mission computation, according to the change of
+    inputs since the previous computation.
+
+    In a sizing loop, inputs of the mission change a lot during first iterations, so an
+    accurate mission computation is useless. Lower fidelity levels use coarser settings: for
+    each level below the nominal one, time steps of flight segments are multiplied by
+    :attr:`time_step_factor` and distance accuracy of routes is multiplied by
+    :attr:`tolerance_factor`.
+
+    The nominal level (:attr:`level_count` - 1) is used if inputs have changed by less than
+    :attr:`refinement_threshold` (maximum relative change). The level is decreased by one
+    each time this change is 10 times higher, down to 0. The first computation is done at
+    nominal level. As inputs stop changing when the loop converges, final results are
+    obtained at nominal level, as long as the loop tolerance is well below
+    :attr:`refinement_threshold`.
+    """
+
+    def __init__(
+        self,
+        level_count: int = 3,
+        refinement_threshold: float = DEFAULT_REFINEMENT_THRESHOLD,
+        time_step_factor: float = 2.0,
+        tolerance_factor: float = 4.0,
+    ):
+        """
+        :param level_count: number of fidelity levels, including the nominal one
+        :param refinement_threshold: maximum relative change of input values for computing
+                                     at nominal level
+        :param time_step_factor: ratio of time steps between two consecutive levels
+        :param tolerance_factor: ratio of distance accuracies between two consecutive levels
+        """
+        #: Number of fidelity levels, including the nominal one.
+        self.level_count = level_count
+
+        #: Maximum relative change of input values for computing at nominal level.
+        self.refinement_threshold = refinement_threshold
+
+        #: Ratio of time steps of flight segments between two consecutive levels.
+        self.time_step_factor = time_step_factor
+
+        #: Ratio of distance accuracies of routes between two consecutive levels.
+        self.tolerance_factor = tolerance_factor
+
+        #: Fidelity level chosen by last call of :meth:`update`.
+        self.level: Optional[int] = None
+
+        #: Maximum relative change of input values that has been used for choosing
+        #: :attr:`level` (None if there was no previous computation).
+        self.input_change: Optional[float] = None
+
+        #: Number of computations done at each fidelity level.
+        self.computation_counts = [0] * level_count
+
+        self._previous_inputs: Optional[np.ndarray] = None
+
+    @property
+    def nominal_level(self) -> int:
+        """The highest fidelity level, that uses settings of the mission definition."""
+        return self.level_count - 1
+
+    def update(self, inputs: Mapping) -> int:
+        """
+        Chooses the fidelity level according to the change of inputs since the previous call.
+
+        :param inputs: input values for the next computation
+        :return: the chosen fidelity level
+        """
+        input_values = MissionWarmStart._get_input_values(inputs)
+        if self._previous_inputs is None or input_values.shape != self._previous_inputs.shape:
+            self.input_change = None
+        else:
+            reference_values = np.maximum(np.abs(self._previous_inputs), np.finfo(float).tiny)
+            self.input_change = float(
+                np.max(np.abs(input_values - self._previous_inputs) / reference_values, initial=0.0)
+            )
+        self._previous_inputs = input_values
+
+        self.level = self.nominal_level
+        if self.input_change is not None:
+            threshold = self.refinement_threshold
+            # Written this way so that the lowest level is used if change is not a number.
+            while self.level > 0 and not self.input_change <= threshold:
+                self.level -= 1
+                threshold *= 10.0
+
+        return self.level
+
+    def apply(self, mission: FlightSequence):
+        """
+        Modifies settings of provided mission according to the current fidelity level.
+
+        :param mission: the mission that will be computed
+        """
+        level = self.nominal_level if self.level is None else self.level
+        self.computation_counts[level] += 1
+        if level == self.nominal_level:
+            return
+
+        # A flight part can appear several times in a mission, but it is modified only once.
+        modified_parts = set()
+        for part in self._iter_flight_parts(mission):
+            if id(part) in modified_parts:
+                continue
+            modified_parts.add(id(part))
+            if isinstance(part, FlightSegment):
+                part.time_step *= self.time_step_factor ** (self.nominal_level - level)
+            elif isinstance(part, RangedRoute):
+                part.distance_accuracy *= self.tolerance_factor ** (self.nominal_level - level)
+
+    @classmethod
+    def _iter_flight_parts(cls, part):
+        yield part
+        if isinstance(part, FlightSequence):
+            for subpart in part.flight_sequence:
+                yield from cls._iter_flight_parts(subpart)
+
 
 class MissionWrapper(MissionBuilder):
     """
@@ -57,6 +282,22 @@ class MissionWrapper(MissionBuilder):
         super().__init__(*args, **kwargs)
         self.mission_name = None
 
+        #: If provided, results of each mission computation are used as initial guesses for
+        #: the next one.
+        self.warm_start: Optional[MissionWarmStart] = None
+
+        #: If provided, missions are computed with coarser settings while inputs change a lot
+        #: between computations (see :meth:`MissionFidelitySchedule.update`).
+        self.fidelity_schedule: Optional[MissionFidelitySchedule] = None
+
+        #: The mission plan prepared in :meth:`setup`, that provides the mission instance
+        #: for each computation.
+        self.plan: Optional[MissionPlan] = None
+
+        #: Row bounds of each flight part in flight points of last computation (see
+        #: :attr:`~fastoad.models.performances.mission.trajectory.TrajectoryBuffer.part_bounds`)
+        self.part_bounds: Dict[str, Tuple[int, int]] = {}
+
     def setup(self, component: om.ExplicitComponent, mission_name: str = None):
         """
         To be used during setup() of provided OpenMDAO component.
@@ -70,6 +311,7 @@ class MissionWrapper(MissionBuilder):
         if mission_name is None:
             mission_name = self.get_unique_mission_name()
         self.mission_name = mission_name
+        self.plan = self.compile(mission_name)
         input_definition = self.get_input_variables(mission_name)
         output_definition = self._identify_outputs()
         output_definition = {
@@ -90,9 +332,9 @@ class MissionWrapper(MissionBuilder):
         """
         To be used during compute() of an OpenMDAO component.
 
-        Builds the mission from input file, and computes it. `outputs` vector is
-        filled with duration, burned fuel and covered ground distance for each
-        part of the flight.
+        Gets the mission from the plan prepared in :meth:`setup` (or builds it from input file
+        if setup has not been done), and computes it. `outputs` vector is filled with duration,
+        burned fuel and covered ground distance for each part of the flight.
 
         :param inputs: the input vector of the OpenMDAO component
         :param outputs: the output vector of the OpenMDAO component
@@ -100,7 +342,10 @@ class MissionWrapper(MissionBuilder):
         :return: a pandas DataFrame where columns names match fields of
                  :class:`~fastoad.model_base.flight_point.FlightPoint`
         """
-        mission = self.build(inputs, self.mission_name)
+        if self.plan is not None:
+            mission = self.plan.get_mission(inputs)
+        else:
+            mission = self.build(inputs, self.mission_name)
 
         def _compute_vars(name_root, start: FlightPoint, end: FlightPoint):
             """Computes duration, burned fuel and covered distance."""
@@ -114,22 +359,35 @@ class MissionWrapper(MissionBuilder):
         if not start_flight_point.name:
             start_flight_point.name = mission.flight_sequence[0].name
 
+        if self.warm_start is not None:
+            self.warm_start.apply(mission, inputs)
+        if self.fidelity_schedule is not None:
+            self.fidelity_schedule.apply(mission)
+
         current_flight_point = start_flight_point
-        flight_points = mission.compute_from(start_flight_point)
+        trajectory = mission.compute_trajectory(start_flight_point)
+
+        if self.warm_start is not None:
+            self.warm_start.store(mission, inputs, len(trajectory))
+        self.part_bounds = trajectory.part_bounds
         for part in mission.flight_sequence:
             var_name_root = "data:mission:%s" % part.name
-            part_end = FlightPoint.create(
-                flight_points.loc[flight_points.name.str.startswith(part.name)].iloc[-1]
-            )
+            part_bounds = self.part_bounds.get(part.name)
+            if part_bounds is not None:
+                part_end = trajectory[part_bounds[1] - 1]
+            else:
+                # The part added no flight point (e.g. a zero-duration taxi), so it ends
+                # at the last point of previous parts
+                part_end = current_flight_point
             _compute_vars(var_name_root, current_flight_point, part_end)
 
             if isinstance(part, FlightSequence):
                 # In case of a route, outputs are computed for each phase in the route
                 phase_start = current_flight_point
                 for phase in part.flight_sequence:
-                    phase_points = flight_points.loc[flight_points.name == phase.name]
-                    if len(phase_points) > 0:
-                        phase_end = FlightPoint.create(phase_points.iloc[-1])
+                    phase_bounds = self.part_bounds.get(phase.name)
+                    if phase_bounds is not None:
+                        phase_end = trajectory[phase_bounds[1] - 1]
                         var_name_root = "data:mission:%s" % phase.name
                         _compute_vars(var_name_root, phase_start, phase_end)
                         phase_start = phase_end
@@ -140,7 +398,7 @@ class MissionWrapper(MissionBuilder):
         var_name_root = "data:mission:%s" % mission.name
         _compute_vars(var_name_root, start_flight_point, current_flight_point)
 
-        return flight_points
+        return trajectory.to_dataframe()
 
     def get_reserve_variable_name(self) -> str:
         """
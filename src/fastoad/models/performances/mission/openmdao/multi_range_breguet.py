@@ -0,0 +1,173 @@
+"""
+OpenMDAO component for computing many cruises at once with Breguet-Leduc formula.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import openmdao.api as om
+
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import FuelEngineSet, IOMPropulsionWrapper
+from fastoad.models.aerodynamics.constants import POLAR_POINT_COUNT
+from fastoad.module_management.constants import ModelDomain
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem, RegisterPropulsion
+from ..polar import POLAR_CACHE
+from ..segments.cruise import BreguetCruiseSegment
+
+#: Relative step for finite difference computation of partial derivatives.
+FD_STEP = 1.0e-6
+
+# Names (without prefix) of vector inputs that define cruises, in order of arguments of
+# BreguetCruiseSegment.compute_cruises().
+_CRUISE_INPUTS = ["start_mass", "range", "altitude", "mach"]
+
+
+@RegisterOpenMDAOSystem("fastoad.performances.multi_range_breguet", domain=ModelDomain.PERFORMANCE)
+class MultiRangeBreguet(om.ExplicitComponent):
+    """
+    Computes fuel consumption of many cruises at once, using Breguet-Leduc formula.
+
+    Each cruise is defined by its start mass, its range, its altitude and its Mach number,
+    provided as vector inputs of size `cruise_count`. All cruises are computed in one
+    vectorized pass, with only one call to the propulsion model (see
+    :meth:`~fastoad.models.performances.mission.segments.cruise.BreguetCruiseSegment.\
+compute_cruises`).
+
+    It is intended for studies that need many cruise computations, like payload-range
+    diagrams or fleet studies.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._engine_wrapper = None
+
+    def initialize(self):
+        self.options.declare(
+            "propulsion_id",
+            default="",
+            types=str,
+            desc="(mandatory) The identifier of the propulsion wrapper.",
+        )
+        self.options.declare(
+            "cruise_count", default=1, types=int, desc="The number of computed cruises."
+        )
+        self.options.declare(
+            "variable_prefix",
+            default="data:mission:multi_range",
+            types=str,
+            desc="Prefix of names of vector inputs and outputs.",
+        )
+        self.options.declare(
+            "use_max_lift_drag_ratio",
+            default=False,
+            types=bool,
+            desc="If True, max lift/drag ratio of the polar is used instead of the one computed\n"
+            "for the start mass of each cruise.",
+        )
+
+    def setup(self):
+        self._engine_wrapper = self._get_engine_wrapper()
+        self._engine_wrapper.setup(self)
+
+        cruise_count = self.options["cruise_count"]
+        prefix = self.options["variable_prefix"]
+
+        self.add_input("data:geometry:propulsion:engine:count", 2)
+        self.add_input("data:geometry:wing:area", np.nan, units="m**2")
+        self.add_input("data:aerodynamics:aircraft:cruise:CL", np.nan, shape=POLAR_POINT_COUNT)
+        self.add_input("data:aerodynamics:aircraft:cruise:CD", np.nan, shape=POLAR_POINT_COUNT)
+
+        self.add_input(
+            prefix + ":start_mass", np.nan, shape=cruise_count, units="kg", desc="mass at start"
+        )
+        self.add_input(prefix + ":range", np.nan, shape=cruise_count, units="m", desc="range")
+        self.add_input(
+            prefix + ":altitude", np.nan, shape=cruise_count, units="m", desc="cruise altitude"
+        )
+        self.add_input(prefix + ":mach", np.nan, shape=cruise_count, desc="cruise Mach number")
+
+        self.add_output(prefix + ":fuel", shape=cruise_count, units="kg", desc="consumed fuel")
+        self.add_output(prefix + ":end_mass", shape=cruise_count, units="kg", desc="mass at end")
+
+        # Partial derivatives with respect to inputs of aircraft models (aerodynamics,
+        # propulsion, geometry) are computed by finite differences.
+        self.declare_partials([prefix + ":fuel", prefix + ":end_mass"], "*", method="fd")
+
+        # Each cruise depends only on its own input values
+        diagonal = np.arange(cruise_count)
+        for name in _CRUISE_INPUTS:
+            self.declare_partials(
+                [prefix + ":fuel", prefix + ":end_mass"],
+                prefix + ":" + name,
+                rows=diagonal,
+                cols=diagonal,
+            )
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        prefix = self.options["variable_prefix"]
+
+        fuel, end_masses = self._get_segment(inputs).compute_cruises(
+            *[inputs[prefix + ":" + name] for name in _CRUISE_INPUTS]
+        )
+        outputs[prefix + ":fuel"] = fuel
+        outputs[prefix + ":end_mass"] = end_masses
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        prefix = self.options["variable_prefix"]
+
+        # As cruises are independent, finite differences are computed by perturbing the
+        # values of all cruises at once.
+        breguet = self._get_segment(inputs)
+        values = [inputs[prefix + ":" + name] for name in _CRUISE_INPUTS]
+        fuel, _ = breguet.compute_cruises(*values)
+        for i, name in enumerate(_CRUISE_INPUTS):
+            step = FD_STEP * np.maximum(np.abs(values[i]), 1.0)
+            perturbed_values = list(values)
+            perturbed_values[i] = values[i] + step
+            perturbed_fuel, _ = breguet.compute_cruises(*perturbed_values)
+
+            fuel_derivatives = (perturbed_fuel - fuel) / step
+            partials[prefix + ":fuel", prefix + ":" + name] = fuel_derivatives
+            if name == "start_mass":
+                partials[prefix + ":end_mass", prefix + ":" + name] = 1.0 - fuel_derivatives
+            else:
+                partials[prefix + ":end_mass", prefix + ":" + name] = -fuel_derivatives
+
+    def _get_segment(self, inputs) -> BreguetCruiseSegment:
+        """
+        :param inputs: OpenMDAO input vector
+        :return: the segment that computes cruises
+        """
+        return BreguetCruiseSegment(
+            FlightPoint(ground_distance=0.0),
+            propulsion=FuelEngineSet(
+                self._engine_wrapper.get_model(inputs),
+                inputs["data:geometry:propulsion:engine:count"],
+            ),
+            polar=POLAR_CACHE.get(
+                inputs["data:aerodynamics:aircraft:cruise:CL"],
+                inputs["data:aerodynamics:aircraft:cruise:CD"],
+            ),
+            reference_area=inputs["data:geometry:wing:area"],
+            use_max_lift_drag_ratio=self.options["use_max_lift_drag_ratio"],
+        )
+
+    def _get_engine_wrapper(self) -> IOMPropulsionWrapper:
+        """
+        Overloading this method allows to define the engine without relying on the propulsion
+        option.
+
+        :return: the engine wrapper instance
+        """
+        return RegisterPropulsion.get_provider(self.options["propulsion_id"])
@@ -17,6 +17,8 @@ from os import mkdir
 from shutil import rmtree
 
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import pytest
 from matplotlib.ticker import MultipleLocator
 from numpy.testing import assert_allclose
@@ -25,12 +27,20 @@ from scipy.constants import foot, knot
 
 from fastoad.io import DataFile
 from fastoad.model_base import FlightPoint
-from fastoad.model_base.propulsion import AbstractFuelPropulsion, IOMPropulsionWrapper, IPropulsion
-from fastoad.module_management.service_registry import RegisterPropulsion
+from fastoad.model_base.propulsion import (
+    AbstractFuelPropulsion,
+    FuelEngineSet,
+    IOMPropulsionWrapper,
+    IPropulsion,
+)
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem, RegisterPropulsion
+from fastoad.openmdao.parallel_fd import PARALLEL_FD_SUPPORTED, ParallelFiniteDifference
 from tests.testing_utilities import run_system
 from ..mission import Mission, MissionComponent
-from ..mission_wrapper import MissionWrapper
+from ..mission_wrapper import MissionFidelitySchedule, MissionWarmStart, MissionWrapper
+from ...base import FlightSequence
 from ...mission_definition.exceptions import FastMissionFileMissingMissionNameError
+from ...segments.taxi import TaxiSegment
 
 DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
 RESULTS_FOLDER_PATH = pth.join(pth.dirname(__file__), "results")
@@ -144,6 +154,17 @@ def test_mission_component(cleanup):
     # plot_flight(problem.model.component.flight_points, "test_mission.png")
     assert_allclose(problem["data:mission:operational:needed_block_fuel"], 6589.0, atol=1.0)
 
+    # Part bounds match names of flight points (the start point of the first part
+    # can have another name)
+    flight_points = problem.model.component.flight_points
+    assert flight_points.name.dtype == "category"
+    part_bounds = problem.model.component._mission_wrapper.part_bounds
+    assert set(part_bounds) == set(flight_points.name)
+    for name, (start, stop) in part_bounds.items():
+        is_in_part = flight_points.name.str.startswith(name).to_numpy()
+        assert np.all(is_in_part[start + 1 : stop])
+        assert np.flatnonzero(is_in_part)[-1] == stop - 1
+
 
 def test_mission_component_breguet(cleanup):
 
@@ -195,6 +216,47 @@ def test_mission_group_without_loop(cleanup):
     assert_allclose(problem["data:mission:operational:block_fuel"], 15195.0, atol=1.0)
 
 
+@pytest.mark.skipif(
+    not PARALLEL_FD_SUPPORTED, reason="Parallel FD not supported by installed OpenMDAO"
+)
+def test_mission_group_parallel_fd(cleanup, monkeypatch):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+    of = ["data:mission:operational:needed_block_fuel"]
+    wrt = ["data:mission:operational:TOW", "data:geometry:wing:area"]
+
+    computed_systems = []
+    compute_points = ParallelFiniteDifference._compute_points
+
+    def _compute_points(self, system, points):
+        computed_systems.append(system.pathname)
+        return compute_points(self, system, points)
+
+    monkeypatch.setattr(ParallelFiniteDifference, "_compute_points", _compute_points)
+
+    totals = {}
+    for fd_options in [{}, {"fd_process_count": 2}]:
+        options = {
+            "propulsion_id": "test.wrapper.propulsion.dummy_engine",
+            "use_initializer_iteration": False,
+            "mission_file_path": pth.join(DATA_FOLDER_PATH, "test_breguet.yml"),
+            "adjust_fuel": False,
+            "approximate_partials": True,
+        }
+        options.update(fd_options)
+        problem = run_system(
+            RegisterOpenMDAOSystem.get_system("fastoad.performances.mission", options), ivc
+        )
+        totals[len(fd_options)] = problem.compute_totals(of, wrt)
+
+    # Partials of mission computation go through parallel finite differences only when
+    # asked.
+    assert computed_systems == ["component.mission_computation"]
+    for key, value in totals[0].items():
+        assert np.all(value != 0.0)
+        assert_allclose(totals[1][key], value, rtol=1.0e-10)
+
+
 def test_mission_group_breguet_without_loop(cleanup):
     input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
     ivc = DataFile(input_file_path).to_ivc()
@@ -228,9 +290,12 @@ def test_mission_group_with_loop(cleanup):
             mission_file_path=pth.join(DATA_FOLDER_PATH, "test_mission.yml"),
             mission_name="operational",
             add_solver=True,
+            use_warm_start=True,
         ),
         ivc,
     )
+    warm_start = problem.model.component.mission_computation._mission_wrapper.warm_start
+    assert warm_start.use_count > 0
 
     # check loop
     assert_allclose(
@@ -257,6 +322,177 @@ def test_mission_group_with_loop(cleanup):
     )
 
 
+def test_mission_component_result_cache(cleanup):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            use_initializer_iteration=False,
+            result_cache_size=4,
+        ),
+        ivc,
+    )
+    component = problem.model.component
+    flight_points = component.flight_points
+    assert (component.result_cache.hits, component.result_cache.misses) == (0, 1)
+
+    expected_flight_points = flight_points.copy()
+
+    # Cached flight points are not modified through the component
+    flight_points["mass [kg]"] = 0.0
+    problem.run_model()
+    assert (component.result_cache.hits, component.result_cache.misses) == (1, 1)
+    assert component.flight_points is not flight_points
+    pd.testing.assert_frame_equal(component.flight_points, expected_flight_points)
+    assert_allclose(problem["data:mission:operational:needed_block_fuel"], 6589.0, atol=1.0)
+
+    component.flight_points["mass [kg]"] = 0.0
+    problem.run_model()
+    assert (component.result_cache.hits, component.result_cache.misses) == (2, 1)
+    pd.testing.assert_frame_equal(component.flight_points, expected_flight_points)
+
+    problem["data:mission:operational:TOW"] += 100.0
+    problem.run_model()
+    assert (component.result_cache.hits, component.result_cache.misses) == (2, 2)
+
+
+def test_mission_component_computation_stats(cleanup):
+    input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
+    ivc = DataFile(input_file_path).to_ivc()
+    stats_file_path = pth.join(RESULTS_FOLDER_PATH, "test_mission_stats.csv")
+
+    problem = run_system(
+        MissionComponent(
+            propulsion_id="test.wrapper.propulsion.dummy_engine",
+            mission_wrapper=MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml")),
+            mission_name="operational",
+            use_initializer_iteration=False,
+            computation_stats_file=stats_file_path,
+        ),
+        ivc,
+    )
+    assert_allclose(problem["data:mission:operational:needed_block_fuel"], 6589.0, atol=1.0)
+
+    stats = problem.model.component.computation_stats
+    assert stats.index[0] == "operational"
+    assert "operational:main_route:cruise" in stats.index
+    assert stats.call_count["operational"] == 1
+    assert stats.solver_iteration_count["operational:main_route"] > 0
+    # Cruise and descent are computed several times while solving cruise distance
+    assert stats.step_count.sum() > len(problem.model.component.flight_points)
+    assert stats.wall_time["operational"] >= stats.wall_time["operational:main_route"] > 0.0
+    assert_allclose(pd.read_csv(stats_file_path, index_col=0), stats)
+
+
+def test_mission_wrapper_part_without_points():
+    propulsion = FuelEngineSet(DummyEngine(1.2e5, 1.5e-5), 2)
+    mission = FlightSequence()
+    mission.name = "test"
+    for name, duration in [("test:taxi_out", 60.0), ("test:taxi_in", 0.0)]:
+        mission.flight_sequence.append(
+            TaxiSegment(
+                name=name,
+                target=FlightPoint(time=duration),
+                propulsion=propulsion,
+                thrust_rate=0.3,
+            )
+        )
+
+    mission_wrapper = MissionWrapper(pth.join(DATA_FOLDER_PATH, "test_mission.yml"))
+    mission_wrapper.build = lambda inputs, mission_name: mission
+    outputs = {
+        "data:mission:%s:duration" % name: np.nan
+        for name in ["test", "test:taxi_out", "test:taxi_in"]
+    }
+    mission_wrapper.compute(
+        {},
+        outputs,
+        FlightPoint(altitude=0.0, true_airspeed=10.0, mass=70000.0, time=0.0, ground_distance=0.0),
+    )
+
+    # Zero-duration taxi-in adds no flight point, so it has no bounds, but still gets outputs
+    assert "test:taxi_in" not in mission_wrapper.part_bounds
+    assert_allclose(outputs["data:mission:test:taxi_out:duration"], 60.0)
+    assert_allclose(outputs["data:mission:test:taxi_in:duration"], 0.0)
+    assert_allclose(outputs["data:mission:test:duration"], 60.0)
+
+
+def test_mission_warm_start():
+    warm_start = MissionWarmStart(max_relative_change=0.1)
+    mission = FlightSequence()
+    inputs = {"a": np.array([1.0]), "b": np.array([2.0, 0.0])}
+
+    # Nothing to apply before first computation
+    warm_start.apply(mission, inputs)
+    assert mission.point_count_hint is None
+    assert warm_start.use_count == 0
+
+    warm_start.store(mission, inputs, 100)
+    mission = FlightSequence()
+    warm_start.apply(mission, {"a": np.array([1.05]), "b": np.array([2.0, 0.0])})
+    assert mission.point_count_hint == 100
+    assert warm_start.use_count == 1
+
+    # Stored results are discarded if an input moves too far
+    mission = FlightSequence()
+    warm_start.apply(mission, {"a": np.array([1.0]), "b": np.array([2.0, 1.0])})
+    assert mission.point_count_hint is None
+    assert warm_start.point_count is None
+    assert (warm_start.use_count, warm_start.invalidation_count) == (1, 1)
+
+
+def test_mission_fidelity_schedule():
+    schedule = MissionFidelitySchedule(level_count=3, refinement_threshold=1.0e-3)
+    assert schedule.nominal_level == 2
+
+    def get_mission():
+        taxi = TaxiSegment(
+            target=FlightPoint(time=60.0),
+            propulsion=None,
+            polar=None,
+            reference_area=1.0,
+            time_step=1.0,
+        )
+        # Same segment twice: it must be modified only once
+        sub_sequence = FlightSequence()
+        sub_sequence.flight_sequence.append(taxi)
+        mission = FlightSequence()
+        mission.flight_sequence.extend([taxi, sub_sequence])
+        return mission
+
+    # First computation is done at nominal level
+    assert schedule.update({"a": np.array([1.0])}) == 2
+    assert schedule.input_change is None
+    mission = get_mission()
+    schedule.apply(mission)
+    assert mission.flight_sequence[0].time_step == 1.0
+
+    # Big change: lowest level
+    assert schedule.update({"a": np.array([1.5])}) == 0
+    assert_allclose(schedule.input_change, 0.5)
+    mission = get_mission()
+    schedule.apply(mission)
+    assert mission.flight_sequence[0].time_step == 4.0
+
+    # Intermediate change
+    assert schedule.update({"a": np.array([1.5075])}) == 1
+    mission = get_mission()
+    schedule.apply(mission)
+    assert mission.flight_sequence[0].time_step == 2.0
+
+    # Small change: back to nominal level
+    assert schedule.update({"a": np.array([1.508])}) == 2
+    mission = get_mission()
+    schedule.apply(mission)
+    assert mission.flight_sequence[0].time_step == 1.0
+
+    assert schedule.computation_counts == [1, 1, 2]
+
+
 def test_mission_group_breguet_with_loop(cleanup):
 
     input_file_path = pth.join(DATA_FOLDER_PATH, "test_mission.xml")
@@ -0,0 +1,91 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import openmdao.api as om
+from numpy.testing import assert_allclose
+from scipy.constants import foot, nautical_mile
+
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import FuelEngineSet
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import RubberEngine
+from tests.testing_utilities import run_system
+from ..multi_range_breguet import MultiRangeBreguet
+from ...polar import Polar
+from ...segments.cruise import BreguetCruiseSegment
+
+ENGINE_WRAPPER = "fastoad.wrapper.propulsion.rubber_engine"
+
+
+def test_multi_range_breguet():
+    start_masses = np.array([74000.0, 74000.0, 65000.0, 70000.0])
+    ranges = np.array([500.0, 2000.0, 1000.0, 3000.0]) * nautical_mile
+    altitudes = np.array([35000.0, 35000.0, 37000.0, 33000.0]) * foot
+    machs = np.array([0.78, 0.78, 0.8, 0.75])
+
+    ivc = om.IndepVarComp()
+    ivc.add_output("data:propulsion:rubber_engine:bypass_ratio", 5)
+    ivc.add_output("data:propulsion:rubber_engine:maximum_mach", 0.95)
+    ivc.add_output("data:propulsion:rubber_engine:design_altitude", 35000, units="ft")
+    ivc.add_output("data:propulsion:MTO_thrust", 100000, units="N")
+    ivc.add_output("data:propulsion:rubber_engine:overall_pressure_ratio", 30)
+    ivc.add_output("data:propulsion:rubber_engine:turbine_inlet_temperature", 1500, units="K")
+    ivc.add_output("data:geometry:propulsion:engine:count", 2)
+    ivc.add_output("data:geometry:wing:area", 120.0, units="m**2")
+    cl = np.linspace(0.0, 1.5, 150)
+    ivc.add_output("data:aerodynamics:aircraft:cruise:CL", cl)
+    ivc.add_output("data:aerodynamics:aircraft:cruise:CD", 0.05 * cl ** 2 + 0.02)
+    ivc.add_output("data:mission:multi_range:start_mass", start_masses, units="kg")
+    ivc.add_output("data:mission:multi_range:range", ranges, units="m")
+    ivc.add_output("data:mission:multi_range:altitude", altitudes, units="m")
+    ivc.add_output("data:mission:multi_range:mach", machs)
+
+    problem = run_system(MultiRangeBreguet(propulsion_id=ENGINE_WRAPPER, cruise_count=4), ivc)
+
+    fuel = problem["data:mission:multi_range:fuel"]
+    end_masses = problem["data:mission:multi_range:end_mass"]
+    assert_allclose(fuel + end_masses, start_masses)
+
+    # Results are the same as with one BreguetCruiseSegment computation per cruise
+    propulsion = FuelEngineSet(RubberEngine(5, 30, 1500, 100000, 0.95, 35000 * foot), 2)
+    polar = Polar(cl, 0.05 * cl ** 2 + 0.02)
+    for i in range(4):
+        segment = BreguetCruiseSegment(
+            target=FlightPoint(ground_distance=ranges[i]),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+        )
+        end_point = segment.compute_from(
+            FlightPoint(mass=start_masses[i], altitude=altitudes[i], mach=machs[i])
+        ).iloc[-1]
+        assert_allclose(end_masses[i], end_point.mass, rtol=1e-10)
+
+    # Each cruise depends only on its own inputs
+    totals = problem.compute_totals(
+        ["data:mission:multi_range:fuel"], ["data:mission:multi_range:range"]
+    )
+    derivatives = totals[("data:mission:multi_range:fuel", "data:mission:multi_range:range")]
+    assert np.all(np.diag(derivatives) > 0.0)
+    assert_allclose(derivatives - np.diag(np.diag(derivatives)), 0.0)
+
+    data = problem.check_partials(out_stream=None, method="fd")["component"]
+    for output_name in ["fuel", "end_mass"]:
+        for input_name in ["start_mass", "range", "altitude", "mach"]:
+            partials = data[
+                (
+                    "data:mission:multi_range:" + output_name,
+                    "data:mission:multi_range:" + input_name,
+                )
+            ]
+            assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-2, atol=1e-6)
@@ -12,9 +12,18 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict
+from numbers import Number
+from typing import Hashable
+
+import numpy as np
 from numpy import ndarray
-from scipy.interpolate import interp1d
-from scipy.optimize import fmin
+from scipy.interpolate import PPoly, make_interp_spline
+
+#: Default maximum number of polars kept in a :class:`PolarCache`.
+DEFAULT_POLAR_CACHE_SIZE = 32
 
 
 class Polar:
@@ -30,17 +39,36 @@ class Polar:
 
         Once defined, for any CL value, CD can be obtained using :meth:`cd`.
 
+        CD is interpolated with a quadratic spline, extrapolated with the polynomials of
+        first and last intervals. Spline is stored as polynomial coefficients on each
+        interval, so that evaluation needs no SciPy call.
+
         :param cl: a N-elements array with CL values
         :param cd: a N-elements array with CD values that match CL
         """
         self._definition_CL = cl
-        self._cd = interp1d(cl, cd, kind="quadratic", fill_value="extrapolate")
 
-        def _negated_lift_drag_ratio(lift_coeff):
-            """Returns -CL/CD."""
-            return -lift_coeff / self.cd(lift_coeff)
+        sorting = np.argsort(cl)
+        spline = PPoly.from_spline(
+            make_interp_spline(np.asarray(cl)[sorting], np.asarray(cd)[sorting], k=2)
+        )
+        # Spline knots are repeated at bounds, which creates intervals with null length
+        # that are removed here.
+        is_valid_interval = np.diff(spline.x) > 0.0
+
+        # Coefficients are ordered from highest degree to lowest.
+        self._interval_starts = spline.x[:-1][is_valid_interval]
+        self._coefficients = spline.c[:, is_valid_interval]
+        self._derivative_coefficients = self._coefficients[:-1] * np.arange(
+            len(self._coefficients) - 1, 0, -1
+        ).reshape((-1, 1))
 
-        self._optimal_CL = fmin(_negated_lift_drag_ratio, cl[0], disp=0)
+        # Python lists are faster for computing with one CL value
+        self._interval_starts_list = self._interval_starts.tolist()
+        self._coefficients_list = self._coefficients.T.tolist()
+        self._derivative_coefficients_list = self._derivative_coefficients.T.tolist()
+
+        self._optimal_CL = self._compute_optimal_cl(np.min(cl), np.max(cl))
 
     @property
     def definition_cl(self):
@@ -61,5 +89,156 @@ class Polar:
         :return: CD values for each provide CL values
         """
         if cl is None:
-            return self._cd(self._definition_CL)
-        return self._cd(cl)
+            cl = self._definition_CL
+        return self._evaluate(cl, self._coefficients, self._coefficients_list)
+
+    def cd_derivative(self, cl=None):
+        """
+        Computes derivative of drag coefficient with respect to lift coefficient (dCD/dCL).
+
+        :param cl: lift coefficient (CL) values. If not provided, the CL definition vector will be
+                   used
+        :return: dCD/dCL values for each provide CL values
+        """
+        if cl is None:
+            cl = self._definition_CL
+        return self._evaluate(cl, self._derivative_coefficients, self._derivative_coefficients_list)
+
+    def _evaluate(self, cl, coefficients: ndarray, coefficients_list: list):
+        """
+        Evaluates the piecewise polynomial defined by coefficients using Horner scheme.
+
+        :param cl: one CL value or an array of CL values
+        :param coefficients: polynomial coefficients as a (degree+1, interval count) array
+        :param coefficients_list: same as coefficients, as list of lists, transposed
+        :return: a float if cl is a number, or an array with same shape as cl
+        """
+        if isinstance(cl, Number):
+            index = max(bisect_right(self._interval_starts_list, cl) - 1, 0)
+            delta_cl = cl - self._interval_starts_list[index]
+            value = 0.0
+            for coefficient in coefficients_list[index]:
+                value = value * delta_cl + coefficient
+            return value
+
+        cl = np.asarray(cl)
+        indices = np.maximum(np.searchsorted(self._interval_starts, cl, side="right") - 1, 0)
+        delta_cl = cl - self._interval_starts[indices]
+        value = np.zeros(cl.shape)
+        for interval_coefficients in coefficients:
+            value = value * delta_cl + interval_coefficients[indices]
+        return value
+
+    def _compute_optimal_cl(self, min_cl: float, max_cl: float) -> float:
+        """
+        Computes the CL value in [min_cl, max_cl] that provides the larger lift/drag ratio.
+
+        Lift/drag ratio is extremal where CD - CL * dCD/dCL = 0. On each interval, with
+        CD = a * (CL - s)**2 + b * (CL - s) + c, this equation has solutions
+        CL = ±sqrt(s**2 + (c - b * s) / a). Solutions are candidates, along with bounds.
+
+        :return: the optimal CL value
+        """
+        starts = self._interval_starts
+        ends = np.append(starts[1:], np.inf)
+        a, b, c = self._coefficients
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            squared_roots = starts ** 2 + (c - b * starts) / a
+        has_roots = np.isfinite(squared_roots) & (squared_roots >= 0.0)
+        roots = np.sqrt(squared_roots[has_roots])
+        roots = np.concatenate((roots, -roots))
+        interval_indices = np.tile(np.flatnonzero(has_roots), 2)
+
+        # A root is kept if it is in the interval from which it has been computed.
+        is_valid_root = (roots >= starts[interval_indices]) & (roots <= ends[interval_indices])
+        candidates = np.concatenate(([min_cl, max_cl], roots[is_valid_root]))
+        candidates = candidates[(candidates >= min_cl) & (candidates <= max_cl)]
+
+        cd = self.cd(candidates)
+        lift_drag_ratios = np.full_like(candidates, -np.inf)
+        is_valid = cd > 0.0
+        lift_drag_ratios[is_valid] = candidates[is_valid] / cd[is_valid]
+
+        return float(candidates[np.argmax(lift_drag_ratios)])
+
+
+class PolarCache:
+    """
+    Cache of :class:`Polar` instances, where keys are computed from the content of CL and CD
+    arrays.
+
+    When the cache is full, the least recently used polar is removed.
+
+    Usage:
+
+    .. code-block::
+
+        >>> polar = POLAR_CACHE.get(cl, cd) # computed at first call with same CL and CD values
+        >>> print(POLAR_CACHE.hits, POLAR_CACHE.misses)
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POLAR_CACHE_SIZE):
+        """
+        :param max_size: maximum number of polars kept in cache
+        """
+        #: Maximum number of polars kept in cache.
+        self.max_size = max_size
+
+        #: Number of calls to :meth:`get` that returned an existing polar.
+        self.hits = 0
+
+        #: Number of calls to :meth:`get` that needed to build a new polar.
+        self.misses = 0
+
+        self._polars = OrderedDict()
+
+    def __len__(self):
+        return len(self._polars)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of :attr:`hits` among all calls to :meth:`get` (0. if no call yet)."""
+        call_count = self.hits + self.misses
+        return self.hits / call_count if call_count else 0.0
+
+    def get(self, cl: ndarray, cd: ndarray) -> Polar:
+        """
+        :param cl: a N-elements array with CL values
+        :param cd: a N-elements array with CD values that match CL
+        :return: the polar for provided values, from cache if possible
+        """
+        cl = np.array(cl, dtype=float)
+        cd = np.array(cd, dtype=float)
+        key = self._get_key(cl, cd)
+
+        polar = self._polars.get(key)
+        if polar is not None:
+            self.hits += 1
+            self._polars.move_to_end(key)
+            return polar
+
+        self.misses += 1
+        polar = Polar(cl, cd)
+        self._polars[key] = polar
+        if len(self._polars) > self.max_size:
+            self._polars.popitem(last=False)
+        return polar
+
+    def clear(self):
+        """Removes all polars from cache and resets counters."""
+        self._polars.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_key(cl: ndarray, cd: ndarray) -> Hashable:
+        digest = hashlib.blake2b(digest_size=20)
+        for values in [cl, cd]:
+            digest.update(str(values.shape).encode())
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.digest()
+
+
+#: Cache of polars that is shared by mission computations.
+POLAR_CACHE = PolarCache()
@@ -0,0 +1,117 @@
+"""Collection of performance statistics of mission computations."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+#: Name of the counter of integration steps, i.e. computed flight points.
+STEP_COUNT = "step_count"
+
+#: Name of the counter of calls to
+#: :meth:`~fastoad.models.performances.mission.segments.base.FlightSegment.complete_flight_point`.
+COMPLETION_COUNT = "completion_count"
+
+#: Name of the counter of calls to the propulsion model.
+PROPULSION_CALL_COUNT = "propulsion_call_count"
+
+#: Name of the counter of iterations of solvers (cruise distance of routes, location of
+#: segment ends, optimal altitudes).
+SOLVER_ITERATION_COUNT = "solver_iteration_count"
+
+COUNTERS = [STEP_COUNT, COMPLETION_COUNT, PROPULSION_CALL_COUNT, SOLVER_ITERATION_COUNT]
+
+
+class MissionProfiler:
+    """
+    Collects statistics about mission computations, aggregated by name of flight part.
+
+    For each flight part, it records the number of computations, the wall time spent in them
+    (including the time spent in their sub-parts) and the counters listed in
+    :data:`COUNTERS`. Counters are attributed to the innermost running flight part.
+
+    Nothing is recorded while :attr:`enabled` is False. Computation code should check this
+    attribute before calling :meth:`count`, so that the cost of a disabled profiler is only
+    an attribute lookup:
+
+    .. code-block::
+
+        >>> if MISSION_PROFILER.enabled:
+        ...     MISSION_PROFILER.count(STEP_COUNT)
+    """
+
+    def __init__(self):
+        #: If False, nothing is recorded.
+        self.enabled = False
+
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._running_parts: List[Tuple[str, float]] = []
+
+    def reset(self):
+        """Forgets all recorded statistics."""
+        self._stats = {}
+        self._running_parts = []
+
+    def start_part(self, name: str):
+        """
+        Tells that computation of a flight part begins.
+
+        :param name: name of the flight part
+        """
+        stats = self._get_part_stats(name)
+        # Segments can have the same name as their phase: they are counted only once.
+        if not self._is_running(name):
+            stats["call_count"] += 1
+        self._running_parts.append((name, perf_counter()))
+
+    def end_part(self):
+        """Tells that computation of the flight part of last call to :meth:`start_part` ends."""
+        name, start_time = self._running_parts.pop()
+        if not self._is_running(name):
+            self._stats[name]["wall_time"] += perf_counter() - start_time
+
+    def count(self, counter: str, increment: int = 1):
+        """
+        Increments a counter of current flight part.
+
+        :param counter: one of :data:`COUNTERS`
+        :param increment: value that is added to the counter
+        """
+        name = self._running_parts[-1][0] if self._running_parts else ""
+        self._get_part_stats(name)[counter] += increment
+
+    def get_stats(self) -> pd.DataFrame:
+        """
+        :return: recorded statistics, with one row per flight part name, in order of first
+                 computation. Columns are "call_count", "wall_time" (in seconds) and the
+                 counters of :data:`COUNTERS`.
+        """
+        return pd.DataFrame.from_dict(
+            self._stats, orient="index", columns=["call_count", "wall_time"] + COUNTERS
+        )
+
+    def _is_running(self, name: str) -> bool:
+        return any(running_name == name for running_name, _ in self._running_parts)
+
+    def _get_part_stats(self, name: str) -> Dict[str, float]:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = dict.fromkeys(["call_count", "wall_time"] + COUNTERS, 0)
+            stats["wall_time"] = 0.0
+        return stats
+
+
+#: The profiler used by mission computations.
+MISSION_PROFILER = MissionProfiler()
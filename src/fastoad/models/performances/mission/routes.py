@@ -14,17 +14,30 @@ Classes for computation of routes (i.e. assemblies of climb, cruise and descent
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import logging
+from copy import copy
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
-import pandas as pd
 from scipy.optimize import root_scalar
 
 from fastoad.model_base import FlightPoint
 from fastoad.models.performances.mission.base import FlightSequence, IFlightPart
+from fastoad.models.performances.mission.profiling import MISSION_PROFILER, SOLVER_ITERATION_COUNT
 from fastoad.models.performances.mission.segments.base import FlightSegment
 from fastoad.models.performances.mission.segments.cruise import CruiseSegment
+from fastoad.models.performances.mission.trajectory import TrajectoryBuffer
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+#: Maximum number of times the cruise distance solver is restarted when exact descent
+#: computation does not confirm the interpolated one.
+MAX_SOLVER_RUNS = 5
+
+#: When :attr:`RangedRoute.cruise_distance_guess` is used, it is kept without solving if the
+#: obtained flight distance is within this ratio of :attr:`RangedRoute.distance_accuracy`.
+GUESS_ACCURACY_RATIO = 0.1
 
 
 @dataclass
@@ -103,13 +116,32 @@ class RangedRoute(SimpleRoute):
     #: Accuracy on actual total ground distance for the solver. In meters
     distance_accuracy: float = 0.5e3
 
+    #: If provided, the cruise distance solver starts from this value. It is ignored if it is
+    #: not between 0 and :attr:`flight_distance`. In meters
+    cruise_distance_guess: Optional[float] = None
+
     def __post_init__(self):
         super().__post_init__()
 
-        # We will use this to keep data along root_scalar process (see _solve_cruise_distance() )
-        self._flight_points = None
+        #: Cruise distance obtained by last solving, that can be used as
+        #: :attr:`cruise_distance_guess` for a later computation of a similar route.
+        self.solved_cruise_distance = None
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+        #: Number of route distance evaluations during last solving of cruise distance. Each
+        #: evaluation integrates the cruise, while climb is computed once per solving.
+        self.route_evaluation_count = 0
+
+        #: Number of descent computations during last solving of cruise distance.
+        self.descent_computation_count = 0
+
+        # We will use these to keep data along root_scalar process (see _solve_cruise_distance())
+        self._evaluated_cruise_distance = None
+        self._cruise_points = None
+        self._descent_points = None
+        self._descent_samples = {}
+        self._evaluations = {}
+
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
         # In very simple cases, climb and descent phases can have fixed
         # covered ground distance. In that case, cruise distance is easy to
         # obtain from flight_distance.
@@ -122,7 +154,11 @@ class RangedRoute(SimpleRoute):
             return self._solve_cruise_distance(start)
 
         self.cruise_distance = self.flight_distance - np.sum(climb_descent_distances)
-        return super().compute_from(start)
+        return super().compute_trajectory(start)
+
+    def compute_batch(self, starts: Sequence[FlightPoint]) -> List[TrajectoryBuffer]:
+        # Cruise distance is solved for each start point, so flights are computed one by one.
+        return [self.compute_trajectory(start) for start in starts]
 
     @classmethod
     def _get_ground_distances(cls, phase: FlightSequence) -> list:
@@ -135,35 +171,201 @@ class RangedRoute(SimpleRoute):
 
         return ground_distances
 
-    def _solve_cruise_distance(self, start: FlightPoint) -> pd.DataFrame:
+    def _solve_cruise_distance(self, start: FlightPoint) -> TrajectoryBuffer:
         """
         Adjusts cruise distance through a solver to have whole route that
         matches provided flight distance.
-        """
 
-        root_scalar(
-            self._compute_flight,
-            args=(start,),
-            x0=self.flight_distance * 0.5,
-            x1=self.flight_distance * 0.25,
-            xtol=0.5e3,
-            method="secant",
-        )
+        Climb phases do not depend on cruise distance, so they are computed once. Ground
+        distance covered during descent phases depends on the end point of cruise. During
+        solving, it is interpolated among descents that have been computed for other masses
+        at the same altitude and speed. At the end, descent is computed for the obtained
+        cruise. If the obtained flight distance is not accurate enough, solving is done again.
 
-        return self._flight_points
+        If :attr:`cruise_distance_guess` is valid, route is first evaluated with it, then, if
+        needed, with the guess corrected by the missing distance. Solver is not used if
+        obtained flight distance is within :data:`GUESS_ACCURACY_RATIO` times
+        :attr:`distance_accuracy`.
+        """
+        self.route_evaluation_count = 0
+        self.descent_computation_count = 0
+        self._descent_samples = {}
+        self._evaluations = {}
+
+        climb_points = self._compute_phases(self.climb_phases, start)
+        cruise_start = climb_points[-1]
+        climb_distance = cruise_start.ground_distance - climb_points[0].ground_distance
+
+        guess = self.cruise_distance_guess
+        if guess and 0.0 < guess < self.flight_distance:
+            guess_accuracy = GUESS_ACCURACY_RATIO * self.distance_accuracy
+            # Covered distance varies almost like cruise distance.
+            x0 = guess
+            x1 = guess + self._compute_flight(x0, cruise_start, climb_distance)
+            is_solved = abs(x1 - x0) <= guess_accuracy
+            if not is_solved:
+                is_solved = abs(self._compute_flight(x1, cruise_start, climb_distance)) <= (
+                    guess_accuracy
+                )
+        else:
+            x0 = self.flight_distance * 0.5
+            x1 = self.flight_distance * 0.25
+            is_solved = False
+
+        for _ in range(MAX_SOLVER_RUNS):
+            if not is_solved:
+                root_scalar(
+                    self._compute_flight,
+                    args=(cruise_start, climb_distance),
+                    x0=x0,
+                    x1=x1,
+                    xtol=self.distance_accuracy,
+                    method="secant",
+                )
+            cruise_distance = self._cruise_points[-1].ground_distance - cruise_start.ground_distance
+            # Descent is computed only if last evaluation used interpolation.
+            descent_points = self._descent_points
+            if descent_points is None:
+                descent_points = self._compute_descent(self._cruise_points[-1])
+            missing_distance = self.flight_distance - (
+                climb_distance
+                + cruise_distance
+                + descent_points[-1].ground_distance
+                - descent_points[0].ground_distance
+            )
+            if abs(missing_distance) <= self.distance_accuracy:
+                break
+            x0 = self._evaluated_cruise_distance
+            x1 = self._evaluated_cruise_distance + missing_distance
+            is_solved = False
+
+        self.solved_cruise_distance = self._evaluated_cruise_distance
+        _LOGGER.debug(
+            "Cruise distance solved with %i route evaluations and %i descent computations.",
+            self.route_evaluation_count,
+            self.descent_computation_count,
+        )
 
-    def _compute_flight(self, cruise_distance, start: FlightPoint):
+        flight_points = climb_points
+        cruise_start_index = len(flight_points)
+        flight_points.extend(self._cruise_points, start=1)
+        if self.cruise_segment.name:
+            flight_points.set_part_bounds(
+                self.cruise_segment.name, cruise_start_index, len(flight_points)
+            )
+        flight_points.extend(descent_points, start=1)
+        return flight_points
+
+    def _compute_flight(self, cruise_distance, cruise_start: FlightPoint, climb_distance: float):
         """
-        Computes flight for provided cruise distance
+        Computes cruise for provided cruise distance, and estimates the following descent.
+
+        Results are kept during solving, so that a cruise distance is not evaluated twice.
 
         :param cruise_distance:
-        :param start:
-        :return: difference between computes distance and self.flight_distance
+        :param cruise_start: the last point of climb phases
+        :param climb_distance: ground distance covered during climb phases
+        :return: difference between computed distance and self.flight_distance
         """
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(SOLVER_ITERATION_COUNT)
+        cruise_distance = np.asarray(cruise_distance).item()
+        self._evaluated_cruise_distance = cruise_distance
+        if cruise_distance in self._evaluations:
+            missing_distance, self._cruise_points, self._descent_points = self._evaluations[
+                cruise_distance
+            ]
+            return missing_distance
+
+        self.route_evaluation_count += 1
         self.cruise_distance = cruise_distance
-        self._flight_points = super().compute_from(start)
+        is_profiled = MISSION_PROFILER.enabled and self.cruise_segment.name
+        if is_profiled:
+            MISSION_PROFILER.start_part(self.cruise_segment.name)
+        self._cruise_points = self.cruise_segment.compute_trajectory(copy(cruise_start))
+        if is_profiled:
+            MISSION_PROFILER.end_part()
+        cruise_end = self._cruise_points[-1]
         obtained_distance = (
-            self._flight_points.iloc[-1].ground_distance
-            - self._flight_points.iloc[0].ground_distance
+            climb_distance
+            + cruise_end.ground_distance
+            - cruise_start.ground_distance
+            + self._get_descent_distance(cruise_end)
+        )
+        missing_distance = self.flight_distance - obtained_distance
+        self._evaluations[cruise_distance] = (
+            missing_distance,
+            self._cruise_points,
+            self._descent_points,
         )
-        return self.flight_distance - obtained_distance
+        return missing_distance
+
+    def _get_descent_distance(self, descent_start: FlightPoint) -> float:
+        """
+        Provides ground distance covered during descent phases.
+
+        If descent is computed, its flight points are kept in self._descent_points, that is set
+        to None otherwise.
+
+        If descents have been computed for at least two masses with the same altitude and
+        speed as descent_start, distance is linearly interpolated with respect to mass from the
+        two closest ones. Otherwise, descent is computed.
+
+        :param descent_start: the last point of cruise
+        :return: the ground distance
+        """
+        samples = self._descent_samples.get(self._get_descent_key(descent_start), {})
+        if len(samples) < 2:
+            self._descent_points = self._compute_descent(descent_start)
+            return (
+                self._descent_points[-1].ground_distance - self._descent_points[0].ground_distance
+            )
+
+        self._descent_points = None
+
+        mass = np.asarray(descent_start.mass).item()
+        masses = np.array(list(samples.keys()))
+        mass1, mass2 = masses[np.argsort(np.abs(masses - mass))[:2]]
+        distance1, distance2 = samples[mass1], samples[mass2]
+        return distance1 + (distance2 - distance1) * (mass - mass1) / (mass2 - mass1)
+
+    def _compute_descent(self, descent_start: FlightPoint) -> TrajectoryBuffer:
+        """
+        Computes descent phases and stores the covered ground distance for interpolation
+        in :meth:`_get_descent_distance`.
+
+        :param descent_start: the last point of cruise
+        :return: the flight points of descent phases
+        """
+        self.descent_computation_count += 1
+        descent_points = self._compute_phases(self.descent_phases, descent_start)
+        samples = self._descent_samples.setdefault(self._get_descent_key(descent_start), {})
+        samples[np.asarray(descent_start.mass).item()] = np.asarray(
+            descent_points[-1].ground_distance - descent_points[0].ground_distance
+        ).item()
+        return descent_points
+
+    @staticmethod
+    def _get_descent_key(descent_start: FlightPoint) -> tuple:
+        """
+        :return: the values, apart from mass, that should be identical for descents to be
+                 interpolated
+        """
+        return (
+            np.asarray(descent_start.altitude).item(),
+            np.asarray(descent_start.true_airspeed).item(),
+        )
+
+    @staticmethod
+    def _compute_phases(phases: List[IFlightPart], start: FlightPoint) -> TrajectoryBuffer:
+        """
+        :return: flight points of provided phases, computed sequentially from start
+        """
+        if not phases:
+            flight_points = TrajectoryBuffer()
+            flight_points.append(copy(start))
+            return flight_points
+
+        sequence = FlightSequence()
+        sequence.flight_sequence.extend(phases)
+        return sequence.compute_trajectory(copy(start))
@@ -15,14 +15,15 @@
 import logging
 from copy import copy
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Tuple
 
-import pandas as pd
+import numpy as np
 from scipy.constants import foot, g
 
 from fastoad.model_base import AtmosphereSI, FlightPoint
 from .base import ManualThrustSegment
 from ..exceptions import FastFlightSegmentIncompleteFlightPoint
+from ..trajectory import TrajectoryBuffer
 from ..util import get_closest_flight_level
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
@@ -79,7 +80,8 @@ class AltitudeChangeSegment(ManualThrustSegment):
     #: with max lift/drag ratio.
     OPTIMAL_FLIGHT_LEVEL = "optimal_flight_level"  # pylint: disable=invalid-name # used as constant
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def _initialize_computation(self, start: FlightPoint):
+        super()._initialize_computation(start)
         self.complete_flight_point(start)  # needed to ensure all speed values are computed.
 
         if self.target.altitude is not None:
@@ -105,16 +107,31 @@ class AltitudeChangeSegment(ManualThrustSegment):
             atm.mach = start.mach
             start.true_airspeed = atm.true_airspeed
 
-        return super().compute_from(start)
+    def _is_batch_compatible(self) -> bool:
+        # Optimal altitude is computed with a scalar solver.
+        return not isinstance(self.target.altitude, str) and not isinstance(self.target.CL, str)
 
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         current = flight_points[-1]
 
         # Max flight level is first priority
         max_authorized_altitude = self.maximum_flight_level * 100.0 * foot
-        if current.altitude >= max_authorized_altitude:
+        is_above_max_altitude = current.altitude >= max_authorized_altitude
+        if np.all(is_above_max_altitude):
             return max_authorized_altitude - current.altitude
 
+        distance = self._get_unbounded_distance_to_target(flight_points)
+        if np.any(is_above_max_altitude):
+            # Happens only for flight points computed in lockstep (see compute_batch())
+            distance = np.where(
+                is_above_max_altitude, max_authorized_altitude - current.altitude, distance
+            )
+        return distance
+
+    def _get_unbounded_distance_to_target(self, flight_points: TrajectoryBuffer):
+        """Distance to target, without considering maximum flight level."""
+        current = flight_points[-1]
+
         if self.target.CL:
             # Optimal altitude is based on a target Mach number, though target speed
             # may be specified as TAS or EAS. If so, Mach number has to be computed
@@ -14,8 +14,10 @@
 
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Tuple
+from copy import copy
+from dataclasses import dataclass, fields
+from numbers import Number
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -24,16 +26,31 @@ from scipy.optimize import root_scalar
 
 import fastoad.model_base
 from fastoad.constants import EngineSetting
-from fastoad.model_base import AtmosphereSI, FlightPoint
+from fastoad.model_base import AtmosphereSI, FlightPoint, ScalarAtmosphereSI
+from fastoad.model_base.atmosphere import get_altitude_from_pressure
 from fastoad.model_base.propulsion import IPropulsion
 from fastoad.models.performances.mission.polar import Polar
 from ..base import IFlightPart
+from .integrators import ExplicitEulerIntegrator, IIntegrator
 from ..exceptions import FastFlightSegmentIncompleteFlightPoint
+from ..profiling import (
+    COMPLETION_COUNT,
+    MISSION_PROFILER,
+    PROPULSION_CALL_COUNT,
+    SOLVER_ITERATION_COUNT,
+    STEP_COUNT,
+)
+from ..trajectory import TrajectoryBuffer
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
 
 DEFAULT_TIME_STEP = 0.2
 
+_EULER_INTEGRATOR = ExplicitEulerIntegrator()
+
+#: Maximum number of flight point computations for locating the end of a segment.
+MAX_TARGET_LOCATION_ITERATIONS = 50
+
 
 @dataclass
 class FlightSegment(IFlightPart):
@@ -82,9 +99,19 @@ class FlightSegment(IFlightPart):
     #: between two iterations (which can mean the provided thrust rate is not adapted).
     interrupt_if_getting_further_from_target: bool = True
 
+    #: The time integration scheme. If not provided, explicit Euler scheme is used with
+    #: fixed :attr:`time_step`. Otherwise, :attr:`time_step` is the initial time step, that
+    #: can be adapted by the integrator.
+    integrator: IIntegrator = None
+
     #: Using this value will tell to keep the associated parameter constant.
     CONSTANT_VALUE = "constant"  # pylint: disable=invalid-name # used as constant
 
+    #: Number of flight point computations that were needed, during last call of
+    #: :meth:`compute_trajectory`, for locating the end of the segment once target has been
+    #: exceeded (0 if target has been reached without being exceeded).
+    target_location_evaluations = 0
+
     def __post_init__(self):
         # Ensure target fields are not numpy arrays
         self.target.scalarize()
@@ -104,45 +131,47 @@ class FlightSegment(IFlightPart):
         :return: a pandas DataFrame where columns names match fields of
                  :meth:`~fastoad.model_base.flight_point.FlightPoint`
         """
-        if start.time is None:
-            start.time = 0.0
-        if start.ground_distance is None:
-            start.ground_distance = 0.0
+        return self.compute_trajectory(start).to_dataframe()
+
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
+        """
+        Same as :meth:`compute_from`, but computed flight points are written in a
+        :class:`~fastoad.models.performances.mission.trajectory.TrajectoryBuffer` instance.
 
+        Subclasses that need to do some specific operations before computation should
+        overload :meth:`_initialize_computation`. Subclasses that need a completely specific
+        computation can overload this method (not :meth:`compute_from`), but then,
+        :meth:`compute_batch` will compute flight paths one by one.
+
+        :param start: the initial flight point (see :meth:`compute_from`)
+        :return: the computed flight points
+        """
+        self._set_default_start_values(start)
+        self._initialize_computation(start)
         self.complete_flight_point(start)
+        self.target_location_evaluations = 0
 
-        flight_points = [start]
+        flight_points = TrajectoryBuffer()
+        flight_points.append(start)
 
         previous_point_to_target = self._get_distance_to_target(flight_points)
         tol = 1.0e-5  # Such accuracy is not needed, but ensures reproducibility of results.
+        next_time_step = self.time_step
         while np.abs(previous_point_to_target) > tol:
-            self._add_new_flight_point(flight_points, self.time_step)
+            time_step, next_time_step = self._add_adaptive_flight_point(
+                flight_points, next_time_step
+            )
             last_point_to_target = self._get_distance_to_target(flight_points)
 
             if last_point_to_target * previous_point_to_target < 0.0:
 
-                # Target has been exceeded. Let's look for the exact time step using root_scalar.
-                def replace_last_point(time_step):
-                    """
-                    Replaces last point of flight_points.
-
-                    :param time_step: time step for new point
-                    :return: new distance to target
-                    """
-
-                    if isinstance(time_step, np.ndarray):
-                        # root_scalar() will provide time_step ad (1,) array, resulting
-                        # in all parameters of the new flight point being also (1,) arrays.
-                        # We want to avoid that
-                        time_step = time_step.item()
-                    del flight_points[-1]
-                    self._add_new_flight_point(flight_points, time_step)
-                    return self._get_distance_to_target(flight_points)
-
-                root_scalar(
-                    replace_last_point, x0=self.time_step, x1=self.time_step / 2.0, rtol=tol
+                # Target has been exceeded. Last point is replaced by a point at target.
+                self.target_location_evaluations = self._locate_target(
+                    flight_points, time_step, previous_point_to_target, last_point_to_target, tol
                 )
-                last_point_to_target = self._get_distance_to_target(flight_points)
+                # Target has been located. With large time steps, remaining distance to target
+                # can be above tolerance, but trying another step would only overshoot it.
+                last_point_to_target = 0.0
             elif (
                 np.abs(last_point_to_target) > np.abs(previous_point_to_target)
                 # If self.target.CL is defined, it means that we look for an optimal altitude and
@@ -155,7 +184,7 @@ class FlightSegment(IFlightPart):
                     "Please review the segment settings, especially thrust_rate.",
                     self.name,
                 )
-                del flight_points[-1]
+                flight_points.pop()
                 break
 
             msg = self._check_values(flight_points[-1])
@@ -165,9 +194,255 @@ class FlightSegment(IFlightPart):
 
             previous_point_to_target = last_point_to_target
 
-        flight_points_df = pd.DataFrame(flight_points)
+        return flight_points
+
+    def _locate_target(
+        self,
+        flight_points: TrajectoryBuffer,
+        time_step: float,
+        previous_distance: float,
+        last_distance: float,
+        tol: float,
+    ) -> int:
+        """
+        Replaces the last flight point, that is beyond target, by a flight point at target.
+
+        The time step for reaching target is searched with the secant method, initialized with
+        the two last flight points, that are already computed (they are the flight points
+        obtained with time steps 0 and `time_step`). Therefore, the first iteration is a linear
+        interpolation of distance to target between these two flight points, and each
+        iteration computes one flight point.
+
+        Generally, only one iteration is needed. With the explicit Euler scheme, the first
+        computed flight point is exactly at target as soon as distance to target is linear with
+        respect to integrated values (e.g. when target is an altitude, a ground distance, a time
+        or a true airspeed).
+
+        :param flight_points: computed flight points, where the last one is beyond target
+        :param time_step: time step that has been used for computing last flight point
+        :param previous_distance: distance to target of the flight point before the last one
+        :param last_distance: distance to target of the last flight point
+        :param tol: tolerance on distance to target, and relative tolerance on time step
+        :return: the number of computed flight points
+        """
+        step_0, distance_0 = 0.0, previous_distance
+        step_1, distance_1 = time_step, last_distance
+        evaluation_count = 0
+        while evaluation_count < MAX_TARGET_LOCATION_ITERATIONS and distance_1 != distance_0:
+            # Distances to target may be provided as (1,) arrays, but time step should be
+            # a float, so that fields of the new flight point are also floats.
+            step = float(step_1 - distance_1 * (step_1 - step_0) / (distance_1 - distance_0))
+            flight_points.pop()
+            self._add_new_flight_point(flight_points, step)
+            evaluation_count += 1
+
+            distance = self._get_distance_to_target(flight_points)
+            if np.abs(distance) <= tol or np.abs(step - step_1) <= tol * np.abs(step):
+                break
+            step_0, distance_0 = step_1, distance_1
+            step_1, distance_1 = step, distance
+
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(SOLVER_ITERATION_COUNT, evaluation_count)
+        _LOGGER.debug(
+            'End of "%s" located with %i flight point computation(s).', self.name, evaluation_count
+        )
+        return evaluation_count
+
+    def compute_batch(self, starts: Sequence[FlightPoint]) -> List[TrajectoryBuffer]:
+        """
+        Computes the flight path segment from each of provided start points.
+
+        If possible (see :meth:`_is_batch_compatible`), all flight paths are computed in
+        lockstep: at each time step, the states of all flight paths are advanced at once,
+        using numpy arrays for each field of the flight points. This way, the Python
+        overhead of each time step is shared by all computed flight paths.
+        Flight paths that have reached their target are frozen until all others are done.
+
+        Otherwise, flight paths are computed one by one.
+
+        Provided start points are expected to be defined for the same fields.
+
+        :param starts: the initial flight points (see :meth:`compute_from`)
+        :return: the computed flight points, one TrajectoryBuffer instance per start point
+        """
+        if not self._is_batch_compatible():
+            return [self._copy().compute_trajectory(start) for start in starts]
+
+        segment = self._copy()
+        for start in starts:
+            self._set_default_start_values(start)
+        start = _stack_flight_points(starts)
+        segment._initialize_computation(start)
+        segment.complete_flight_point(start)
+
+        recorder = _LockstepRecorder()
+        recorder.record(start, np.full(len(starts), True))
+
+        previous = start
+        previous_distance = segment._get_lockstep_distance(start, start, len(starts))
+        tol = 1.0e-5  # Same as compute_trajectory()
+        active = np.abs(previous_distance) > tol
+        while np.any(active):
+            time_step = np.where(active, self.time_step, 0.0)
+            new_point = segment._compute_lockstep_point(start, previous, time_step)
+            distance = segment._get_lockstep_distance(start, new_point, len(starts))
+
+            exceeded = active & (distance * previous_distance < 0.0)
+            if np.any(exceeded):
+                new_point, distance = segment._locate_lockstep_target(
+                    start, previous, new_point, previous_distance, distance, exceeded, tol
+                )
+
+            further = np.full(len(starts), False)
+            if self.interrupt_if_getting_further_from_target:
+                further = active & ~exceeded & (np.abs(distance) > np.abs(previous_distance))
+                if np.any(further):
+                    _LOGGER.warning(
+                        'Target cannot be reached in "%s" for start points %s. Segment '
+                        "computation interrupted. Please review the segment settings, "
+                        "especially thrust_rate.",
+                        self.name,
+                        np.flatnonzero(further).tolist(),
+                    )
+
+            accepted = active & ~further
+            recorder.record(new_point, accepted)
+
+            invalid = accepted & segment._get_invalid_members(new_point)
+            if np.any(invalid):
+                _LOGGER.warning(
+                    'Invalid values for start points %s. Segment computation interrupted in "%s".',
+                    np.flatnonzero(invalid).tolist(),
+                    self.name,
+                )
+
+            previous = _merge_flight_points(accepted, new_point, previous)
+            previous_distance = np.where(accepted, distance, previous_distance)
+            active = accepted & ~invalid & ~exceeded & (np.abs(distance) > tol)
+
+        return recorder.get_trajectories(len(starts))
+
+    def _is_batch_compatible(self) -> bool:
+        """
+        Tells if :meth:`compute_batch` can compute flight paths in lockstep.
+
+        By default, it is possible only if :meth:`compute_trajectory` is not overloaded and
+        if the explicit Euler scheme is used.
+        """
+        return type(self).compute_trajectory is FlightSegment.compute_trajectory and isinstance(
+            self._get_integrator(), ExplicitEulerIntegrator
+        )
+
+    def _copy(self) -> "FlightSegment":
+        """
+        :return: a shallow copy of the segment, except for the target that is also copied,
+                 as computation may modify it
+        """
+        segment = copy(self)
+        segment.target = copy(self.target)
+        return segment
+
+    def _compute_lockstep_point(
+        self, start: FlightPoint, previous: FlightPoint, time_step: np.ndarray
+    ) -> FlightPoint:
+        """
+        Computes and completes next flight point, where each field has one value per
+        start point.
+        """
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(STEP_COUNT)
+        new_point = self.compute_next_flight_point(_LockstepPoints(start, previous), time_step)
+        self.complete_flight_point(new_point)
+        return new_point
+
+    def _get_lockstep_distance(
+        self, start: FlightPoint, current: FlightPoint, size: int
+    ) -> np.ndarray:
+        """
+        :return: the distance to target for each start point, as an array of provided size
+        """
+        distance = self._get_distance_to_target(_LockstepPoints(start, current))
+        return np.broadcast_to(np.asarray(distance, dtype=float), (size,))
+
+    def _locate_lockstep_target(
+        self,
+        start: FlightPoint,
+        previous: FlightPoint,
+        new_point: FlightPoint,
+        previous_distance: np.ndarray,
+        distance: np.ndarray,
+        exceeded: np.ndarray,
+        tol: float,
+    ) -> Tuple[FlightPoint, np.ndarray]:
+        """
+        Adjusts time step for start points where target has been exceeded.
+
+        It does, for all concerned start points at once, the same iterations as
+        :meth:`_locate_target`.
+
+        :return: the modified new point and distance to target
+        """
+        step_0, distance_0 = np.zeros(len(distance)), previous_distance
+        step_1, distance_1 = np.full(len(distance), self.time_step), distance
+        iterating = exceeded.copy()
+        for _ in range(MAX_TARGET_LOCATION_ITERATIONS):
+            iterating &= distance_1 != distance_0
+            if not np.any(iterating):
+                break
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Values for start points that are not iterating are not used.
+                step = step_1 - distance_1 * (step_1 - step_0) / (distance_1 - distance_0)
+            new_point, distance = self._replace_lockstep_point(
+                start, previous, new_point, distance_1, iterating, step
+            )
+
+            converged = (np.abs(distance) <= tol) | (np.abs(step - step_1) <= tol * np.abs(step))
+            step_0 = np.where(iterating, step_1, step_0)
+            distance_0 = np.where(iterating, distance_1, distance_0)
+            step_1 = np.where(iterating, step, step_1)
+            distance_1 = distance
+            iterating &= ~converged
+
+        return new_point, distance_1
+
+    def _replace_lockstep_point(
+        self,
+        start: FlightPoint,
+        previous: FlightPoint,
+        new_point: FlightPoint,
+        distance: np.ndarray,
+        members: np.ndarray,
+        time_step: np.ndarray,
+    ) -> Tuple[FlightPoint, np.ndarray]:
+        """
+        Recomputes new point with provided time steps, only for specified members.
+
+        :return: the modified new point and distance to target
+        """
+        replacement = self._compute_lockstep_point(
+            start, previous, np.where(members, time_step, 0.0)
+        )
+        new_point = _merge_flight_points(members, replacement, new_point)
+        replacement_distance = self._get_lockstep_distance(start, replacement, len(distance))
+        return new_point, np.where(members, replacement_distance, distance)
+
+    def _get_invalid_members(self, flight_point: FlightPoint) -> np.ndarray:
+        """
+        Same checks as :meth:`_check_values`, for flight points with one value per start point.
 
-        return flight_points_df
+        :param flight_point:
+        :return: a boolean array that is True where values are not consistent
+        """
+        mach = np.asarray(flight_point.mach)
+        altitude = np.asarray(flight_point.altitude)
+        return (
+            (mach < self.mach_bounds[0])
+            | (mach > self.mach_bounds[1])
+            | (altitude < self.altitude_bounds[0])
+            | (altitude > self.altitude_bounds[1])
+            | (np.asarray(flight_point.mass) <= 0.0)
+        )
 
     def _check_values(self, flight_point: FlightPoint) -> str:
         """
@@ -186,19 +461,42 @@ class FlightSegment(IFlightPart):
         if flight_point.mass <= 0.0:
             return "Negative mass value."
 
-    def _add_new_flight_point(self, flight_points: List[FlightPoint], time_step):
+    def _add_new_flight_point(self, flight_points: TrajectoryBuffer, time_step):
         """
-        Appends a new flight point to provided flight point list.
+        Appends a new flight point to provided flight points.
 
-        :param flight_points: list of previous flight points, modified in place.
+        :param flight_points: previous flight points, modified in place.
         :param time_step: time step for new computed flight point.
         """
-        new_point = self.compute_next_flight_point(flight_points, time_step)
-        self.complete_flight_point(new_point)
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(STEP_COUNT)
+        new_point, _ = self._get_integrator().compute_step(self, flight_points, time_step)
         flight_points.append(new_point)
 
+    def _add_adaptive_flight_point(
+        self, flight_points: TrajectoryBuffer, time_step
+    ) -> Tuple[float, float]:
+        """
+        Appends a new flight point to provided flight points, with a time step that may be
+        adapted by the integrator.
+
+        :param flight_points: previous flight points, modified in place.
+        :param time_step: proposed time step for new computed flight point.
+        :return: the used time step and the proposed time step for next flight point
+        """
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(STEP_COUNT)
+        new_point, time_step, next_time_step = self._get_integrator().compute_adaptive_step(
+            self, flight_points, time_step
+        )
+        flight_points.append(new_point)
+        return time_step, next_time_step
+
+    def _get_integrator(self) -> IIntegrator:
+        return self.integrator if self.integrator else _EULER_INTEGRATOR
+
     def compute_next_flight_point(
-        self, flight_points: List[FlightPoint], time_step: float
+        self, flight_points: TrajectoryBuffer, time_step: float
     ) -> FlightPoint:
         """
         Computes time, altitude, speed, mass and ground distance of next flight point.
@@ -219,18 +517,58 @@ class FlightSegment(IFlightPart):
         )
         self._compute_next_altitude(next_point, previous)
 
+        if not self._has_constant_speed():
+            next_point.true_airspeed = previous.true_airspeed + time_step * previous.acceleration
+
+        self._set_non_integrated_values(next_point, start, previous)
+        return next_point
+
+    def _get_state_derivatives(self, flight_point: FlightPoint) -> Dict[str, float]:
+        """
+        Computes time derivatives of the fields that are integrated over time by
+        integrators (see :attr:`integrator`).
+
+        Other fields (except time) are expected to be set by :meth:`_set_non_integrated_values`.
+
+        :param flight_point: a completed flight point
+        :return: a dict with field names as keys and derivative values as values
+        """
+        derivatives = {
+            "mass": -self.propulsion.get_consumed_mass(flight_point, 1.0),
+            "ground_distance": flight_point.true_airspeed * np.cos(flight_point.slope_angle),
+            "altitude": flight_point.true_airspeed * np.sin(flight_point.slope_angle),
+        }
+        if not self._has_constant_speed():
+            derivatives["true_airspeed"] = flight_point.acceleration
+        return derivatives
+
+    def _set_non_integrated_values(
+        self, next_point: FlightPoint, start: FlightPoint, previous: FlightPoint
+    ):
+        """
+        Sets values of a new flight point that are not integrated over time.
+
+        :param next_point: the new flight point, modified in place
+        :param start: the first flight point of the segment
+        :param previous: the flight point before the new one
+        """
         if self.target.true_airspeed == self.CONSTANT_VALUE:
             next_point.true_airspeed = previous.true_airspeed
         elif self.target.equivalent_airspeed == self.CONSTANT_VALUE:
             next_point.equivalent_airspeed = start.equivalent_airspeed
         elif self.target.mach == self.CONSTANT_VALUE:
             next_point.mach = start.mach
-        else:
-            next_point.true_airspeed = previous.true_airspeed + time_step * previous.acceleration
 
         # The naming is not done in complete_flight_point for not naming the start point
         next_point.name = self.name
-        return next_point
+
+    def _has_constant_speed(self) -> bool:
+        """True if one speed parameter of target is set to :attr:`CONSTANT_VALUE`."""
+        return self.CONSTANT_VALUE in [
+            self.target.true_airspeed,
+            self.target.equivalent_airspeed,
+            self.target.mach,
+        ]
 
     def complete_flight_point(self, flight_point: FlightPoint):
         """
@@ -241,11 +579,13 @@ class FlightSegment(IFlightPart):
 
         :param flight_point: the flight point that will be completed in-place
         """
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(COMPLETION_COUNT)
         flight_point.engine_setting = self.engine_setting
 
-        self._complete_speed_values(flight_point)
+        atm = self._get_atmosphere(flight_point.altitude)
+        self._complete_speed_values(flight_point, atm)
 
-        atm = AtmosphereSI(flight_point.altitude)
         reference_force = 0.5 * atm.density * flight_point.true_airspeed ** 2 * self.reference_area
 
         if self.polar:
@@ -261,12 +601,44 @@ class FlightSegment(IFlightPart):
         )
 
     @staticmethod
-    def _complete_speed_values(flight_point: FlightPoint):
+    def _set_default_start_values(start: FlightPoint):
+        """Sets time and ground distance to 0. if they are not defined in start point."""
+        if start.time is None:
+            start.time = 0.0
+        if start.ground_distance is None:
+            start.ground_distance = 0.0
+
+    def _initialize_computation(self, start: FlightPoint):
         """
-        Computes consistent values between TAS, EAS and Mach, assuming one of them is defined.
+        Does needed operations before computation.
+
+        May be overloaded for modifying start point and/or target before the first time step.
+        Implementations should be able to handle start points where fields are numpy arrays
+        (see :meth:`compute_batch`).
+
+        :param start: the initial flight point, that can be modified in place
+        """
+
+    @staticmethod
+    def _get_atmosphere(altitude) -> Union[AtmosphereSI, ScalarAtmosphereSI]:
+        """
+        :param altitude: altitude in meters, as a scalar or as an array (see :meth:`compute_batch`)
+        :return: the atmosphere at provided altitude, using the scalar implementation if possible
         """
-        atm = AtmosphereSI(flight_point.altitude)
+        if isinstance(altitude, Number):
+            return ScalarAtmosphereSI(altitude)
+        return AtmosphereSI(altitude)
 
+    @staticmethod
+    def _complete_speed_values(
+        flight_point: FlightPoint, atm: Union[AtmosphereSI, ScalarAtmosphereSI]
+    ):
+        """
+        Computes consistent values between TAS, EAS and Mach, assuming one of them is defined.
+
+        :param flight_point: the flight point that will be completed in-place
+        :param atm: the atmosphere at flight point altitude
+        """
         if flight_point.true_airspeed is None:
             if flight_point.mach is not None:
                 atm.mach = flight_point.mach
@@ -298,16 +670,29 @@ class FlightSegment(IFlightPart):
         """
         Computes optimal altitude for provided mass and Mach number.
 
+        As density * speed_of_sound**2 = 1.4 * pressure, flying at optimal CL with
+        provided Mach number is a condition on pressure, and the altitude is directly obtained
+        from it. A numerical solver is used only if this computation fails.
+
         :param mass:
         :param mach:
+        :param altitude_guess: starting point of the numerical solver
         :return: altitude that matches optimal CL
         """
+        optimal_pressure = (
+            mass * g / (0.7 * self.reference_area * mach ** 2 * self.polar.optimal_cl)
+        )
+        optimal_altitude = get_altitude_from_pressure(optimal_pressure)
+        if np.all(np.isfinite(optimal_altitude)):
+            return optimal_altitude
 
         if altitude_guess is None:
             altitude_guess = 10000.0
 
         def distance_to_optimum(altitude):
-            atm = AtmosphereSI(altitude)
+            if MISSION_PROFILER.enabled:
+                MISSION_PROFILER.count(SOLVER_ITERATION_COUNT)
+            atm = self._get_atmosphere(altitude)
             true_airspeed = mach * atm.speed_of_sound
             optimal_air_density = (
                 2.0 * mass * g / (self.reference_area * true_airspeed ** 2 * self.polar.optimal_cl)
@@ -321,7 +706,7 @@ class FlightSegment(IFlightPart):
         return optimal_altitude
 
     @abstractmethod
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         """
         Computes a "distance" from last flight point to target.
 
@@ -330,7 +715,7 @@ class FlightSegment(IFlightPart):
         which "side" of the target we are.
         And of course, it should be 0. if flight point is on target.
 
-        :param flight_points: list of all currently computed flight_points
+        :param flight_points: all currently computed flight_points
         :return: O. if target is attained, a non-null value otherwise
         """
 
@@ -369,6 +754,8 @@ class ManualThrustSegment(FlightSegment, ABC):
     def _compute_propulsion(self, flight_point: FlightPoint):
         flight_point.thrust_rate = self.thrust_rate
         flight_point.thrust_is_regulated = False
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(PROPULSION_CALL_COUNT)
         self.propulsion.compute_flight_points(flight_point)
 
 
@@ -387,6 +774,8 @@ class RegulatedThrustSegment(FlightSegment, ABC):
     def _compute_propulsion(self, flight_point: FlightPoint):
         flight_point.thrust = flight_point.drag
         flight_point.thrust_is_regulated = True
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(PROPULSION_CALL_COUNT)
         self.propulsion.compute_flight_points(flight_point)
 
     def _get_gamma_and_acceleration(self, mass, drag, thrust) -> Tuple[float, float]:
@@ -401,15 +790,208 @@ class FixedDurationSegment(FlightSegment, ABC):
     Target duration is provide as target.time.
     When using :meth:`compute_from`, if start.time is not 0, end time will be
     start.time + target.time.
+
+    If :attr:`use_closed_form` is True, flight points are computed directly at requested
+    times instead of by time stepping. It is possible because altitude and speed are
+    constant. Mass is then obtained as:
+
+        - with imposed thrust, the fuel flow does not depend on mass, so mass decreases
+          linearly with time.
+        - with regulated thrust, the fuel flow is proportional to mass, as long as the lift
+          to drag ratio and the specific fuel consumption do not vary much. Mass is then an
+          exponential function of time (Breguet endurance formula), where the fuel flow per
+          mass unit is evaluated at mid-segment.
+
+    Time stepping is still used if flight conditions are not constant, or if
+    `has_non_smooth_mass_dependency` attribute of propulsion is True.
     """
 
     time_step: float = 60.0
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        if start.time:
-            self.target.time = self.target.time + start.time
-        return super().compute_from(start)
+    #: If True, the segment is computed in closed form instead of by time stepping.
+    use_closed_form: bool = False
+
+    #: Time interval between flight points provided by the closed form computation, in
+    #: seconds. If None, only start and end points are provided.
+    closed_form_time_step: Optional[float] = None
+
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
+        if self.use_closed_form and not self.propulsion.has_non_smooth_mass_dependency:
+            self._set_default_start_values(start)
+            self.complete_flight_point(start)
+            if np.all(start.slope_angle == 0.0) and np.all(start.acceleration == 0.0):
+                self._initialize_computation(start)
+                return self._compute_closed_form(start)
 
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+        return super().compute_trajectory(start)
+
+    def _compute_closed_form(self, start: FlightPoint) -> TrajectoryBuffer:
+        """
+        Computes flight points of the segment without time stepping.
+
+        :param start: the initial flight point, already completed
+        :return: the computed flight points
+        """
+        self.target_location_evaluations = 0
+        flight_points = TrajectoryBuffer()
+        flight_points.append(start)
+
+        duration = float(self.target.time - start.time)
+        if duration <= 1.0e-5:
+            return flight_points
+
+        if self.closed_form_time_step:
+            times = np.arange(self.closed_form_time_step, duration, self.closed_form_time_step)
+            # Avoids a nearly duplicated flight point at end of segment
+            times = times[duration - times > 1.0e-5]
+            times = np.append(times, duration)
+        else:
+            times = np.array([duration])
+
+        start_mass = float(start.mass)
+        start_fuel_flow = float(self.propulsion.get_consumed_mass(start, 1.0))
+        if isinstance(self, RegulatedThrustSegment):
+            mid_point = copy(start)
+            mid_point.mass = start_mass * np.exp(-start_fuel_flow / start_mass * duration / 2.0)
+            self.complete_flight_point(mid_point)
+            mass_rate = float(self.propulsion.get_consumed_mass(mid_point, 1.0)) / mid_point.mass
+            masses = start_mass * np.exp(-mass_rate * times)
+        else:
+            masses = start_mass - start_fuel_flow * times
+
+        for time, mass in zip(times, masses):
+            flight_point = copy(start)
+            flight_point.time = start.time + time
+            flight_point.mass = mass
+            flight_point.ground_distance = start.ground_distance + start.true_airspeed * time
+            flight_point.name = self.name
+            self.complete_flight_point(flight_point)
+            flight_points.append(flight_point)
+
+        return flight_points
+
+    def _is_batch_compatible(self) -> bool:
+        return (
+            not self.use_closed_form
+            and type(self).compute_trajectory is FixedDurationSegment.compute_trajectory
+            and isinstance(self._get_integrator(), ExplicitEulerIntegrator)
+        )
+
+    def _initialize_computation(self, start: FlightPoint):
+        super()._initialize_computation(start)
+        self.target.time = self.target.time + start.time
+
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         current = flight_points[-1]
         return self.target.time - current.time
+
+
+class _LockstepPoints:
+    """
+    Stands for the TrajectoryBuffer instance that is provided to methods like
+    :meth:`FlightSegment.compute_next_flight_point` when computing in lockstep.
+
+    Only the start point (index 0) and the current point (index -1) are available. Their
+    fields have one value per computed flight path.
+    """
+
+    def __init__(self, start: FlightPoint, current: FlightPoint):
+        self._start = start
+        self._current = current
+
+    def __getitem__(self, index: int) -> FlightPoint:
+        if index == 0:
+            return self._start
+        if index == -1:
+            return self._current
+        raise IndexError("Only first and last flight points are available in lockstep mode.")
+
+
+class _LockstepRecorder:
+    """Stores flight points computed in lockstep, before splitting them in trajectories."""
+
+    def __init__(self):
+        self._members = []
+        self._values = {field.name: [] for field in fields(FlightPoint)}
+
+    def record(self, flight_point: FlightPoint, members: np.ndarray):
+        """
+        :param flight_point: a flight point with one value per computed flight path
+        :param members: a boolean array that is True for flight paths that should be recorded
+        """
+        indices = np.flatnonzero(members)
+        if len(indices) == 0:
+            return
+
+        self._members.append(indices)
+        for name, values in self._values.items():
+            value = getattr(flight_point, name)
+            if np.ndim(value) == 0:
+                values.append(np.full(len(indices), value))
+            else:
+                values.append(np.asarray(value)[indices])
+
+    def get_trajectories(self, size: int) -> List[TrajectoryBuffer]:
+        """
+        :param size: the number of computed flight paths
+        :return: recorded flight points, one TrajectoryBuffer instance per flight path
+        """
+        members = np.concatenate(self._members)
+        # Stable sort keeps the chronological order of each flight path.
+        order = np.argsort(members, kind="stable")
+        bounds = np.searchsorted(members[order], np.arange(1, size))
+        split_columns = {
+            name: np.split(np.concatenate(values)[order], bounds)
+            for name, values in self._values.items()
+        }
+        return [
+            TrajectoryBuffer.from_columns(
+                {name: values[i] for name, values in split_columns.items()}
+            )
+            for i in range(size)
+        ]
+
+
+def _stack_flight_points(flight_points: Sequence[FlightPoint]) -> FlightPoint:
+    """
+    Builds a flight point where each field has one value per provided flight point.
+
+    Fields that are None, or equal, for all provided flight points are kept as scalars.
+    """
+    stacked = FlightPoint()
+    for field in fields(FlightPoint):
+        values = [getattr(flight_point, field.name) for flight_point in flight_points]
+        if all(value is None for value in values):
+            value = None
+        elif field.type is float:
+            value = np.array([np.nan if value is None else value for value in values], dtype=float)
+        elif all(value == values[0] for value in values):
+            value = values[0]
+        else:
+            value = np.array(values, dtype=object)
+        setattr(stacked, field.name, value)
+    return stacked
+
+
+def _merge_flight_points(
+    condition: np.ndarray, flight_point_1: FlightPoint, flight_point_2: FlightPoint
+) -> FlightPoint:
+    """
+    :return: a flight point with values of flight_point_1 where condition is True, and values
+             of flight_point_2 elsewhere
+    """
+    if np.all(condition):
+        return flight_point_1
+
+    merged = FlightPoint()
+    for field in fields(FlightPoint):
+        value_1 = getattr(flight_point_1, field.name)
+        value_2 = getattr(flight_point_2, field.name)
+        if value_1 is None or value_2 is None:
+            value = value_1 if value_2 is None else value_2
+        elif np.ndim(value_1) == 0 and np.ndim(value_2) == 0 and value_1 == value_2:
+            value = value_1
+        else:
+            value = np.where(condition, value_1, value_2)
+        setattr(merged, field.name, value)
+    return merged
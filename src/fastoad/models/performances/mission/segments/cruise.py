@@ -12,17 +12,18 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from copy import deepcopy
+from copy import copy, deepcopy
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Optional, Tuple
 
 import numpy as np
-import pandas as pd
 from scipy.constants import foot, g
 
 from fastoad.model_base import FlightPoint
 from .altitude_change import AltitudeChangeSegment
 from .base import FlightSegment, RegulatedThrustSegment
+from ..profiling import MISSION_PROFILER, PROPULSION_CALL_COUNT
+from ..trajectory import TrajectoryBuffer
 from ..util import get_closest_flight_level
 
 
@@ -48,12 +49,11 @@ class CruiseSegment(RegulatedThrustSegment):
         ):
             self.target.mach = FlightSegment.CONSTANT_VALUE
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
-        if start.ground_distance:
-            self.target.ground_distance = self.target.ground_distance + start.ground_distance
-        return super().compute_from(start)
+    def _initialize_computation(self, start: FlightPoint):
+        super()._initialize_computation(start)
+        self.target.ground_distance = self.target.ground_distance + start.ground_distance
 
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         current = flight_points[-1]
         return self.target.ground_distance - current.ground_distance
 
@@ -71,15 +71,28 @@ class OptimalCruiseSegment(CruiseSegment):
     `true_airspeed` and `equivalent_airspeed`. If not, Mach will be assumed constant.
     """
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
         start.altitude = self._get_optimal_altitude(start.mass, start.mach)
-        return super().compute_from(start)
+        return super().compute_trajectory(start)
 
     def _compute_next_altitude(self, next_point: FlightPoint, previous_point: FlightPoint):
         next_point.altitude = self._get_optimal_altitude(
             next_point.mass, previous_point.mach, altitude_guess=previous_point.altitude
         )
 
+    def _get_state_derivatives(self, flight_point: FlightPoint) -> Dict[str, float]:
+        # Altitude is not integrated, as it depends only on mass.
+        derivatives = super()._get_state_derivatives(flight_point)
+        del derivatives["altitude"]
+        return derivatives
+
+    def _set_non_integrated_values(
+        self, next_point: FlightPoint, start: FlightPoint, previous: FlightPoint
+    ):
+        super()._set_non_integrated_values(next_point, start, previous)
+        if next_point.altitude is None:
+            self._compute_next_altitude(next_point, previous)
+
 
 @dataclass
 class ClimbAndCruiseSegment(CruiseSegment):
@@ -101,6 +114,10 @@ class ClimbAndCruiseSegment(CruiseSegment):
 
     In this case, climb will be done up to the IFR Flight Level (as multiple of 100 feet) that
     ensures minimum mass decrease, while being at most equal to :attr:`maximum_flight_level`.
+    Flight levels are tried in ascending order: the climb to each candidate level continues
+    the climb to the previous one, and the cruise fuel is estimated using Breguet formula
+    on :attr:`cruise_estimate_step_count` parts of the cruise. Only the cruise at the chosen
+    flight level is computed by time integration.
     """
 
     #: The AltitudeChangeSegment that can be used if a preliminary climb is needed (its target
@@ -110,7 +127,18 @@ class ClimbAndCruiseSegment(CruiseSegment):
     #: The maximum allowed flight level (i.e. multiple of 100 feet).
     maximum_flight_level: float = 500.0
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    #: Number of parts of the cruise where Breguet formula is applied for estimating fuel
+    #: consumption when searching the optimal flight level.
+    cruise_estimate_step_count: int = 10
+
+    #: If provided, the optimal flight level is searched from this altitude (in meters), e.g.
+    #: the :attr:`cruise_altitude` of a previous computation of a similar flight.
+    flight_level_guess: Optional[float] = None
+
+    #: Cruise altitude (in meters) obtained during last call of :meth:`compute_trajectory`.
+    cruise_altitude = None
+
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
         climb_segment = deepcopy(self.climb_segment)
         climb_segment.target = deepcopy(self.target)
 
@@ -120,6 +148,8 @@ class ClimbAndCruiseSegment(CruiseSegment):
             reference_area=self.reference_area,
             polar=self.polar,
             name=self.name,
+            time_step=self.time_step,
+            integrator=self.integrator,
         )
 
         if start.ground_distance:
@@ -131,38 +161,104 @@ class ClimbAndCruiseSegment(CruiseSegment):
         ):
             cruise_segment.target.altitude = None
 
-            # Go to the next flight level, or keep altitude if already at a flight level
-            cruise_altitude = get_closest_flight_level(start.altitude - 1.0e-3)
+            climb_points = self._climb_to_optimal_flight_level(start, climb_segment, cruise_segment)
+            results = self._cruise_after_climb(climb_points, cruise_segment)
+
+        elif self.target.altitude is not None:
             results = self._climb_to_altitude_and_cruise(
-                start, cruise_altitude, climb_segment, cruise_segment
+                start, self.target.altitude, climb_segment, cruise_segment
             )
-            mass_loss = start.mass - results.mass.iloc[-1]
+        else:
+            results = super().compute_trajectory(start)
+
+        self.cruise_altitude = np.asarray(results[-1].altitude).item()
+        return results
+
+    def _climb_to_optimal_flight_level(
+        self,
+        start: FlightPoint,
+        climb_segment: AltitudeChangeSegment,
+        cruise_segment: CruiseSegment,
+    ) -> TrajectoryBuffer:
+        """
+        Climbs up to the flight level that ensures minimum mass decrease.
 
-            go_to_next_level = True
+        If :attr:`flight_level_guess` is provided, the search starts at the flight level
+        below it. If the flight level above is not better, the optimum may be below, and the
+        search is done again from start.
 
-            while go_to_next_level:
-                old_mass_loss = mass_loss
-                cruise_altitude = get_closest_flight_level(cruise_altitude + 1.0e-3)
-                if cruise_altitude > self.maximum_flight_level * 100.0 * foot:
-                    break
+        :param start:
+        :param climb_segment:
+        :param cruise_segment:
+        :return: flight points of the climb
+        """
+        # Go to the next flight level, or keep altitude if already at a flight level
+        first_altitude = get_closest_flight_level(start.altitude - 1.0e-3)
 
-                new_results = self._climb_to_altitude_and_cruise(
-                    start, cruise_altitude, climb_segment, cruise_segment
+        if self.flight_level_guess is not None:
+            lower_altitude = get_closest_flight_level(
+                self.flight_level_guess - 1.0e-3, up_direction=False
+            )
+            if first_altitude < lower_altitude < self.maximum_flight_level * 100.0 * foot:
+                climb_points, level_count = self._climb_to_better_flight_levels(
+                    start, lower_altitude, climb_segment, cruise_segment
                 )
-                mass_loss = start.mass - new_results.mass.iloc[-1]
+                if level_count > 0:
+                    return climb_points
 
-                go_to_next_level = mass_loss < old_mass_loss
-                if go_to_next_level:
-                    results = new_results
+        climb_points, _ = self._climb_to_better_flight_levels(
+            start, first_altitude, climb_segment, cruise_segment
+        )
+        return climb_points
 
-        elif self.target.altitude is not None:
-            results = self._climb_to_altitude_and_cruise(
-                start, self.target.altitude, climb_segment, cruise_segment
+    def _climb_to_better_flight_levels(
+        self,
+        start: FlightPoint,
+        first_altitude: float,
+        climb_segment: AltitudeChangeSegment,
+        cruise_segment: CruiseSegment,
+    ) -> Tuple[TrajectoryBuffer, int]:
+        """
+        Climbs up to first_altitude, then to upper flight levels as long as they decrease the
+        estimated mass loss.
+
+        :param start:
+        :param first_altitude: the lowest flight level that is tried
+        :param climb_segment:
+        :param cruise_segment:
+        :return: flight points of the climb, and the number of flight levels above
+                 first_altitude that have been climbed
+        """
+        cruise_altitude = first_altitude
+        climb_points = self._climb_to_altitude(copy(start), cruise_altitude, climb_segment)
+        mass_loss = start.mass - self._estimate_cruise_end_mass(climb_points[-1], cruise_segment)
+        level_count = 0
+
+        while True:
+            old_mass_loss = mass_loss
+            cruise_altitude = get_closest_flight_level(cruise_altitude + 1.0e-3)
+            if cruise_altitude > self.maximum_flight_level * 100.0 * foot:
+                break
+
+            # Climb to next flight level starts from the top of the previous climb.
+            new_climb_points = TrajectoryBuffer()
+            new_climb_points.extend(climb_points)
+            new_climb_points.extend(
+                self._climb_to_altitude(copy(climb_points[-1]), cruise_altitude, climb_segment),
+                start=1,
+            )
+            mass_loss = start.mass - self._estimate_cruise_end_mass(
+                new_climb_points[-1], cruise_segment
             )
-        else:
-            results = super().compute_from(start)
 
-        return results
+            # Written this way so that search is also stopped if estimate is not a number
+            # (e.g. if the polar does not allow to fly at this flight level).
+            if not mass_loss < old_mass_loss:
+                break
+            climb_points = new_climb_points
+            level_count += 1
+
+        return climb_points, level_count
 
     def _climb_to_altitude_and_cruise(
         self,
@@ -170,7 +266,7 @@ class ClimbAndCruiseSegment(CruiseSegment):
         cruise_altitude: float,
         climb_segment: AltitudeChangeSegment,
         cruise_segment: CruiseSegment,
-    ):
+    ) -> TrajectoryBuffer:
         """
         Climbs up to cruise_altitude and cruise, while ensuring final ground_distance is
         equal to self.target.ground_distance.
@@ -181,21 +277,94 @@ class ClimbAndCruiseSegment(CruiseSegment):
         :param cruise_segment:
         :return:
         """
+        climb_points = self._climb_to_altitude(start, cruise_altitude, climb_segment)
+        return self._cruise_after_climb(climb_points, cruise_segment)
+
+    def _climb_to_altitude(
+        self, start: FlightPoint, cruise_altitude: float, climb_segment: AltitudeChangeSegment
+    ) -> TrajectoryBuffer:
+        """
+        Climbs up to cruise_altitude, with the speed that is specified for the cruise.
+
+        :param start:
+        :param cruise_altitude:
+        :param climb_segment:
+        :return: flight points of the climb
+        """
         climb_segment.target = FlightPoint(
             altitude=cruise_altitude,
-            mach=cruise_segment.target.mach,
-            true_airspeed=cruise_segment.target.true_airspeed,
-            equivalent_airspeed=cruise_segment.target.equivalent_airspeed,
+            mach=self.target.mach,
+            true_airspeed=self.target.true_airspeed,
+            equivalent_airspeed=self.target.equivalent_airspeed,
         )
-        climb_points = climb_segment.compute_from(start)
+        return climb_segment.compute_trajectory(start)
 
-        cruise_start = FlightPoint.create(climb_points.iloc[-1])
+    def _cruise_after_climb(
+        self, climb_points: TrajectoryBuffer, cruise_segment: CruiseSegment
+    ) -> TrajectoryBuffer:
+        """
+        Computes the cruise after provided climb, while ensuring final ground_distance is
+        equal to self.target.ground_distance.
+
+        :param climb_points: flight points of the climb, that will be extended with cruise
+        :param cruise_segment:
+        :return: flight points of climb and cruise
+        """
+        cruise_start = copy(climb_points[-1])
         cruise_segment.target.ground_distance = (
             self.target.ground_distance - cruise_start.ground_distance
         )
-        cruise_points = cruise_segment.compute_from(cruise_start)
+        climb_points.extend(cruise_segment.compute_trajectory(cruise_start))
+
+        return climb_points
 
-        return pd.concat([climb_points, cruise_points]).reset_index(drop=True)
+    def _estimate_cruise_end_mass(
+        self, cruise_start: FlightPoint, cruise_segment: CruiseSegment
+    ) -> float:
+        """
+        Estimates mass at end of the cruise that starts at provided flight point and ends at
+        self.target.ground_distance.
+
+        Breguet formula is applied successively on :attr:`cruise_estimate_step_count` parts of
+        the cruise, with lift/drag ratio and SFC computed at the middle of each part.
+
+        :param cruise_start: the flight point at top of climb
+        :param cruise_segment:
+        :return: the estimated mass at end of cruise
+        """
+        step_distance = (
+            self.target.ground_distance - cruise_start.ground_distance
+        ) / self.cruise_estimate_step_count
+        # Mass is not modified in place, as it can be the mass array of cruise_start.
+        mass = cruise_start.mass
+        for _ in range(self.cruise_estimate_step_count):
+            middle_mass = mass * self._get_breguet_mass_ratio(
+                cruise_start, mass, 0.5 * step_distance, cruise_segment
+            )
+            mass = mass * self._get_breguet_mass_ratio(
+                cruise_start, middle_mass, step_distance, cruise_segment
+            )
+        return mass
+
+    @staticmethod
+    def _get_breguet_mass_ratio(
+        cruise_start: FlightPoint, mass: float, distance: float, cruise_segment: CruiseSegment
+    ) -> float:
+        """
+        :return: the mass ratio given by Breguet formula for flying provided distance at
+                 altitude and speed of cruise_start, with lift/drag ratio and SFC computed
+                 for provided mass
+        """
+        flight_point = FlightPoint(
+            altitude=cruise_start.altitude,
+            mach=cruise_start.mach,
+            mass=mass,
+            ground_distance=cruise_start.ground_distance,
+            time=cruise_start.time,
+        )
+        cruise_segment.complete_flight_point(flight_point)
+        range_factor = flight_point.true_airspeed * flight_point.CL / flight_point.CD / g
+        return np.exp(-distance * flight_point.sfc / range_factor)
 
 
 @dataclass
@@ -222,7 +391,7 @@ class BreguetCruiseSegment(CruiseSegment):
         super().__post_init__()
         self.target.ground_distance = self.target.ground_distance - self.climb_and_descent_distance
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
         self.complete_flight_point(start)
 
         cruise_mass_ratio = self._compute_cruise_mass_ratio(start, self.target.ground_distance)
@@ -234,7 +403,64 @@ class BreguetCruiseSegment(CruiseSegment):
         end.name = self.name
         self.complete_flight_point(end)
 
-        return pd.DataFrame([start, end])
+        flight_points = TrajectoryBuffer()
+        flight_points.append(start)
+        flight_points.append(end)
+        return flight_points
+
+    def compute_cruises(
+        self, start_masses, ranges, altitudes, machs
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes several cruises at once using Breguet-Leduc formula.
+
+        Provided values are broadcast together, so each of them can be a scalar or an array.
+        Each cruise is at constant altitude and Mach number. The target of the segment is not
+        used, but :attr:`climb_and_descent_distance` is subtracted from each range, like it is
+        done for the target ground distance.
+
+        Lift/drag ratio and SFC are evaluated at start of each cruise, like in
+        :meth:`compute_trajectory`, but the propulsion model is called only once for all
+        cruises, with flight points where fields are numpy arrays.
+
+        :param start_masses: masses at start of cruises, in kg
+        :param ranges: ranges of cruises, in m
+        :param altitudes: altitudes of cruises, in m
+        :param machs: Mach numbers of cruises
+        :return: consumed fuel masses and masses at end of cruises, in kg
+        """
+        start_masses, ranges, altitudes, machs = np.broadcast_arrays(
+            *[np.asarray(value, dtype=float) for value in [start_masses, ranges, altitudes, machs]]
+        )
+        flight_points = FlightPoint(
+            altitude=altitudes,
+            mach=machs,
+            mass=start_masses,
+            engine_setting=self.engine_setting,
+            thrust_is_regulated=True,
+        )
+        atm = self._get_atmosphere(altitudes)
+        self._complete_speed_values(flight_points, atm)
+
+        if self.use_max_lift_drag_ratio:
+            lift_drag_ratios = self.polar.optimal_cl / self.polar.cd(self.polar.optimal_cl)
+        else:
+            reference_force = (
+                0.5 * atm.density * flight_points.true_airspeed ** 2 * self.reference_area
+            )
+            flight_points.CL = start_masses * g / reference_force
+            flight_points.CD = self.polar.cd(flight_points.CL)
+            lift_drag_ratios = flight_points.CL / flight_points.CD
+        flight_points.thrust = start_masses / lift_drag_ratios * g
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(PROPULSION_CALL_COUNT)
+        self.propulsion.compute_flight_points(flight_points)
+
+        range_factors = flight_points.true_airspeed * lift_drag_ratios / g / flight_points.sfc
+        end_masses = start_masses / np.exp(
+            (ranges - self.climb_and_descent_distance) / range_factors
+        )
+        return start_masses - end_masses, end_masses
 
     def _compute_cruise_mass_ratio(self, start: FlightPoint, cruise_distance):
         """
@@ -250,6 +476,8 @@ class BreguetCruiseSegment(CruiseSegment):
         else:
             lift_drag_ratio = start.CL / start.CD
         start.thrust = start.mass / lift_drag_ratio * g
+        if MISSION_PROFILER.enabled:
+            MISSION_PROFILER.count(PROPULSION_CALL_COUNT)
         self.propulsion.compute_flight_points(start)
 
         range_factor = start.true_airspeed * lift_drag_ratio / g / start.sfc
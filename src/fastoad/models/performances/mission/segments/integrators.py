@@ -0,0 +1,236 @@
+"""Time integration schemes for flight segments."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from fastoad.model_base import FlightPoint
+from ..trajectory import TrajectoryBuffer
+
+if TYPE_CHECKING:
+    from .base import FlightSegment
+
+
+class IIntegrator(ABC):
+    """
+    Interface for time integration schemes of flight segments.
+
+    An integrator computes the next flight point of a segment from the previous ones. It relies
+    on these methods of :class:`~fastoad.models.performances.mission.segments.base.FlightSegment`:
+
+    - :meth:`compute_next_flight_point`, for the explicit Euler scheme
+    - :meth:`_get_state_derivatives`, that provides time derivatives of integrated fields
+    - :meth:`_set_non_integrated_values`, that sets other fields of a new flight point
+    - :meth:`complete_flight_point`
+    """
+
+    @abstractmethod
+    def compute_step(
+        self, segment: "FlightSegment", flight_points: TrajectoryBuffer, time_step: float
+    ) -> Tuple[FlightPoint, float]:
+        """
+        Computes next flight point with provided time step.
+
+        :param segment: the segment being computed
+        :param flight_points: previous flight points
+        :param time_step: time step for computing next point
+        :return: the completed new flight point, and the ratio between estimated local error
+                 and tolerance (0. if the integrator does no error control)
+        """
+
+    def compute_adaptive_step(
+        self, segment: "FlightSegment", flight_points: TrajectoryBuffer, time_step: float
+    ) -> Tuple[FlightPoint, float, float]:
+        """
+        Computes next flight point with a time step that is adapted to get required accuracy.
+
+        The default implementation uses provided time step as is.
+
+        :param segment: the segment being computed
+        :param flight_points: previous flight points
+        :param time_step: the proposed time step
+        :return: the completed new flight point, the actually used time step, and the
+                 proposed time step for next flight point
+        """
+        new_point, _ = self.compute_step(segment, flight_points, time_step)
+        return new_point, time_step, time_step
+
+
+class ExplicitEulerIntegrator(IIntegrator):
+    """
+    Explicit Euler scheme with fixed time step.
+
+    This is the scheme used by flight segments when no integrator is specified.
+    """
+
+    def compute_step(
+        self, segment: "FlightSegment", flight_points: TrajectoryBuffer, time_step: float
+    ) -> Tuple[FlightPoint, float]:
+        new_point = segment.compute_next_flight_point(flight_points, time_step)
+        segment.complete_flight_point(new_point)
+        return new_point, 0.0
+
+
+@dataclass
+class EmbeddedRungeKuttaIntegrator(IIntegrator, ABC):
+    """
+    Base class for explicit Runge-Kutta schemes with embedded error estimation.
+
+    Time step is adapted so that estimated local errors on mass and ground distance
+    remain below specified tolerances. Adaptation starts from the time step of the segment.
+
+    The scheme is defined in subclasses by its Butcher tableau.
+    """
+
+    #: Maximum local error on mass, in kg, for one time step.
+    mass_tolerance: float = 0.01
+
+    #: Maximum local error on ground distance, in m, for one time step.
+    distance_tolerance: float = 1.0
+
+    #: Time step will not be reduced below this value, in seconds.
+    minimum_time_step: float = 0.05
+
+    #: Time step will not be increased above this value, in seconds.
+    maximum_time_step: float = 120.0
+
+    # Butcher tableau, defined in subclasses -------------------------------------------------
+    #: Stage nodes.
+    C = None
+    #: Stage coefficients, as a lower triangular matrix without diagonal.
+    A = None
+    #: Weights of the solution.
+    B = None
+    #: Weights of the solution minus weights of the embedded solution, for error estimation.
+    E = None
+    #: Order of the estimated local error.
+    ERROR_ORDER = None
+    #: True if last stage is evaluated on the solution ("First Same As Last").
+    FSAL = False
+
+    # Bounds for time step modification ----------------------------------------------------
+    SAFETY_FACTOR = 0.9
+    MIN_FACTOR = 0.2
+    MAX_FACTOR = 5.0
+
+    def compute_step(
+        self, segment: "FlightSegment", flight_points: TrajectoryBuffer, time_step: float
+    ) -> Tuple[FlightPoint, float]:
+        start = flight_points[0]
+        previous = flight_points[-1]
+
+        derivatives = [segment._get_state_derivatives(previous)]
+        stage_point = None
+        for node, coefficients in zip(self.C[1:], self.A[1:]):
+            stage_point = self._build_flight_point(
+                segment, start, previous, node * time_step, time_step, coefficients, derivatives
+            )
+            derivatives.append(segment._get_state_derivatives(stage_point))
+
+        if self.FSAL:
+            new_point = stage_point
+        else:
+            new_point = self._build_flight_point(
+                segment, start, previous, time_step, time_step, self.B, derivatives
+            )
+
+        error_ratio = 0.0
+        for name, tolerance in [
+            ("mass", self.mass_tolerance),
+            ("ground_distance", self.distance_tolerance),
+        ]:
+            error = time_step * np.dot(self.E, [values[name] for values in derivatives])
+            error_ratio = max(error_ratio, np.abs(error) / tolerance)
+
+        return new_point, error_ratio
+
+    def compute_adaptive_step(
+        self, segment: "FlightSegment", flight_points: TrajectoryBuffer, time_step: float
+    ) -> Tuple[FlightPoint, float, float]:
+        time_step = np.clip(time_step, self.minimum_time_step, self.maximum_time_step)
+        while True:
+            new_point, error_ratio = self.compute_step(segment, flight_points, time_step)
+            if error_ratio <= 1.0 or time_step <= self.minimum_time_step:
+                break
+            time_step = max(self.minimum_time_step, time_step * self._get_factor(error_ratio))
+
+        next_time_step = np.clip(
+            time_step * self._get_factor(error_ratio),
+            self.minimum_time_step,
+            self.maximum_time_step,
+        )
+        return new_point, time_step, next_time_step
+
+    def _get_factor(self, error_ratio: float) -> float:
+        """
+        :param error_ratio: ratio between estimated local error and tolerance
+        :return: the factor to be applied to time step
+        """
+        if error_ratio == 0.0:
+            return self.MAX_FACTOR
+        return np.clip(
+            self.SAFETY_FACTOR * error_ratio ** (-1.0 / self.ERROR_ORDER),
+            self.MIN_FACTOR,
+            self.MAX_FACTOR,
+        )
+
+    @staticmethod
+    def _build_flight_point(
+        segment: "FlightSegment",
+        start: FlightPoint,
+        previous: FlightPoint,
+        delta_time: float,
+        time_step: float,
+        coefficients: List[float],
+        derivatives: List[Dict[str, float]],
+    ) -> FlightPoint:
+        """
+        Builds and completes the flight point at `previous.time + delta_time` where
+        integrated fields are `previous + time_step * sum(coefficients * derivatives)`.
+        """
+        flight_point = FlightPoint(time=previous.time + delta_time)
+        for name in derivatives[0]:
+            slope = sum(
+                coefficient * values[name]
+                for coefficient, values in zip(coefficients, derivatives)
+                if coefficient
+            )
+            setattr(flight_point, name, getattr(previous, name) + time_step * slope)
+        segment._set_non_integrated_values(flight_point, start, previous)
+        segment.complete_flight_point(flight_point)
+        return flight_point
+
+
+class HeunEulerIntegrator(EmbeddedRungeKuttaIntegrator):
+    """Heun scheme (2nd order), with error estimated using explicit Euler scheme."""
+
+    C = (0.0, 1.0)
+    A = ((), (1.0,))
+    B = (0.5, 0.5)
+    E = (-0.5, 0.5)
+    ERROR_ORDER = 2
+
+
+class BogackiShampineIntegrator(EmbeddedRungeKuttaIntegrator):
+    """Bogacki-Shampine scheme (3rd order), with embedded 2nd order error estimation."""
+
+    C = (0.0, 0.5, 0.75, 1.0)
+    A = ((), (0.5,), (0.0, 0.75), (2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0))
+    B = (2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0, 0.0)
+    E = (-5.0 / 72.0, 1.0 / 12.0, 1.0 / 9.0, -1.0 / 8.0)
+    ERROR_ORDER = 3
+    FSAL = True
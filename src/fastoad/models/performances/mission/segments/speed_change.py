@@ -13,11 +13,11 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-from typing import List, Tuple
+from typing import Tuple
 
-from fastoad.model_base import FlightPoint
 from .base import ManualThrustSegment
 from ..exceptions import FastFlightSegmentIncompleteFlightPoint
+from ..trajectory import TrajectoryBuffer
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
 
@@ -30,7 +30,7 @@ class SpeedChangeSegment(ManualThrustSegment):
     and mach.
     """
 
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         if self.target.true_airspeed is not None:
             return self.target.true_airspeed - flight_points[-1].true_airspeed
         if self.target.equivalent_airspeed is not None:
@@ -11,6 +11,9 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from copy import deepcopy
+from typing import List
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -27,6 +30,7 @@ from ..cruise import (
     OptimalCruiseSegment,
 )
 from ..hold import HoldSegment
+from ..integrators import BogackiShampineIntegrator, HeunEulerIntegrator
 from ..speed_change import SpeedChangeSegment
 from ..taxi import TaxiSegment
 from ..transition import DummyTransitionSegment
@@ -100,6 +104,9 @@ def test_climb_fixed_altitude_at_constant_TAS(polar):
     assert_allclose(last_point.mass, 69713.0, rtol=1e-4)
     assert_allclose(last_point.ground_distance, 20943.0, rtol=1e-3)
 
+    # Altitude is linear with respect to time step, so end of segment is found at once.
+    assert segment.target_location_evaluations == 1
+
 
 def test_climb_fixed_altitude_at_constant_EAS(polar):
     propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
@@ -128,7 +135,7 @@ def test_climb_fixed_altitude_at_constant_EAS(polar):
 def test_climb_optimal_altitude_at_fixed_TAS(polar):
     propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
 
-    flight_points = AltitudeChangeSegment(
+    segment = AltitudeChangeSegment(
         target=FlightPoint(
             altitude=AltitudeChangeSegment.OPTIMAL_ALTITUDE, true_airspeed="constant"
         ),
@@ -137,17 +144,23 @@ def test_climb_optimal_altitude_at_fixed_TAS(polar):
         polar=polar,
         thrust_rate=1.0,
         time_step=2.0,
-    ).compute_from(FlightPoint(altitude=5000.0, true_airspeed=250.0, mass=70000.0),)
+    )
+    flight_points = segment.compute_from(
+        FlightPoint(altitude=5000.0, true_airspeed=250.0, mass=70000.0),
+    )
 
     last_point = flight_points.iloc[-1]
     # Note: reference values are obtained by running the process with 0.01s as time step
-    assert_allclose(last_point.altitude, 10085.0, atol=0.1)
+    assert_allclose(last_point.altitude, 10085.5, atol=0.1)
     assert_allclose(last_point.true_airspeed, 250.0)
     assert_allclose(last_point.time, 84.1, rtol=1e-2)
     assert_allclose(last_point.mach, 0.8359, rtol=1e-4)
     assert_allclose(last_point.mass, 69832.0, rtol=1e-4)
     assert_allclose(last_point.ground_distance, 20401.0, rtol=1e-3)
 
+    # Target altitude moves with mass, so several iterations are needed for locating it.
+    assert segment.target_location_evaluations > 1
+
 
 def test_climb_optimal_flight_level_at_fixed_TAS(polar):
     propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
@@ -459,6 +472,26 @@ def test_breguet_cruise(polar):
     assert_allclose(last_point.true_airspeed, 233.6, atol=0.1)
     assert_allclose(last_point.mass, 69568.0, rtol=1e-4)
 
+    # Several cruises at once
+    ranges = np.array([5.0e5, 1.0e6, 5.0e5, 5.0e5])
+    masses = np.array([70000.0, 70000.0, 60000.0, 70000.0])
+    altitudes = np.array([10000.0, 10000.0, 10000.0, 8000.0])
+    fuel, end_masses = segment.compute_cruises(masses, ranges, altitudes, 0.78)
+    assert fuel.shape == end_masses.shape == (4,)
+    assert_allclose(end_masses + fuel, masses)
+    assert_allclose(end_masses[0], last_point.mass, rtol=1e-12)
+    for i in range(1, 4):
+        single_segment = BreguetCruiseSegment(
+            target=FlightPoint(ground_distance=ranges[i]),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+        )
+        single_end_point = single_segment.compute_from(
+            FlightPoint(mass=masses[i], altitude=altitudes[i], mach=0.78)
+        ).iloc[-1]
+        assert_allclose(end_masses[i], single_end_point.mass, rtol=1e-12)
+
 
 def test_optimal_cruise(polar):
     propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
@@ -608,6 +641,58 @@ def test_climb_and_cruise_at_optimal_flight_level_with_start_at_exact_flight_lev
     assert_allclose(last_point.true_airspeed, 234.4, atol=0.1)
     assert_allclose(last_point.mass, 48987.0, rtol=1e-4)
 
+    # Same result if start point has array values (like OpenMDAO inputs)
+    segment.target.ground_distance = 10.0e6
+    flight_points = segment.compute_from(
+        FlightPoint(mass=np.array([70000.0]), altitude=np.array([9753.6]), mach=0.78)
+    )
+    assert_allclose(flight_points.mass.iloc[-1], last_point.mass, rtol=1e-10)
+
+
+def test_climb_and_cruise_at_optimal_flight_level_is_optimal(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 3.0e-5), 2)
+    reference_area = 120.0
+
+    def compute(altitude, flight_level_guess=None):
+        segment = ClimbAndCruiseSegment(
+            target=FlightPoint(ground_distance=5.0e6, altitude=altitude),
+            flight_level_guess=flight_level_guess,
+            propulsion=propulsion,
+            reference_area=reference_area,
+            polar=polar,
+            climb_segment=AltitudeChangeSegment(
+                target=FlightPoint(),
+                propulsion=propulsion,
+                reference_area=reference_area,
+                polar=polar,
+                thrust_rate=0.9,
+            ),
+        )
+        flight_points = segment.compute_from(FlightPoint(mass=70000.0, altitude=3000.0, mach=0.78))
+        assert segment.cruise_altitude == flight_points.iloc[-1].altitude
+        return flight_points
+
+    flight_points = compute(AltitudeChangeSegment.OPTIMAL_FLIGHT_LEVEL)
+    last_point = flight_points.iloc[-1]
+    optimal_altitude = last_point.altitude
+    assert_allclose(last_point.ground_distance, 5.0e6)
+    assert_allclose(optimal_altitude, 9144.0)  # FL300
+
+    # Same result as a climb to the chosen flight level
+    assert_allclose(compute(optimal_altitude).iloc[-1].mass, last_point.mass, rtol=1e-6)
+
+    # Fuel consumption is higher at neighbour flight levels
+    for altitude in [optimal_altitude - 1000.0 * foot, optimal_altitude + 1000.0 * foot]:
+        assert compute(altitude).iloc[-1].mass < last_point.mass
+
+    # Flight level guess does not change the result, even if it is wrong
+    for flight_level_guess in [optimal_altitude, 6000.0 * foot, 40000.0 * foot]:
+        guessed_last_point = compute(
+            AltitudeChangeSegment.OPTIMAL_FLIGHT_LEVEL, flight_level_guess
+        ).iloc[-1]
+        assert_allclose(guessed_last_point.altitude, optimal_altitude)
+        assert_allclose(guessed_last_point.mass, last_point.mass, rtol=1e-5)
+
 
 def test_taxi():
     propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
@@ -635,6 +720,60 @@ def test_hold(polar):
         FlightPoint(altitude=500.0, equivalent_airspeed=250.0, mass=60000.0),
     )
 
+    last_point = flight_points.iloc[-1]
+    assert_allclose(last_point.time, 3000.0)
+    assert_allclose(last_point.altitude, 500.0)
+    assert_allclose(last_point.equivalent_airspeed, 250.0, atol=0.1)
+    assert_allclose(last_point.mass, 57776.0, rtol=1e-4)
+    assert_allclose(last_point.ground_distance, 768323.0, rtol=1.0e-3)
+    # Duration is a multiple of time step, so target is reached without being exceeded.
+    assert segment.target_location_evaluations == 0
+
+
+def test_fixed_duration_closed_form(polar):
+    # Taxi: fuel flow does not depend on mass, so closed form is exact
+    def compute_taxi(**kwargs):
+        segment = TaxiSegment(
+            target=FlightPoint(time=500.0),
+            propulsion=FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2),
+            thrust_rate=0.1,
+            name="taxi",
+            **kwargs
+        )
+        return segment.compute_from(
+            FlightPoint(altitude=10.0, true_airspeed=10.0, mass=50000.0, time=10000.0)
+        )
+
+    stepped_points = compute_taxi()
+
+    flight_points = compute_taxi(use_closed_form=True)
+    assert len(flight_points) == 2
+    assert_allclose(flight_points.time, [10000.0, 10500.0])
+    assert_allclose(flight_points.mass.iloc[-1], stepped_points.mass.iloc[-1], rtol=1e-10)
+    assert_allclose(flight_points.ground_distance.iloc[-1], 5000.0)
+    assert flight_points.name.iloc[-1] == "taxi"
+
+    flight_points = compute_taxi(use_closed_form=True, closed_form_time_step=60.0)
+    assert_allclose(flight_points.time, stepped_points.time)
+    assert_allclose(flight_points.mass, stepped_points.mass, rtol=1e-10)
+    assert_allclose(flight_points.thrust, stepped_points.thrust, rtol=1e-10)
+
+    # Hold: thrust depends on mass, closed form is close to time stepping
+    def compute_hold(propulsion=FuelEngineSet(DummyEngine(0.5e5, 2.0e-5), 2), **kwargs):
+        segment = HoldSegment(
+            target=FlightPoint(time=3000.0),
+            propulsion=propulsion,
+            reference_area=120.0,
+            polar=polar,
+            use_closed_form=True,
+            **kwargs
+        )
+        return segment.compute_from(
+            FlightPoint(altitude=500.0, equivalent_airspeed=250.0, mass=60000.0)
+        )
+
+    flight_points = compute_hold()
+    assert len(flight_points) == 2
     last_point = flight_points.iloc[-1]
     assert_allclose(last_point.time, 3000.0)
     assert_allclose(last_point.altitude, 500.0)
@@ -642,6 +781,18 @@ def test_hold(polar):
     assert_allclose(last_point.mass, 57776.0, rtol=1e-4)
     assert_allclose(last_point.ground_distance, 768323.0, rtol=1.0e-3)
 
+    flight_points = compute_hold(closed_form_time_step=700.0)
+    assert_allclose(flight_points.time, [0.0, 700.0, 1400.0, 2100.0, 2800.0, 3000.0])
+    assert_allclose(flight_points.mass.iloc[-1], last_point.mass)
+    assert np.all(np.diff(flight_points.mass) < 0.0)
+
+    # Propulsion flag makes the segment use time stepping
+    engine = DummyEngine(0.5e5, 2.0e-5)
+    engine.has_non_smooth_mass_dependency = True
+    flight_points = compute_hold(FuelEngineSet(engine, 2))
+    assert len(flight_points) == 51
+    assert_allclose(flight_points.mass.iloc[-1], 57776.0, rtol=1e-4)
+
 
 def test_dummy_climb():
     dummy_climb = DummyTransitionSegment(
@@ -685,3 +836,184 @@ def test_dummy_reserve():
     assert_allclose(flight_points.ground_distance, [0.0, 0.0, 0.0])
     assert_allclose(flight_points.mach, [0.0, 0.0, 0.0])
     assert_allclose(flight_points.true_airspeed, [0.0, 0.0, 0.0], rtol=1.0e-4)
+
+
+def test_climb_with_adaptive_integrators(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    segment = AltitudeChangeSegment(
+        target=FlightPoint(altitude=10000.0, equivalent_airspeed="constant"),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        thrust_rate=1.0,
+        time_step=2.0,
+    )
+    euler_points = segment.compute_from(
+        FlightPoint(altitude=5000.0, mass=70000.0, equivalent_airspeed=100.0)
+    )
+
+    for integrator in [HeunEulerIntegrator(), BogackiShampineIntegrator()]:
+        segment.integrator = integrator
+        flight_points = segment.compute_from(
+            FlightPoint(altitude=5000.0, mass=70000.0, equivalent_airspeed=100.0)
+        )
+        last_point = flight_points.iloc[-1]
+        # Reference values are the ones of Euler scheme with 0.01s as time step
+        assert len(flight_points) < len(euler_points)
+        assert_allclose(last_point.altitude, 10000.0)
+        assert_allclose(last_point.equivalent_airspeed, 100.0)
+        assert_allclose(last_point.time, 145.2, rtol=1e-2)
+        assert_allclose(last_point.true_airspeed, 172.3, atol=0.1)
+        assert_allclose(last_point.mass, 69710.0, rtol=1e-5)
+        assert_allclose(last_point.ground_distance, 20915.0, rtol=1e-3)
+
+
+def test_optimal_cruise_with_adaptive_integrator(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    segment = OptimalCruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        polar=polar,
+        reference_area=120.0,
+        time_step=60.0,
+        integrator=BogackiShampineIntegrator(distance_tolerance=10.0),
+    )
+    flight_points = segment.compute_from(FlightPoint(mass=70000.0, time=1000.0, mach=0.78))
+
+    segment.integrator = None
+    segment.time_step = 1.0
+    reference_points = segment.compute_from(FlightPoint(mass=70000.0, time=1000.0, mach=0.78))
+
+    assert len(flight_points) < len(reference_points) / 20
+    last_point = flight_points.iloc[-1]
+    reference_point = reference_points.iloc[-1]
+    assert_allclose(last_point.ground_distance, 5.0e5)
+    assert_allclose(last_point.altitude, reference_point.altitude, rtol=1e-4)
+    assert_allclose(last_point.mass, reference_point.mass, rtol=1e-5)
+    assert_allclose(last_point.time, reference_point.time, rtol=1e-4)
+
+
+def _check_batch(segment, starts: List[FlightPoint]):
+    """Checks that compute_batch() gives the same results as compute_from()."""
+    expected = [deepcopy(segment).compute_from(deepcopy(start)) for start in starts]
+    trajectories = segment.compute_batch(starts)
+
+    assert len(trajectories) == len(starts)
+    for trajectory, expected_flight_points in zip(trajectories, expected):
+        flight_points = trajectory.to_dataframe()
+        assert len(flight_points) == len(expected_flight_points)
+        for name in ["time", "altitude", "ground_distance", "mass", "true_airspeed", "thrust"]:
+            assert_allclose(flight_points[name], expected_flight_points[name], rtol=1.0e-10)
+        assert list(flight_points.name) == list(expected_flight_points.name)
+
+
+def test_batch_altitude_change(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    # Climbs at constant EAS. Start points will reach target at different times.
+    segment = AltitudeChangeSegment(
+        target=FlightPoint(altitude=10000.0, equivalent_airspeed="constant"),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        thrust_rate=1.0,
+        time_step=2.0,
+        name="climb",
+    )
+    _check_batch(
+        segment,
+        [
+            FlightPoint(altitude=altitude, mass=mass, equivalent_airspeed=100.0)
+            for altitude, mass in [(5000.0, 70000.0), (3000.0, 60000.0), (8000.0, 75000.0)]
+        ],
+    )
+
+    # With capped flight level
+    segment.maximum_flight_level = 300.0
+    _check_batch(
+        segment,
+        [
+            FlightPoint(altitude=altitude, mass=70000.0, equivalent_airspeed=100.0)
+            for altitude in [5000.0, 8000.0]
+        ],
+    )
+
+    # Optimal altitude target falls back to computation one by one
+    segment.target.altitude = AltitudeChangeSegment.OPTIMAL_ALTITUDE
+    segment.maximum_flight_level = 500.0
+    _check_batch(
+        segment,
+        [
+            FlightPoint(altitude=5000.0, mass=mass, equivalent_airspeed=100.0)
+            for mass in [60000.0, 70000.0]
+        ],
+    )
+
+
+def test_batch_speed_change(polar):
+    propulsion = FuelEngineSet(DummyEngine(1.0e5, 1.0e-5), 2)
+
+    segment = SpeedChangeSegment(
+        target=FlightPoint(mach=0.6),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+        thrust_rate=1.0,
+    )
+    _check_batch(
+        segment,
+        [
+            FlightPoint(altitude=5000.0, mass=mass, mach=mach)
+            for mass, mach in [(70000.0, 0.4), (60000.0, 0.3), (50000.0, 0.7)]
+        ],
+    )
+
+    # Not enough thrust for some start points
+    segment.thrust_rate = 0.2
+    _check_batch(
+        segment,
+        [
+            FlightPoint(altitude=5000.0, mass=mass, mach=0.4)
+            for mass in [40000.0, 70000.0, 100000.0]
+        ],
+    )
+
+
+def test_batch_cruise_hold_and_taxi(polar):
+    propulsion = FuelEngineSet(DummyEngine(0.5e5, 1.0e-5), 2)
+
+    cruise = CruiseSegment(
+        target=FlightPoint(ground_distance=5.0e5),
+        propulsion=propulsion,
+        reference_area=120.0,
+        polar=polar,
+    )
+    _check_batch(
+        cruise,
+        [
+            FlightPoint(altitude=10000.0, mass=mass, mach=0.78, time=time, ground_distance=1.0e5)
+            for mass, time in [(60000.0, 0.0), (70000.0, 100.0)]
+        ],
+    )
+
+    hold = HoldSegment(
+        target=FlightPoint(time=3000.0), propulsion=propulsion, reference_area=120.0, polar=polar
+    )
+    _check_batch(
+        hold,
+        [
+            FlightPoint(altitude=500.0, mass=mass, equivalent_airspeed=250.0, time=time)
+            for mass, time in [(60000.0, 0.0), (55000.0, 500.0)]
+        ],
+    )
+
+    taxi = TaxiSegment(target=FlightPoint(time=500.0), propulsion=propulsion, thrust_rate=0.1)
+    _check_batch(
+        taxi,
+        [
+            FlightPoint(altitude=10.0, mass=mass, true_airspeed=10.0, time=10000.0)
+            for mass in [50000.0, 60000.0]
+        ],
+    )
@@ -14,14 +14,13 @@
 
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import List, Tuple
-
-import pandas as pd
+from typing import Tuple
 
 from fastoad.model_base import FlightPoint
 from fastoad.model_base.propulsion import IPropulsion
 from fastoad.models.performances.mission.polar import Polar
 from fastoad.models.performances.mission.segments.base import FlightSegment
+from ..trajectory import TrajectoryBuffer
 
 
 @dataclass
@@ -58,7 +57,7 @@ class DummyTransitionSegment(FlightSegment):
     #: Unused
     polar: Polar = None
 
-    def compute_from(self, start: FlightPoint) -> pd.DataFrame:
+    def compute_trajectory(self, start: FlightPoint) -> TrajectoryBuffer:
 
         self.complete_flight_point(start)
         end = deepcopy(start)
@@ -72,21 +71,23 @@ class DummyTransitionSegment(FlightSegment):
         end.name = self.name
         self.complete_flight_point(end)
 
-        flight_points = [start, end]
+        flight_points = TrajectoryBuffer()
+        flight_points.append(start)
+        flight_points.append(end)
 
         if self.reserve_mass_ratio > 0.0:
             reserve = deepcopy(end)
             reserve.mass = end.mass / (1.0 + self.reserve_mass_ratio)
             flight_points.append(reserve)
 
-        return pd.DataFrame(flight_points)
+        return flight_points
 
     def _get_gamma_and_acceleration(self, mass, drag, thrust) -> Tuple[float, float]:
         return 0.0, 0.0
 
-    # As we overloaded self.compute_from(), next abstract method are not used.
+    # As we overloaded self.compute_trajectory(), next abstract method are not used.
     # We just need to implement them for Python to be happy.
-    def _get_distance_to_target(self, flight_points: List[FlightPoint]) -> float:
+    def _get_distance_to_target(self, flight_points: TrajectoryBuffer) -> float:
         pass
 
     def _compute_propulsion(self, flight_point: FlightPoint):
@@ -0,0 +1,101 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.interpolate import interp1d
+
+from ..polar import Polar, PolarCache
+
+
+def test_polar_parabola():
+    cl = np.linspace(0.0, 1.5, 16)
+    cd = 0.05 * cl ** 2 + 0.01
+    polar = Polar(cl, cd)
+
+    assert_allclose(polar.definition_cl, cl)
+    assert_allclose(polar.cd(), cd, atol=1e-15)
+    assert_allclose(polar.cd(0.3), 0.0145, rtol=1e-12)
+    assert isinstance(polar.cd(0.3), float)
+
+    # Extrapolation
+    assert_allclose(polar.cd([-0.5, 2.0]), [0.0225, 0.21], rtol=1e-12)
+
+    # Derivative
+    assert_allclose(polar.cd_derivative(0.3), 0.03, rtol=1e-12)
+    assert_allclose(polar.cd_derivative(), 0.1 * cl, atol=1e-14)
+
+    # Max L/D is obtained for CD0 = k CL**2
+    assert_allclose(polar.optimal_cl, np.sqrt(0.01 / 0.05), rtol=1e-12)
+    assert isinstance(polar.optimal_cl, float)
+
+
+def test_polar_quadratic_spline():
+    cl = np.linspace(0.0, 1.0, 21)
+    cd = 0.02 + 0.04 * cl ** 2 + 0.5 * np.maximum(cl - 0.6, 0.0) ** 3
+
+    # Definition order should not matter
+    shuffled = np.random.default_rng(1).permutation(len(cl))
+    polar = Polar(cl[shuffled], cd[shuffled])
+
+    # Interpolation is the same as the quadratic spline of SciPy
+    reference = interp1d(cl, cd, kind="quadratic", fill_value="extrapolate")
+    test_cl = np.linspace(-0.5, 1.5, 201).reshape((3, -1))
+    assert polar.cd(test_cl).shape == test_cl.shape
+    assert_allclose(polar.cd(test_cl), reference(test_cl), rtol=1e-12)
+    for value in [-0.2, 0.0, 0.33, 0.6, 1.0, 1.2]:
+        assert_allclose(polar.cd(value), reference(value), rtol=1e-12)
+        assert_allclose(
+            polar.cd_derivative(value),
+            (reference(value + 1e-6) - reference(value - 1e-6)) / 2e-6,
+            atol=1e-8,
+        )
+
+    # Optimal CL is the one of max L/D ratio
+    fine_cl = np.linspace(0.0, 1.0, 100001)
+    assert_allclose(polar.optimal_cl, fine_cl[np.argmax(fine_cl / polar.cd(fine_cl))], atol=1e-5)
+
+
+def test_polar_cache():
+    cl = np.linspace(0.0, 1.5, 16)
+    cd = 0.05 * cl ** 2 + 0.01
+    cache = PolarCache(max_size=2)
+
+    polar1 = cache.get(cl, cd)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.hit_rate == 0.0
+
+    # Same content in other objects provides the same polar
+    assert cache.get(list(cl), cd.copy()) is polar1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+    # Cached polar is not affected by later modification of input arrays
+    cl[0] = -1.0
+    assert polar1.definition_cl[0] == 0.0
+    polar2 = cache.get(cl, cd)
+    assert polar2 is not polar1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Least recently used polar is removed when cache is full
+    cl[0] = -2.0
+    polar3 = cache.get(cl, cd)
+    assert len(cache) == 2
+    assert cache.get(cl, cd) is polar3
+    cl[0] = 0.0
+    assert cache.get(cl, cd) is not polar1
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
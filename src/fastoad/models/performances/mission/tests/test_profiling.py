@@ -0,0 +1,46 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from fastoad.models.performances.mission.profiling import (
+    COUNTERS,
+    MissionProfiler,
+    PROPULSION_CALL_COUNT,
+    STEP_COUNT,
+)
+
+
+def test_mission_profiler():
+    profiler = MissionProfiler()
+
+    profiler.start_part("route")
+    profiler.count(STEP_COUNT)
+    for _ in range(2):
+        profiler.start_part("route:climb")
+        # A segment with the same name as its phase
+        profiler.start_part("route:climb")
+        profiler.count(STEP_COUNT, 10)
+        profiler.count(PROPULSION_CALL_COUNT, 11)
+        profiler.end_part()
+        profiler.end_part()
+    profiler.end_part()
+
+    stats = profiler.get_stats()
+    assert list(stats.index) == ["route", "route:climb"]
+    assert list(stats.columns) == ["call_count", "wall_time"] + COUNTERS
+    assert list(stats.call_count) == [1, 2]
+    assert list(stats.step_count) == [1, 20]
+    assert list(stats.propulsion_call_count) == [0, 22]
+    assert stats.wall_time["route"] >= stats.wall_time["route:climb"] > 0.0
+
+    profiler.reset()
+    assert len(profiler.get_stats()) == 0
@@ -22,6 +22,7 @@ non-regression tests).
 
 import os.path as pth
 from abc import ABC
+from copy import copy, deepcopy
 from os import mkdir
 from shutil import rmtree
 from typing import List, Union
@@ -37,7 +38,7 @@ from scipy.constants import foot, knot
 from fastoad.constants import EngineSetting, FlightPhase
 from fastoad.model_base import FlightPoint
 from fastoad.model_base.propulsion import FuelEngineSet, IPropulsion
-from fastoad.models.performances.mission.base import IFlightPart
+from fastoad.models.performances.mission.base import FlightSequence, IFlightPart
 from fastoad.models.performances.mission.polar import Polar
 from fastoad.models.performances.mission.routes import RangedRoute
 from fastoad.models.performances.mission.segments.altitude_change import AltitudeChangeSegment
@@ -180,6 +181,77 @@ def test_ranged_flight(low_speed_polar, high_speed_polar, cleanup):
         atol=flight_calculator.distance_accuracy,
     )
 
+    # Descent is computed for the first two solver iterations and for the final result. Third
+    # iteration used an interpolated descent distance.
+    assert flight_calculator.route_evaluation_count == 3
+    assert flight_calculator.descent_computation_count == 3
+
+    # Time is continuous at junctions of climb, cruise and descent
+    assert np.all(np.diff(flight_points.time) >= 0.0)
+
+    # With solved cruise distance as guess, only one evaluation is needed
+    flight_calculator.cruise_distance_guess = flight_calculator.solved_cruise_distance
+    guessed_flight_points = flight_calculator.compute_from(start)
+    assert flight_calculator.route_evaluation_count == 1
+    assert flight_calculator.descent_computation_count == 1
+    assert_allclose(
+        guessed_flight_points.iloc[-1].mass, flight_points.iloc[-1].mass, rtol=1e-6,
+    )
+
+    # With an approximate guess, it is used as starting point for the solver
+    flight_calculator.cruise_distance_guess = flight_calculator.solved_cruise_distance + 5.0e3
+    guessed_flight_points = flight_calculator.compute_from(start)
+    assert flight_calculator.route_evaluation_count == 2
+    assert_allclose(
+        guessed_flight_points.iloc[-1].ground_distance,
+        total_distance + start.ground_distance,
+        atol=flight_calculator.distance_accuracy,
+    )
+
+
+def test_flight_sequence_batch(high_speed_polar):
+    engine = RubberEngine(5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0)
+    propulsion = FuelEngineSet(engine, 2)
+    kwargs = dict(propulsion=propulsion, reference_area=120.0, polar=high_speed_polar)
+
+    sequence = FlightSequence()
+    sequence.flight_sequence.extend(
+        [
+            AltitudeChangeSegment(
+                **kwargs,
+                target=FlightPoint(altitude=10000.0 * foot, equivalent_airspeed="constant"),
+                thrust_rate=0.93,
+                name="climb",
+            ),
+            SpeedChangeSegment(
+                **kwargs,
+                target=FlightPoint(equivalent_airspeed=300.0 * knot),
+                thrust_rate=0.93,
+                name="climb",
+            ),
+            CruiseSegment(
+                **kwargs,
+                target=FlightPoint(ground_distance=500.0e3),
+                engine_setting=EngineSetting.CRUISE,
+                name="cruise",
+            ),
+        ]
+    )
+
+    starts = [
+        FlightPoint(equivalent_airspeed=250.0 * knot, altitude=1500.0 * foot, mass=mass)
+        for mass in [60000.0, 70000.0, 80000.0]
+    ]
+    expected = [deepcopy(sequence).compute_from(copy(start)) for start in starts]
+    trajectories = sequence.compute_batch(starts)
+
+    for trajectory, expected_flight_points in zip(trajectories, expected):
+        flight_points = trajectory.to_dataframe()
+        assert len(flight_points) == len(expected_flight_points)
+        assert list(flight_points.name) == list(expected_flight_points.name)
+        for name in ["time", "altitude", "ground_distance", "mass", "mach"]:
+            assert_allclose(flight_points[name], expected_flight_points[name], rtol=1.0e-10)
+
 
 # We define here in Python the flight phases that feed the test of RangedRoute ============
 
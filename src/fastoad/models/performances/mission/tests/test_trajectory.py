@@ -0,0 +1,108 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from fastoad.model_base import FlightPoint
+from ..trajectory import TrajectoryBuffer
+
+
+def test_append_and_get():
+    trajectory = TrajectoryBuffer(capacity=2)
+    assert len(trajectory) == 0
+
+    for i in range(10):
+        trajectory.append(FlightPoint(time=float(i), mass=70000.0 - i, name="phase"))
+
+    assert len(trajectory) == 10
+    assert trajectory.capacity == 16
+    assert_allclose(trajectory.column("time"), np.arange(10))
+    assert trajectory[0].mass == 70000.0
+    assert trajectory[5].mass == 69995.0
+    assert trajectory[-1].mass == 69991.0
+    assert trajectory[5].name == "phase"
+    assert trajectory[5].altitude is None
+
+    with pytest.raises(IndexError):
+        _ = trajectory[10]
+
+    point = trajectory.pop()
+    assert point.time == 9.0
+    assert len(trajectory) == 9
+    assert trajectory[-1].time == 8.0
+
+
+def test_extend():
+    trajectory_1 = TrajectoryBuffer()
+    trajectory_2 = TrajectoryBuffer()
+    for i in range(3):
+        trajectory_1.append(FlightPoint(time=float(i)))
+    for i in range(2, 200):
+        trajectory_2.append(FlightPoint(time=float(i)))
+
+    trajectory_1.extend(trajectory_2, start=1)
+    assert len(trajectory_1) == 200
+    assert_allclose(trajectory_1.column("time"), np.arange(200))
+    assert trajectory_1[-1].time == 199.0
+    assert trajectory_1[100].time == 100.0
+
+
+def test_dataframe_conversion():
+    trajectory = TrajectoryBuffer()
+    trajectory.append(FlightPoint(time=0.0, altitude=0.0, name="taxi"))
+    trajectory.append(FlightPoint(time=10.0, altitude=100.0, name="climb"))
+
+    df = trajectory.to_dataframe()
+    assert list(df.columns) == [field.name for field in fields(FlightPoint)]
+    assert_allclose(df.altitude, [0.0, 100.0])
+    assert list(df.name) == ["taxi", "climb"]
+    assert df.name.dtype == "category"
+    assert np.all(np.isnan(df.mass))
+
+    other = TrajectoryBuffer.from_dataframe(
+        pd.DataFrame({"time": [0.0, 5.0], "mass": [None, 1000.0], "name": ["a", "b"]})
+    )
+    assert len(other) == 2
+    assert other[0].mass is None
+    assert other[1].mass == 1000.0
+    assert other[1].name == "b"
+    assert other[1].altitude is None
+
+
+def test_part_bounds():
+    trajectory_1 = TrajectoryBuffer()
+    for i in range(3):
+        trajectory_1.append(FlightPoint(time=float(i)))
+    trajectory_1.set_part_bounds("climb", 0, 3)
+    trajectory_1.set_part_bounds("empty", 3, 3)
+    assert trajectory_1.part_bounds == {"climb": (0, 3)}
+
+    trajectory_2 = TrajectoryBuffer()
+    for i in range(2, 10):
+        trajectory_2.append(FlightPoint(time=float(i)))
+    trajectory_2.set_part_bounds("climb", 0, 2)
+    trajectory_2.set_part_bounds("cruise", 1, 8)
+
+    # Bounds of extending buffer are shifted, and bounds with same name are merged
+    trajectory_1.extend(trajectory_2, start=1)
+    assert trajectory_1.part_bounds == {"climb": (0, 4), "cruise": (3, 10)}
+    start, stop = trajectory_1.part_bounds["cruise"]
+    assert_allclose(trajectory_1.column("time")[start:stop], np.arange(3, 10))
+
+    trajectory_1.pop()
+    assert trajectory_1.part_bounds == {"climb": (0, 4), "cruise": (3, 9)}
@@ -0,0 +1,292 @@
+"""Columnar storage of computed flight points."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from dataclasses import fields
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fastoad.model_base import FlightPoint
+
+DEFAULT_CAPACITY = 64
+
+
+class TrajectoryBuffer:
+    """
+    Growable struct-of-arrays storage for flight points.
+
+    Each field of :class:`~fastoad.model_base.flight_point.FlightPoint` is stored in its own
+    preallocated numpy array. Fields annotated as `float` are stored in float arrays (where
+    None values become NaN), other fields are stored in object arrays.
+    When capacity is exceeded, arrays are reallocated with doubled size.
+
+    Flight points are written in place with :meth:`append`, and a pandas DataFrame is built
+    only when asked, using :meth:`to_dataframe`::
+
+        >>> trajectory = TrajectoryBuffer()
+        >>> trajectory.append(FlightPoint(mass=70000.0, altitude=0.0))
+        >>> trajectory.append(FlightPoint(mass=69000.0, altitude=1000.0))
+        >>> trajectory[-1].mass
+        69000.0
+        >>> df = trajectory.to_dataframe()
+
+    Indexing with an integer provides a FlightPoint instance. The first point and the last
+    appended points are kept as instances so that getting them costs nothing. They should
+    not be modified, as modifications would not be reflected in stored data.
+
+    Flight sequences record the rows of each of their named parts with
+    :meth:`set_part_bounds`, so that parts can be located without comparing point names::
+
+        >>> start, stop = trajectory.part_bounds["climb"]
+        >>> end_of_climb = trajectory[stop - 1]
+
+    .. note::
+
+        The available fields are the ones of FlightPoint class at instantiation of the buffer.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        :param capacity: initial number of flight points that can be stored without reallocation
+        """
+        self._size = 0
+        self._capacity = max(int(capacity), 1)
+        self._float_names = []
+        self._object_names = []
+        self._columns: Dict[str, np.ndarray] = {}
+
+        for field in fields(FlightPoint):
+            if field.type is float:
+                self._float_names.append(field.name)
+                self._columns[field.name] = np.empty(self._capacity)
+            else:
+                self._object_names.append(field.name)
+                self._columns[field.name] = np.empty(self._capacity, dtype=object)
+
+        # FlightPoint instances that are kept to avoid rebuilding them from columns.
+        self._points: Dict[int, FlightPoint] = {}
+
+        self._part_bounds: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> FlightPoint:
+        index = self._get_positive_index(index)
+        point = self._points.get(index)
+        if point is None:
+            point = self._build_point(index)
+        return point
+
+    @property
+    def capacity(self) -> int:
+        """Number of flight points that can be stored before next reallocation."""
+        return self._capacity
+
+    @property
+    def field_names(self) -> List[str]:
+        """Names of stored fields, in the same order as FlightPoint fields."""
+        return list(self._columns.keys())
+
+    @property
+    def part_bounds(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Flight part names as keys, and (start, stop) row indices of flight points of the part
+        as values (stop index is excluded, like in a slice).
+        """
+        return self._part_bounds
+
+    def set_part_bounds(self, name: str, start: int, stop: int):
+        """
+        Records flight points from row `start` to row `stop` (excluded) as belonging to the
+        named flight part. If bounds already exist for this name, they are extended to also
+        include provided rows.
+
+        Nothing is done if provided range is empty.
+
+        :param name: the name of the flight part
+        :param start: the index of the first flight point of the part
+        :param stop: the index after the last flight point of the part
+        """
+        if stop <= start:
+            return
+        bounds = self._part_bounds.get(name)
+        if bounds is not None:
+            start, stop = min(start, bounds[0]), max(stop, bounds[1])
+        self._part_bounds[name] = (start, stop)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        :param name: a field name of FlightPoint
+        :return: a view on values of the named field for all stored flight points
+        """
+        return self._columns[name][: self._size]
+
+    def append(self, flight_point: FlightPoint):
+        """
+        Writes provided flight point at the end of stored data.
+
+        :param flight_point:
+        """
+        if self._size == self.capacity:
+            self._reallocate(2 * self.capacity)
+
+        index = self._size
+        columns = self._columns
+        for name in self._float_names:
+            value = getattr(flight_point, name)
+            columns[name][index] = np.nan if value is None else value
+        for name in self._object_names:
+            columns[name][index] = getattr(flight_point, name)
+        self._size += 1
+
+        self._points[index] = flight_point
+        self._forget_points()
+
+    def extend(self, other: "TrajectoryBuffer", start: int = 0):
+        """
+        Appends flight points of another buffer.
+
+        Part bounds of the other buffer are also added, for appended flight points.
+
+        :param other: the buffer to copy data from
+        :param start: the index of the first flight point of `other` to copy
+        """
+        count = len(other) - start
+        if count <= 0:
+            return
+
+        capacity = self.capacity
+        if self._size + count > capacity:
+            while self._size + count > capacity:
+                capacity *= 2
+            self._reallocate(capacity)
+
+        # pylint: disable=protected-access  # other is also a TrajectoryBuffer instance
+        for name, column in self._columns.items():
+            if name in other._columns:
+                column[self._size : self._size + count] = other.column(name)[start:]
+            else:
+                column[self._size : self._size + count] = np.nan if column.dtype == float else None
+
+        for other_index, point in other._points.items():
+            if other_index >= start:
+                self._points[self._size + other_index - start] = point
+
+        offset = self._size - start
+        for name, (part_start, part_stop) in other._part_bounds.items():
+            self.set_part_bounds(name, max(part_start, start) + offset, part_stop + offset)
+
+        self._size += count
+        self._forget_points()
+
+    def pop(self) -> FlightPoint:
+        """
+        Removes the last flight point.
+
+        :return: the removed flight point
+        """
+        point = self[-1]
+        self._size -= 1
+        self._points.pop(self._size, None)
+        for name, (start, stop) in list(self._part_bounds.items()):
+            if stop > self._size:
+                del self._part_bounds[name]
+                self.set_part_bounds(name, start, self._size)
+        return point
+
+    def to_dataframe(self, copy: bool = True) -> pd.DataFrame:
+        """
+        Builds a pandas DataFrame from stored data.
+
+        The `name` column is categorical, as it contains few distinct values.
+
+        :param copy: if False, the DataFrame is built from views of the internal arrays (it
+                     should then be used before any further modification of the buffer)
+        :return: a DataFrame where column names match fields of FlightPoint
+        """
+        columns = {name: self.column(name) for name in self._columns}
+        if "name" in columns:
+            columns["name"] = pd.Categorical(columns["name"])
+        return pd.DataFrame(columns, columns=self.field_names, copy=copy)
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame) -> "TrajectoryBuffer":
+        """
+        Builds a buffer from a DataFrame where column names match fields of FlightPoint.
+
+        :param data:
+        :return: the created buffer
+        """
+        return cls.from_columns({name: data[name].to_numpy() for name in data.columns})
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray]) -> "TrajectoryBuffer":
+        """
+        Builds a buffer from a dict of 1D arrays where keys match fields of FlightPoint.
+
+        All arrays are expected to have the same length. Missing fields are set to None.
+
+        :param columns:
+        :return: the created buffer
+        """
+        # pylint: disable=protected-access  # trajectory is a TrajectoryBuffer instance
+        size = len(next(iter(columns.values()))) if columns else 0
+        trajectory = cls(size)
+        for name, column in trajectory._columns.items():
+            values = columns.get(name)
+            if values is None:
+                column[:size] = np.nan if column.dtype == float else None
+            elif column.dtype == float and values.dtype == object:
+                # Values may be None, or one-item arrays
+                for i, value in enumerate(values):
+                    column[i] = np.nan if value is None else value
+            elif column.dtype == object:
+                # Converts numpy scalars to Python objects
+                column[:size] = values.tolist()
+            else:
+                column[:size] = values
+        trajectory._size = size
+        return trajectory
+
+    def _build_point(self, index: int) -> FlightPoint:
+        """Builds a FlightPoint instance from stored data. NaN values are returned as None."""
+        columns = self._columns
+        values = []
+        for name in self._float_names:
+            value = columns[name].item(index)
+            # value != value is True only for NaN, and is much faster than np.isnan()
+            values.append(None if value != value else value)
+        values.extend(columns[name][index] for name in self._object_names)
+        return FlightPoint.create_from_values(self._float_names + self._object_names, values)
+
+    def _forget_points(self):
+        """Only the first flight point and the two last ones are kept as instances."""
+        for index in [index for index in self._points if 0 < index < self._size - 2]:
+            del self._points[index]
+
+    def _get_positive_index(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Flight point index out of range.")
+        return index
+
+    def _reallocate(self, capacity: int):
+        for name, column in self._columns.items():
+            new_column = np.empty(capacity, dtype=column.dtype)
+            new_column[: self._size] = column[: self._size]
+            self._columns[name] = new_column
+        self._capacity = capacity
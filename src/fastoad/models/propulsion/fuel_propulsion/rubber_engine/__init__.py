@@ -18,5 +18,10 @@ Provides a parametric model for turbofan:
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from .openmdao import OMRubberEngineComponent, OMRubberEngineWrapper
+from .engine_deck import RubberEngineDeck, TabulatedRubberEngine
+from .openmdao import (
+    OMRubberEngineComponent,
+    OMRubberEngineWrapper,
+    OMTabulatedRubberEngineWrapper,
+)
 from .rubber_engine import RubberEngine
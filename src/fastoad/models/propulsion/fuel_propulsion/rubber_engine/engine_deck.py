@@ -0,0 +1,556 @@
+"""Precomputed engine deck for the parametric turbofan engine."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, List, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+from fastoad.model_base import Atmosphere, ScalarAtmosphereSI
+from .rubber_engine import RubberEngine
+
+#: Default Mach numbers of deck nodes.
+DEFAULT_DECK_MACHS = np.linspace(0.0, 1.0, 21)
+
+#: Default altitudes, in meters, of deck nodes. The tropopause (11000 m), where the engine
+#: model changes of formula, is a node.
+DEFAULT_DECK_ALTITUDES = np.linspace(-1000.0, 20000.0, 43)
+
+#: Available interpolation methods of :class:`RubberEngineDeck`.
+DECK_METHODS = ("linear", "cubic")
+
+#: Maximum number of decks kept by :meth:`RubberEngineDeck.get`.
+DECK_CACHE_SIZE = 16
+
+
+class RubberEngineDeck:
+    """
+    Maximum thrust and SFC at maximum thrust of a
+    :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`,
+    precomputed on a (Mach, altitude, delta_t4) grid.
+
+    In the (Mach, altitude) plane, values are interpolated linearly ("linear" method) or with
+    bicubic splines ("cubic" method). Along delta_t4, values are interpolated linearly, but
+    delta_t4 nodes are generally the values of engine settings, so no interpolation is
+    actually needed. SFC at maximum thrust does not depend on delta_t4.
+
+    Points out of grid bounds are computed with the analytic model.
+
+    A deck should be obtained with :meth:`get`, so that it is computed only once for a given
+    set of engine parameters.
+    """
+
+    def __init__(
+        self,
+        engine: RubberEngine,
+        delta_t4_values: Sequence[float],
+        machs: Sequence[float] = DEFAULT_DECK_MACHS,
+        altitudes: Sequence[float] = DEFAULT_DECK_ALTITUDES,
+        method: str = "linear",
+    ):
+        """
+        :param engine: the engine whose analytic model is sampled
+        :param delta_t4_values: (unit=K) delta_t4 values of grid nodes
+        :param machs: Mach numbers of grid nodes, in ascending order
+        :param altitudes: (unit=m) altitudes of grid nodes, in ascending order
+        :param method: one of :data:`DECK_METHODS`
+        """
+        if method not in DECK_METHODS:
+            raise ValueError('Unknown interpolation method "%s".' % method)
+
+        self._engine = engine
+
+        #: Interpolation method in the (Mach, altitude) plane.
+        self.method = method
+
+        #: Mach numbers of grid nodes.
+        self.machs = np.asarray(machs, dtype=float)
+
+        #: Altitudes of grid nodes, in meters.
+        self.altitudes = np.asarray(altitudes, dtype=float)
+
+        #: delta_t4 values of grid nodes, in K.
+        self.delta_t4_values = np.unique(np.asarray(delta_t4_values, dtype=float))
+
+        self._mach_bounds = (float(self.machs[0]), float(self.machs[-1]))
+        self._altitude_bounds = (float(self.altitudes[0]), float(self.altitudes[-1]))
+        self._delta_t4_indices = {value: i for i, value in enumerate(self.delta_t4_values)}
+        self._delta_t4_axis = _Axis(self.delta_t4_values) if len(self.delta_t4_values) > 1 else None
+
+        mach_grid, altitude_grid = np.meshgrid(self.machs, self.altitudes, indexing="ij")
+        atmosphere = Atmosphere(altitude_grid, altitude_in_feet=False)
+
+        self._max_thrust_interpolator = _Interpolator(
+            self.machs,
+            self.altitudes,
+            np.array(
+                [
+                    RubberEngine.max_thrust(engine, atmosphere, mach_grid, delta_t4)
+                    * np.ones_like(mach_grid)
+                    for delta_t4 in self.delta_t4_values
+                ]
+            ),
+            method,
+        )
+        self._sfc_interpolator = _Interpolator(
+            self.machs,
+            self.altitudes,
+            RubberEngine.sfc_at_max_thrust(engine, atmosphere, mach_grid)[np.newaxis, :, :],
+            method,
+        )
+
+        #: Maximum relative interpolation error of maximum thrust and SFC at maximum thrust,
+        #: as estimated at centers of grid cells.
+        self.max_relative_error = self._estimate_max_relative_error()
+
+    @classmethod
+    def get(
+        cls,
+        engine: RubberEngine,
+        machs: Sequence[float] = DEFAULT_DECK_MACHS,
+        altitudes: Sequence[float] = DEFAULT_DECK_ALTITUDES,
+        method: str = "linear",
+    ) -> "RubberEngineDeck":
+        """
+        Provides the deck of an engine, with delta_t4 values of its engine settings as
+        delta_t4 nodes.
+
+        The last :data:`DECK_CACHE_SIZE` decks are kept, so a deck is computed only once for
+        a given set of engine parameters and grid definition.
+
+        :param engine: the engine whose analytic model is sampled
+        :param machs: Mach numbers of grid nodes, in ascending order
+        :param altitudes: (unit=m) altitudes of grid nodes, in ascending order
+        :param method: one of :data:`DECK_METHODS`
+        :return: the deck
+        """
+        delta_t4_values = [float(np.squeeze(value)) for value in engine.dt4_values.values()]
+        key = (
+            tuple(
+                float(np.squeeze(value))
+                for value in [
+                    engine.bypass_ratio,
+                    engine.overall_pressure_ratio,
+                    engine.t_4,
+                    engine.f_0,
+                    engine.design_alt,
+                ]
+            ),
+            tuple(sorted(set(delta_t4_values))),
+            tuple(np.asarray(machs, dtype=float)),
+            tuple(np.asarray(altitudes, dtype=float)),
+            method,
+        )
+        deck = _DECKS.get(key)
+        if deck is None:
+            deck = cls(engine, delta_t4_values, machs, altitudes, method)
+            _DECKS[key] = deck
+            if len(_DECKS) > DECK_CACHE_SIZE:
+                _DECKS.popitem(last=False)
+        else:
+            _DECKS.move_to_end(key)
+        return deck
+
+    def max_thrust(
+        self,
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        delta_t4: Union[float, Sequence[float]],
+    ) -> np.ndarray:
+        """
+        :param mach: Mach number(s)
+        :param altitude: (unit=m) altitude(s)
+        :param delta_t4: (unit=K) difference between operational and design values of
+                         turbine inlet temperature
+        :return: maximum thrust (in N)
+        """
+
+        def compute_analytically(mach_values, altitude_values, delta_t4_values):
+            atmosphere = Atmosphere(altitude_values, altitude_in_feet=False)
+            return RubberEngine.max_thrust(self._engine, atmosphere, mach_values, delta_t4_values)
+
+        # Most of the time, delta_t4 is the value of one engine setting, so only one table
+        # is needed.
+        if np.size(delta_t4) == 1:
+            table_index = self._delta_t4_indices.get(float(np.squeeze(delta_t4)))
+            if table_index is not None:
+                return self._interpolate(
+                    self._max_thrust_interpolator,
+                    mach,
+                    altitude,
+                    lambda mach_values, altitude_values: compute_analytically(
+                        mach_values, altitude_values, delta_t4
+                    ),
+                    table_index,
+                )
+
+        mach, altitude, delta_t4 = np.broadcast_arrays(
+            np.asarray(mach, dtype=float),
+            np.asarray(altitude, dtype=float),
+            np.asarray(delta_t4, dtype=float),
+        )
+        in_range = (
+            (delta_t4 >= self.delta_t4_values[0])
+            & (delta_t4 <= self.delta_t4_values[-1])
+            & self._is_in_grid(mach, altitude)
+        )
+        out_of_range = np.logical_not(in_range)
+
+        values = np.empty(np.shape(mach))
+        values[out_of_range] = compute_analytically(
+            mach[out_of_range], altitude[out_of_range], delta_t4[out_of_range]
+        )
+
+        mach, altitude, delta_t4 = mach[in_range], altitude[in_range], delta_t4[in_range]
+        if self._delta_t4_axis is None:
+            values[in_range] = self._max_thrust_interpolator(mach, altitude)
+            return values
+
+        table_indices, weights = self._delta_t4_axis.locate(delta_t4)
+        # Points on upper node of their cell are processed as points on lower node of next
+        # cell, so that only one table is needed for all points on nodes.
+        is_upper_node = weights == 1.0
+        table_indices[is_upper_node] += 1
+        weights[is_upper_node] = 0.0
+
+        in_range_values = self._max_thrust_interpolator(mach, altitude, table_indices)
+        is_between_nodes = weights > 0.0
+        if np.any(is_between_nodes):
+            weights = weights[is_between_nodes]
+            in_range_values[is_between_nodes] = (1.0 - weights) * in_range_values[
+                is_between_nodes
+            ] + weights * self._max_thrust_interpolator(
+                mach[is_between_nodes],
+                altitude[is_between_nodes],
+                table_indices[is_between_nodes] + 1,
+            )
+        values[in_range] = in_range_values
+        return values
+
+    def sfc_at_max_thrust(
+        self, mach: Union[float, Sequence[float]], altitude: Union[float, Sequence[float]],
+    ) -> np.ndarray:
+        """
+        :param mach: Mach number(s)
+        :param altitude: (unit=m) altitude(s)
+        :return: SFC at maximum thrust (in kg/s/N)
+        """
+
+        def compute_analytically(mach_values, altitude_values):
+            atmosphere = Atmosphere(altitude_values, altitude_in_feet=False)
+            return RubberEngine.sfc_at_max_thrust(self._engine, atmosphere, mach_values)
+
+        return self._interpolate(self._sfc_interpolator, mach, altitude, compute_analytically)
+
+    def get_max_thrust_value(self, mach: float, altitude: float, delta_t4: float) -> float:
+        """
+        Same as :meth:`max_thrust` for one point, using only float arithmetic when possible.
+
+        :param mach: Mach number
+        :param altitude: (unit=m) altitude
+        :param delta_t4: (unit=K) difference between operational and design values of
+                         turbine inlet temperature
+        :return: maximum thrust (in N)
+        """
+        table_index = self._delta_t4_indices.get(delta_t4)
+        if table_index is not None and self._is_value_in_grid(mach, altitude):
+            return self._max_thrust_interpolator.get_value(mach, altitude, table_index)
+        return float(self.max_thrust(mach, altitude, delta_t4))
+
+    def get_sfc_at_max_thrust_value(self, mach: float, altitude: float) -> float:
+        """
+        Same as :meth:`sfc_at_max_thrust` for one point, using only float arithmetic when
+        possible.
+
+        :param mach: Mach number
+        :param altitude: (unit=m) altitude
+        :return: SFC at maximum thrust (in kg/s/N)
+        """
+        if self._is_value_in_grid(mach, altitude):
+            return self._sfc_interpolator.get_value(mach, altitude)
+        return float(self.sfc_at_max_thrust(mach, altitude))
+
+    def _interpolate(
+        self,
+        interpolator: "_Interpolator",
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        compute_analytically: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        table_index: int = 0,
+    ) -> np.ndarray:
+        """
+        Interpolates values for points in grid bounds, and computes other points with
+        provided function.
+        """
+        if np.size(mach) == 1 and np.size(altitude) == 1:
+            # Fast path for single flight points
+            mach_value = float(np.squeeze(mach))
+            altitude_value = float(np.squeeze(altitude))
+            shape = np.broadcast(mach, altitude).shape
+            if self._is_value_in_grid(mach_value, altitude_value):
+                return np.full(
+                    shape, interpolator.get_value(mach_value, altitude_value, table_index)
+                )
+            return np.reshape(
+                compute_analytically(np.asarray(mach_value), np.asarray(altitude_value)), shape
+            )
+
+        mach, altitude = np.broadcast_arrays(
+            np.asarray(mach, dtype=float), np.asarray(altitude, dtype=float)
+        )
+        in_grid = self._is_in_grid(mach, altitude)
+        if np.all(in_grid):
+            return np.reshape(
+                interpolator(np.ravel(mach), np.ravel(altitude), table_index), np.shape(mach)
+            )
+
+        values = np.empty(np.shape(mach))
+        values[in_grid] = interpolator(mach[in_grid], altitude[in_grid], table_index)
+        out_of_grid = np.logical_not(in_grid)
+        values[out_of_grid] = compute_analytically(mach[out_of_grid], altitude[out_of_grid])
+        return values
+
+    def _is_value_in_grid(self, mach: float, altitude: float) -> bool:
+        return (
+            self._mach_bounds[0] <= mach <= self._mach_bounds[1]
+            and self._altitude_bounds[0] <= altitude <= self._altitude_bounds[1]
+        )
+
+    def _is_in_grid(self, mach: np.ndarray, altitude: np.ndarray) -> np.ndarray:
+        return (
+            (mach >= self._mach_bounds[0])
+            & (mach <= self._mach_bounds[1])
+            & (altitude >= self._altitude_bounds[0])
+            & (altitude <= self._altitude_bounds[1])
+        )
+
+    def _estimate_max_relative_error(self) -> float:
+        """
+        :return: maximum relative difference between interpolated and analytic values at
+                 centers of grid cells
+        """
+        machs = 0.5 * (self.machs[:-1] + self.machs[1:])
+        altitudes = 0.5 * (self.altitudes[:-1] + self.altitudes[1:])
+        delta_t4_values: List[float] = list(self.delta_t4_values) + list(
+            0.5 * (self.delta_t4_values[:-1] + self.delta_t4_values[1:])
+        )
+        mach, altitude, delta_t4 = [
+            np.ravel(array) for array in np.meshgrid(machs, altitudes, delta_t4_values)
+        ]
+        atmosphere = Atmosphere(altitude, altitude_in_feet=False)
+
+        errors = []
+        for interpolated, analytic in [
+            (
+                self.max_thrust(mach, altitude, delta_t4),
+                RubberEngine.max_thrust(self._engine, atmosphere, mach, delta_t4),
+            ),
+            (
+                self.sfc_at_max_thrust(mach, altitude),
+                RubberEngine.sfc_at_max_thrust(self._engine, atmosphere, mach),
+            ),
+        ]:
+            errors.append(np.max(np.abs(interpolated / analytic - 1.0)))
+        return float(max(errors))
+
+
+class _Axis:
+    """
+    Locates values among the nodes of a grid axis.
+    """
+
+    def __init__(self, nodes: np.ndarray):
+        self.nodes = nodes
+        self._steps = np.diff(nodes)
+        # On regular grids, no search is needed
+        self._regular_step = (
+            self._steps[0]
+            if np.allclose(self._steps, self._steps[0], rtol=1.0e-12, atol=0.0)
+            else None
+        )
+        self._node_list = nodes.tolist()
+
+    def locate(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param values: values to locate, within node bounds
+        :return: indices of lower nodes of cells and relative positions in cells
+        """
+        if self._regular_step is not None:
+            positions = (values - self.nodes[0]) / self._regular_step
+            indices = np.minimum(positions.astype(np.intp), len(self.nodes) - 2)
+            return indices, positions - indices
+        indices = np.clip(
+            np.searchsorted(self.nodes, values, side="right") - 1, 0, len(self.nodes) - 2
+        )
+        return indices, (values - self.nodes[indices]) / self._steps[indices]
+
+    def locate_value(self, value: float) -> Tuple[int, float]:
+        """
+        Same as :meth:`locate` for one value, using only float arithmetic.
+        """
+        nodes = self._node_list
+        i = min(max(bisect_right(nodes, value) - 1, 0), len(nodes) - 2)
+        return i, (value - nodes[i]) / (nodes[i + 1] - nodes[i])
+
+
+class _Interpolator:
+    """
+    Interpolates values of several tables defined on the same (Mach, altitude) grid.
+    """
+
+    def __init__(self, machs: np.ndarray, altitudes: np.ndarray, tables: np.ndarray, method: str):
+        """
+        :param machs: Mach numbers of grid nodes
+        :param altitudes: altitudes of grid nodes
+        :param tables: values with shape (table count, Mach count, altitude count)
+        :param method: one of :data:`DECK_METHODS`
+        """
+        self._mach_axis = _Axis(machs)
+        self._altitude_axis = _Axis(altitudes)
+        self._splines = None
+        if method == "cubic":
+            self._splines = [
+                RectBivariateSpline(machs, altitudes, values, kx=3, ky=3) for values in tables
+            ]
+
+        # In each cell, bilinear interpolation is value = c0 + c1*x + c2*y + c3*x*y, where x
+        # and y are relative positions in the cell. Coefficients are stored in one row per
+        # (table, cell) couple, so that they are gathered at once.
+        self._cell_count = (len(machs) - 1) * (len(altitudes) - 1)
+        self._coefficients = np.stack(
+            [
+                np.ravel(coefficients)
+                for coefficients in [
+                    tables[:, :-1, :-1],
+                    tables[:, 1:, :-1] - tables[:, :-1, :-1],
+                    tables[:, :-1, 1:] - tables[:, :-1, :-1],
+                    tables[:, 1:, 1:]
+                    - tables[:, 1:, :-1]
+                    - tables[:, :-1, 1:]
+                    + tables[:, :-1, :-1],
+                ]
+            ],
+            axis=1,
+        )
+        self._coefficient_list = self._coefficients.tolist()
+
+    def __call__(
+        self, mach: np.ndarray, altitude: np.ndarray, table_indices: Union[int, np.ndarray] = 0
+    ) -> np.ndarray:
+        """
+        :param mach: Mach numbers, within grid bounds
+        :param altitude: altitudes, within grid bounds, with same shape as mach
+        :param table_indices: index of the table to use for each point
+        :return: interpolated values
+        """
+        if self._splines is not None:
+            if np.size(table_indices) == 1:
+                return self._splines[int(table_indices)].ev(mach, altitude)
+            values = np.empty(np.shape(mach))
+            for i in np.unique(table_indices):
+                is_table = table_indices == i
+                values[is_table] = self._splines[i].ev(mach[is_table], altitude[is_table])
+            return values
+
+        i, x = self._mach_axis.locate(mach)
+        j, y = self._altitude_axis.locate(altitude)
+        flat_indices = i * (len(self._altitude_axis.nodes) - 1) + j
+        flat_indices += table_indices * self._cell_count
+        c_0, c_1, c_2, c_3 = np.take(self._coefficients, flat_indices, axis=0).T
+        return c_0 + x * (c_1 + y * c_3) + y * c_2
+
+    def get_value(self, mach: float, altitude: float, table_index: int = 0) -> float:
+        """
+        Same as :meth:`__call__` for one point, using only float arithmetic.
+
+        :param mach: Mach number, within grid bounds
+        :param altitude: altitude, within grid bounds
+        :param table_index: index of the table to use
+        :return: interpolated value
+        """
+        if self._splines is not None:
+            return float(self._splines[table_index].ev(mach, altitude))
+
+        i, x = self._mach_axis.locate_value(mach)
+        j, y = self._altitude_axis.locate_value(altitude)
+        flat_index = i * (len(self._altitude_axis.nodes) - 1) + j + table_index * self._cell_count
+        c_0, c_1, c_2, c_3 = self._coefficient_list[flat_index]
+        return c_0 + x * (c_1 + y * c_3) + y * c_2
+
+
+_DECKS = OrderedDict()
+
+
+class TabulatedRubberEngine(RubberEngine):
+    """
+    Same as
+    :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`,
+    but maximum thrust and SFC at maximum thrust are interpolated in a
+    :class:`RubberEngineDeck`, that is computed at first use for current engine parameters.
+    """
+
+    def __init__(
+        self,
+        *args,
+        deck_machs: Sequence[float] = DEFAULT_DECK_MACHS,
+        deck_altitudes: Sequence[float] = DEFAULT_DECK_ALTITUDES,
+        deck_method: str = "linear",
+        **kwargs
+    ):
+        """
+        Same parameters as
+        :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`,
+        plus:
+
+        :param deck_machs: Mach numbers of deck nodes
+        :param deck_altitudes: (unit=m) altitudes of deck nodes
+        :param deck_method: interpolation method of deck (see :data:`DECK_METHODS`)
+        """
+        super().__init__(*args, **kwargs)
+        self._deck_machs = deck_machs
+        self._deck_altitudes = deck_altitudes
+        self._deck_method = deck_method
+        self._deck = None
+
+    @property
+    def deck(self) -> RubberEngineDeck:
+        """The deck of the engine, obtained at first use with engine parameters."""
+        if self._deck is None:
+            self._deck = RubberEngineDeck.get(
+                self, self._deck_machs, self._deck_altitudes, self._deck_method
+            )
+        return self._deck
+
+    def max_thrust(
+        self,
+        atmosphere: Atmosphere,
+        mach: Union[float, Sequence[float]],
+        delta_t4: Union[float, Sequence[float]],
+    ) -> np.ndarray:
+        return self.deck.max_thrust(mach, atmosphere.get_altitude(False), delta_t4)
+
+    def sfc_at_max_thrust(
+        self, atmosphere: Atmosphere, mach: Union[float, Sequence[float]]
+    ) -> np.ndarray:
+        return self.deck.sfc_at_max_thrust(mach, atmosphere.get_altitude(False))
+
+    def _get_max_thrust_value(
+        self, atmosphere: ScalarAtmosphereSI, mach: float, delta_t4: float
+    ) -> float:
+        return self.deck.get_max_thrust_value(mach, atmosphere.altitude, delta_t4)
+
+    def _get_sfc_at_max_thrust_value(self, atmosphere: ScalarAtmosphereSI, mach: float) -> float:
+        return self.deck.get_sfc_at_max_thrust_value(mach, atmosphere.altitude)
@@ -22,7 +22,8 @@ from fastoad.model_base.propulsion import (
 )
 from fastoad.module_management.service_registry import RegisterPropulsion
 from fastoad.openmdao.validity_checker import ValidityDomainChecker
-from .constants import RUBBER_ENGINE_DESCRIPTION
+from .constants import RUBBER_ENGINE_DESCRIPTION, TABULATED_RUBBER_ENGINE_DESCRIPTION
+from .engine_deck import TabulatedRubberEngine
 from .rubber_engine import RubberEngine
 
 
@@ -73,6 +74,12 @@ class OMRubberEngineWrapper(IOMPropulsionWrapper):
         )
     """
 
+    #: If True, :meth:`get_model` provides a
+    #: :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.engine_deck.TabulatedRubberEngine`
+    #: instance, where maximum thrust and SFC at maximum thrust are interpolated in a
+    #: precomputed engine deck.
+    use_engine_deck = False
+
     def setup(self, component: Component):
         component.add_input("data:propulsion:rubber_engine:bypass_ratio", np.nan)
         component.add_input("data:propulsion:rubber_engine:overall_pressure_ratio", np.nan)
@@ -95,13 +102,14 @@ class OMRubberEngineWrapper(IOMPropulsionWrapper):
             "specified to avoid OpenMDAO making unwanted conversion",
         )
 
-    @staticmethod
-    def get_model(inputs) -> IPropulsion:
+    def get_model(self, inputs) -> IPropulsion:
         """
 
         :param inputs: input parameters that define the engine
         :return: a :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`
-                 instance
+                 instance (a
+                 :class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.engine_deck.TabulatedRubberEngine`
+                 instance if :attr:`use_engine_deck` is True)
         """
         engine_params = {
             "bypass_ratio": inputs["data:propulsion:rubber_engine:bypass_ratio"],
@@ -118,9 +126,22 @@ class OMRubberEngineWrapper(IOMPropulsionWrapper):
             "mto_thrust": inputs["data:propulsion:MTO_thrust"],
         }
 
+        if self.use_engine_deck:
+            return TabulatedRubberEngine(**engine_params)
         return RubberEngine(**engine_params)
 
 
+@RegisterPropulsion(
+    "fastoad.wrapper.propulsion.tabulated_rubber_engine", desc=TABULATED_RUBBER_ENGINE_DESCRIPTION,
+)
+class OMTabulatedRubberEngineWrapper(OMRubberEngineWrapper):
+    """
+    Same as :class:`OMRubberEngineWrapper`, with :attr:`use_engine_deck` set to True.
+    """
+
+    use_engine_deck = True
+
+
 @ValidityDomainChecker(
     {
         "data:propulsion:altitude": (None, 20000.0),
@@ -14,6 +14,7 @@
 
 import logging
 import math
+from numbers import Number
 from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
@@ -21,7 +22,7 @@ import pandas as pd
 
 from fastoad.constants import EngineSetting
 from fastoad.exceptions import FastUnknownEngineSettingError
-from fastoad.model_base import Atmosphere, FlightPoint
+from fastoad.model_base import Atmosphere, FlightPoint, ScalarAtmosphereSI
 from fastoad.model_base.propulsion import AbstractFuelPropulsion
 from .constants import (
     ALPHA,
@@ -45,6 +46,11 @@ from .exceptions import FastRubberEngineInconsistentInputParametersError
 # Logger for this module
 _LOGGER = logging.getLogger(__name__)
 
+# Atmosphere values at limits of troposphere, as floats for the scalar path
+_SEA_LEVEL_TEMPERATURE = float(ATM_SEA_LEVEL.temperature)
+_SEA_LEVEL_DENSITY = float(ATM_SEA_LEVEL.density)
+_TROPOPAUSE_DENSITY = float(ATM_TROPOPAUSE.density)
+
 
 class RubberEngine(AbstractFuelPropulsion):
     def __init__(
@@ -101,6 +107,31 @@ class RubberEngine(AbstractFuelPropulsion):
 
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
         # pylint: disable=too-many-arguments  # they define the trajectory
+        if isinstance(flight_points, FlightPoint) and all(
+            value is None or isinstance(value, Number)
+            for value in [
+                flight_points.mach,
+                flight_points.altitude,
+                flight_points.thrust_is_regulated,
+                flight_points.thrust_rate,
+                flight_points.thrust,
+            ]
+        ):
+            # Fast path for single flight points, as computed at each time step of segments
+            (
+                flight_points.sfc,
+                flight_points.thrust_rate,
+                flight_points.thrust,
+            ) = self._compute_flight_point(
+                flight_points.mach,
+                flight_points.altitude,
+                self._get_delta_t4(flight_points.engine_setting),
+                flight_points.thrust_is_regulated,
+                flight_points.thrust_rate,
+                flight_points.thrust,
+            )
+            return
+
         sfc, thrust_rate, thrust = self.compute_flight_points_from_dt4(
             flight_points.mach,
             flight_points.altitude,
@@ -194,6 +225,65 @@ class RubberEngine(AbstractFuelPropulsion):
 
         return sfc, out_thrust_rate, out_thrust
 
+    def _compute_flight_point(
+        self,
+        mach: float,
+        altitude: float,
+        delta_t4: float,
+        thrust_is_regulated: Optional[Union[bool, float]],
+        thrust_rate: Optional[float],
+        thrust: Optional[float],
+    ) -> Tuple[float, float, float]:
+        # pylint: disable=too-many-arguments  # they define the trajectory
+        """
+        Same as :meth:`compute_flight_points_from_dt4` for one flight point, using only float
+        arithmetic. Results are equal within rounding (numpy may vectorize some operations
+        differently, which can change the last bit).
+
+        :param mach: Mach number
+        :param altitude: (unit=m) altitude w.r.t. to sea level
+        :param delta_t4: (unit=K) difference between operational and design values of
+                         turbine inlet temperature in K
+        :param thrust_is_regulated: tells if thrust_rate or thrust should be used
+        :param thrust_rate: thrust rate (unit=none)
+        :param thrust: required thrust (unit=N)
+        :return: SFC (in kg/s/N), thrust rate, thrust (in N)
+        """
+        if thrust_is_regulated is None:
+            if thrust_rate is not None:
+                thrust_is_regulated = False
+            elif thrust is not None:
+                thrust_is_regulated = True
+            else:
+                raise FastRubberEngineInconsistentInputParametersError(
+                    "When use_thrust_rate is None, either thrust_rate or thrust should be provided."
+                )
+        else:
+            # As OpenMDAO may provide floats that could be slightly different
+            # from 0. or 1., a rounding operation is needed before converting
+            # to booleans
+            thrust_is_regulated = bool(round(thrust_is_regulated))
+            if thrust_is_regulated and thrust is None:
+                raise FastRubberEngineInconsistentInputParametersError(
+                    "When thrust_is_regulated is True, thrust should be provided."
+                )
+            if not thrust_is_regulated and thrust_rate is None:
+                raise FastRubberEngineInconsistentInputParametersError(
+                    "When thrust_is_regulated is False, thrust_rate should be provided."
+                )
+
+        atmosphere = ScalarAtmosphereSI(altitude)
+        max_thrust = self._get_max_thrust_value(atmosphere, float(mach), float(delta_t4))
+
+        if not thrust_is_regulated:
+            thrust = thrust_rate * max_thrust
+        thrust_rate = thrust / max_thrust
+
+        sfc_0 = self._get_sfc_at_max_thrust_value(atmosphere, float(mach))
+        sfc = sfc_0 * self._get_sfc_ratio_value(atmosphere.altitude, thrust_rate)
+
+        return sfc, thrust_rate, thrust
+
     @staticmethod
     def _check_thrust_inputs(
         thrust_is_regulated: Optional[Union[float, Sequence]],
@@ -487,6 +577,116 @@ class RubberEngine(AbstractFuelPropulsion):
 
         return self.f_0 * _mach_effect() * _altitude_effect() * _residuals()
 
+    def _get_sfc_at_max_thrust_value(self, atmosphere: ScalarAtmosphereSI, mach: float) -> float:
+        """
+        Same as :meth:`sfc_at_max_thrust` for one flight point, using only float arithmetic.
+        """
+        altitude = atmosphere.altitude
+        bypass_ratio = float(self.bypass_ratio)
+        opr_delta = float(self.overall_pressure_ratio) - 30
+
+        bound_altitude = min(11000, max(0, altitude))
+
+        # pylint: disable=invalid-name  # coefficients are named after model
+        a1 = -7.44e-13 * bound_altitude + 6.54e-7
+        a2 = -3.32e-10 * bound_altitude + 8.54e-6
+        b1 = -3.47e-11 * bound_altitude - 6.58e-7
+        b2 = 4.23e-10 * bound_altitude + 1.32e-5
+        c = -1.05e-7
+
+        theta = atmosphere.temperature / _SEA_LEVEL_TEMPERATURE
+        return (
+            mach * (a1 * bypass_ratio + a2)
+            + (b1 * bypass_ratio + b2) * math.sqrt(theta)
+            + ((7.4e-13 * opr_delta * altitude) + c) * opr_delta
+        )
+
+    def _get_sfc_ratio_value(self, altitude: float, thrust_rate: float) -> float:
+        """
+        Same as :meth:`sfc_ratio` for one flight point, using only float arithmetic.
+        """
+        delta_h = altitude - float(self.design_alt)
+        thrust_ratio_at_min_sfc_ratio = -9.6e-5 * delta_h + 0.85
+
+        if thrust_ratio_at_min_sfc_ratio == 1.0:
+            min_sfc_ratio = 1.0
+            coeff = MAX_SFC_RATIO_COEFF
+        else:
+            min_sfc_ratio = max(
+                min(0.998, -3.385e-5 * delta_h + 0.995),
+                1 - MAX_SFC_RATIO_COEFF * (1 - thrust_ratio_at_min_sfc_ratio) ** 2,
+            )
+            coeff = (1 - min_sfc_ratio) / (1 - thrust_ratio_at_min_sfc_ratio) ** 2
+
+        return coeff * (thrust_rate - thrust_ratio_at_min_sfc_ratio) ** 2 + min_sfc_ratio
+
+    def _get_max_thrust_value(
+        self, atmosphere: ScalarAtmosphereSI, mach: float, delta_t4: float
+    ) -> float:
+        """
+        Same as :meth:`max_thrust` for one flight point, using only float arithmetic.
+        """
+        altitude = atmosphere.altitude
+        bypass_ratio = float(self.bypass_ratio)
+        opr_delta = float(self.overall_pressure_ratio) - 30
+        t_4 = float(self.t_4)
+
+        # Mach effect
+        vect = [opr_delta ** 2, opr_delta, 1.0, t_4, delta_t4]
+
+        def _calc_coef(a_coeffs, b_coeffs):
+            return (
+                a_coeffs[0] * vect[0]
+                + a_coeffs[1] * vect[1]
+                + a_coeffs[2]
+                + a_coeffs[3] * vect[3]
+                + a_coeffs[4] * vect[4]
+            ) * bypass_ratio + (
+                b_coeffs[0] * vect[0]
+                + b_coeffs[1] * vect[1]
+                + b_coeffs[2]
+                + b_coeffs[3] * vect[3]
+                + b_coeffs[4] * vect[4]
+            )
+
+        ms_11000 = A_MS * t_4 + B_MS * bypass_ratio + C_MS * opr_delta + D_MS * delta_t4 + E_MS
+        fm_11000 = A_FM * t_4 + B_FM * bypass_ratio + C_FM * opr_delta + D_FM * delta_t4 + E_FM
+
+        bound_altitude = min(11000, altitude)
+        m_s = (
+            ms_11000
+            + _calc_coef(ALPHA[0], BETA[0]) * (bound_altitude - 11000) ** 2
+            + _calc_coef(ALPHA[1], BETA[1]) * (bound_altitude - 11000)
+        )
+        f_m = (
+            fm_11000
+            + _calc_coef(ALPHA[2], BETA[2]) * (bound_altitude - 11000) ** 2
+            + _calc_coef(ALPHA[3], BETA[3]) * (bound_altitude - 11000)
+        )
+        mach_effect = (1 - f_m) / (m_s * m_s) * (mach - m_s) ** 2 + f_m
+
+        # Altitude effect
+        # pylint: disable=invalid-name  # coefficients are named after model
+        k = 1 + 1.2e-3 * delta_t4
+        nf = 0.98 + 8e-4 * delta_t4
+        if altitude <= 11000:
+            altitude_effect = (
+                k
+                * ((atmosphere.density / _SEA_LEVEL_DENSITY) ** nf)
+                * (1 / (1 - (0.04 * math.sin((math.pi * altitude) / 11000))))
+            )
+        else:
+            altitude_effect = (
+                k
+                * ((_TROPOPAUSE_DENSITY / _SEA_LEVEL_DENSITY) ** nf)
+                * atmosphere.density
+                / _TROPOPAUSE_DENSITY
+            )
+
+        residuals = -4.51e-3 * bypass_ratio + 2.19e-5 * t_4 - 3.09e-4 * opr_delta + 0.945
+
+        return float(self.f_0) * mach_effect * altitude_effect * residuals
+
     def installed_weight(self) -> float:
         """
         Computes weight of installed engine, depending on MTO thrust (F0).
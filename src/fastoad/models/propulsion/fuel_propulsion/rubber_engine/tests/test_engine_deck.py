@@ -0,0 +1,146 @@
+"""
+Test module for engine_deck.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from fastoad.model_base import Atmosphere
+from fastoad.module_management.service_registry import RegisterPropulsion
+from ..engine_deck import RubberEngineDeck, TabulatedRubberEngine
+from ..openmdao import OMRubberEngineWrapper, OMTabulatedRubberEngineWrapper
+from ..rubber_engine import RubberEngine
+
+ENGINE_PARAMETERS = [5, 30, 1500, 100000, 0.95, 10000]
+
+
+@pytest.mark.parametrize("method", ["linear", "cubic"])
+def test_deck(method):
+    engine = RubberEngine(*ENGINE_PARAMETERS)
+    deck = RubberEngineDeck(engine, [-100.0, -50.0, 0.0], method=method)
+    assert deck.max_relative_error < 0.03
+
+    np.random.seed(42)
+    machs = np.random.uniform(0.1, 0.9, 1000)
+    altitudes = np.random.uniform(0.0, 12000.0, 1000)
+    atmosphere = Atmosphere(altitudes, altitude_in_feet=False)
+
+    # Values at delta_t4 nodes and between them
+    assert_allclose(
+        deck.max_thrust(machs, altitudes, -50.0),
+        engine.max_thrust(atmosphere, machs, -50.0),
+        rtol=1e-2,
+    )
+    delta_t4 = np.random.uniform(-100.0, 0.0, 1000)
+    assert_allclose(
+        deck.max_thrust(machs, altitudes, delta_t4),
+        engine.max_thrust(atmosphere, machs, delta_t4),
+        rtol=2e-2,
+    )
+    assert_allclose(
+        deck.sfc_at_max_thrust(machs, altitudes),
+        engine.sfc_at_max_thrust(atmosphere, machs),
+        rtol=1e-2,
+    )
+
+    # Single points give the same results as arrays
+    for i in range(5):
+        assert_allclose(
+            deck.max_thrust(machs[i], altitudes[i], -50.0),
+            deck.max_thrust(machs, altitudes, -50.0)[i],
+            rtol=1e-12,
+        )
+        assert_allclose(
+            deck.sfc_at_max_thrust(machs[i], altitudes[i]),
+            deck.sfc_at_max_thrust(machs, altitudes)[i],
+            rtol=1e-12,
+        )
+
+    # Out of grid, analytic model is used
+    machs = np.array([0.5, 1.2, 0.5])
+    altitudes = np.array([21000.0, 5000.0, 5000.0])
+    delta_t4 = np.array([-50.0, -50.0, -150.0])
+    atmosphere = Atmosphere(altitudes, altitude_in_feet=False)
+    assert_allclose(
+        deck.max_thrust(machs, altitudes, delta_t4),
+        engine.max_thrust(atmosphere, machs, delta_t4),
+        rtol=1e-12,
+    )
+    assert_allclose(
+        deck.sfc_at_max_thrust(machs[:2], altitudes[:2]),
+        engine.sfc_at_max_thrust(Atmosphere(altitudes[:2], altitude_in_feet=False), machs[:2]),
+        rtol=1e-12,
+    )
+
+    with pytest.raises(ValueError):
+        RubberEngineDeck(engine, [0.0], method="quadratic")
+
+
+def test_tabulated_rubber_engine():
+    engine = RubberEngine(*ENGINE_PARAMETERS)
+    tabulated_engine = TabulatedRubberEngine(*ENGINE_PARAMETERS)
+
+    # Deck is computed only once for a given set of engine parameters
+    assert tabulated_engine.deck is TabulatedRubberEngine(*ENGINE_PARAMETERS).deck
+    assert tabulated_engine.deck is not TabulatedRubberEngine(6, *ENGINE_PARAMETERS[1:]).deck
+    assert tabulated_engine.deck is not TabulatedRubberEngine(*ENGINE_PARAMETERS, -40, -90).deck
+
+    machs = [0, 0.3, 0.3, 0.8, 0.8]
+    altitudes = [0, 0, 0, 10000, 13000]
+    thrust_rates = [0.8, 0.5, 0.5, 0.4, 0.7]
+    expected = engine.compute_flight_points_from_dt4(
+        machs, altitudes, [-50, -50, -50, -100, -100], False, thrust_rates
+    )
+    results = tabulated_engine.compute_flight_points_from_dt4(
+        machs, altitudes, [-50, -50, -50, -100, -100], False, thrust_rates
+    )
+    assert_allclose(results, expected, rtol=1e-2)
+
+    for i in range(5):
+        assert_allclose(
+            tabulated_engine.compute_flight_points_from_dt4(
+                machs[i], altitudes[i], -50, False, thrust_rates[i]
+            ),
+            engine.compute_flight_points_from_dt4(
+                machs[i], altitudes[i], -50, False, thrust_rates[i]
+            ),
+            rtol=1e-2,
+        )
+
+
+def test_wrapper():
+    inputs = {
+        "data:propulsion:rubber_engine:bypass_ratio": 5,
+        "data:propulsion:rubber_engine:overall_pressure_ratio": 30,
+        "data:propulsion:rubber_engine:turbine_inlet_temperature": 1500,
+        "data:propulsion:MTO_thrust": 100000,
+        "data:propulsion:rubber_engine:maximum_mach": 0.95,
+        "data:propulsion:rubber_engine:design_altitude": 10000,
+        "data:propulsion:rubber_engine:delta_t4_climb": -50,
+        "data:propulsion:rubber_engine:delta_t4_cruise": -100,
+    }
+
+    wrapper = OMRubberEngineWrapper()
+    assert not isinstance(wrapper.get_model(inputs), TabulatedRubberEngine)
+    wrapper.use_engine_deck = True
+    assert isinstance(wrapper.get_model(inputs), TabulatedRubberEngine)
+
+    # Classes of registered wrappers are loaded separately by the bundle loader, so they are
+    # checked by name.
+    wrapper = RegisterPropulsion.get_provider("fastoad.wrapper.propulsion.tabulated_rubber_engine")
+    assert wrapper.use_engine_deck
+    assert type(wrapper.get_model(inputs)).__name__ == "TabulatedRubberEngine"
+    assert OMTabulatedRubberEngineWrapper().use_engine_deck
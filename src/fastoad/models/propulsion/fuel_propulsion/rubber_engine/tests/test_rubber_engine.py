@@ -21,6 +21,7 @@ import pytest
 
 from fastoad.constants import EngineSetting
 from fastoad.model_base import Atmosphere, FlightPoint
+from ..exceptions import FastRubberEngineInconsistentInputParametersError
 from ..rubber_engine import RubberEngine
 
 
@@ -72,6 +73,52 @@ def test_compute_flight_points():
     np.testing.assert_allclose(flight_points.thrust_rate, thrust_rates + thrust_rates, rtol=1e-4)
     np.testing.assert_allclose(flight_points.thrust, thrusts + thrusts, rtol=1e-4)
 
+    # Single flight points give the same results as arrays, within rounding
+    for i in range(5):
+        for j, flight_point in enumerate(
+            [
+                FlightPoint(
+                    mach=machs[i],
+                    altitude=altitudes[i],
+                    engine_setting=engine_settings[i],
+                    thrust_is_regulated=False,
+                    thrust_rate=thrust_rates[i],
+                ),
+                FlightPoint(
+                    mach=machs[i],
+                    altitude=altitudes[i],
+                    engine_setting=engine_settings[i],
+                    thrust_is_regulated=True,
+                    thrust=thrusts[i],
+                ),
+            ]
+        ):
+            engine.compute_flight_points(flight_point)
+            assert isinstance(flight_point.sfc, float)
+            np.testing.assert_allclose(flight_point.sfc, flight_points.sfc[i + 5 * j], rtol=1e-14)
+            np.testing.assert_allclose(
+                flight_point.thrust_rate, flight_points.thrust_rate[i + 5 * j], rtol=1e-14
+            )
+            np.testing.assert_allclose(
+                flight_point.thrust, flight_points.thrust[i + 5 * j], rtol=1e-14
+            )
+
+    # Inconsistent inputs are detected the same way as with arrays
+    with pytest.raises(FastRubberEngineInconsistentInputParametersError):
+        engine.compute_flight_points(
+            FlightPoint(mach=0.3, altitude=0.0, engine_setting=EngineSetting.CLIMB)
+        )
+    with pytest.raises(FastRubberEngineInconsistentInputParametersError):
+        engine.compute_flight_points(
+            FlightPoint(
+                mach=0.3,
+                altitude=0.0,
+                engine_setting=EngineSetting.CLIMB,
+                thrust_is_regulated=True,
+                thrust_rate=0.5,
+            )
+        )
+
 
 def test_installed_weight():
     fj44 = RubberEngine(0, 0, 0, 8452, 0, 0)
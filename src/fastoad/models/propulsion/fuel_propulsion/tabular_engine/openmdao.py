@@ -0,0 +1,79 @@
+"""OpenMDAO wrapping of TabularEngine."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from openmdao.core.component import Component
+
+from fastoad.model_base.propulsion import IOMPropulsionWrapper, IPropulsion
+from fastoad.module_management.constants import OPTION_PROPERTY_NAME
+from fastoad.module_management.service_registry import RegisterPropulsion
+from .constants import TABULAR_ENGINE_DESCRIPTION
+from .exceptions import FastTabularEngineDeckError
+from .tabular_engine import EngineDeck, TabularEngine
+
+#: Name of the provider option that gives the path of the engine deck file.
+DECK_FILE_OPTION = "deck_file"
+
+
+@RegisterPropulsion("fastoad.wrapper.propulsion.tabular_engine", desc=TABULAR_ENGINE_DESCRIPTION)
+class OMTabularEngineWrapper(IOMPropulsionWrapper):
+    """
+    Wrapper class of for tabular engine model.
+
+    It is made to allow a direct call to
+    :class:`~fastoad.models.propulsion.fuel_propulsion.tabular_engine.tabular_engine.TabularEngine`
+    in an OpenMDAO component.
+
+    The engine deck file is defined by :attr:`deck_file`, that can be set in a subclass::
+
+        @RegisterPropulsion("my.tabular_engine")
+        class MyTabularEngineWrapper(OMTabularEngineWrapper):
+            deck_file = "path/to/my_engine_deck.npz"
+
+    or with the "deck_file" option of the registered provider::
+
+        @RegisterPropulsion(
+            "my.tabular_engine",
+            options={"deck_file": "path/to/my_engine_deck.npz"}
+        )
+        class MyTabularEngineWrapper(OMTabularEngineWrapper):
+            pass
+
+    The option has precedence over the attribute.
+    """
+
+    #: Path of the engine deck file (see
+    #: :class:`~fastoad.models.propulsion.fuel_propulsion.tabular_engine.tabular_engine.EngineDeck`
+    #: for file formats).
+    deck_file = None
+
+    def setup(self, component: Component):
+        component.add_input("data:propulsion:tabular_engine:thrust_scale_factor", 1.0)
+
+    def get_model(self, inputs) -> IPropulsion:
+        """
+
+        :param inputs: input parameters that define the engine
+        :return: a :class:`~.tabular_engine.TabularEngine` instance
+        """
+        options = getattr(self, "_" + OPTION_PROPERTY_NAME, None) or {}
+        deck_file = options.get(DECK_FILE_OPTION, self.deck_file)
+        if deck_file is None:
+            raise FastTabularEngineDeckError(
+                'No engine deck file defined. Please set the "%s" option.' % DECK_FILE_OPTION
+            )
+
+        return TabularEngine(
+            EngineDeck.get(deck_file),
+            float(inputs["data:propulsion:tabular_engine:thrust_scale_factor"]),
+        )
@@ -0,0 +1,532 @@
+"""Engine model based on a tabulated engine deck."""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import os.path as pth
+import struct
+import zipfile
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fastoad.constants import EngineSetting
+from fastoad.exceptions import FastUnknownEngineSettingError
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import AbstractFuelPropulsion
+from .exceptions import FastTabularEngineDeckError
+
+#: Names of the axes of engine decks, in order of table dimensions. Altitudes are in meters.
+AXIS_NAMES = ["mach", "altitude", "thrust_rate"]
+
+#: Names of the tables of engine decks. Thrust is in N and SFC in kg/s/N.
+TABLE_NAMES = ["thrust", "sfc"]
+
+#: Name of the optional axis of engine settings, that comes before other axes.
+ENGINE_SETTING_NAME = "engine_setting"
+
+#: Maximum number of decks kept by :meth:`EngineDeck.get`.
+DECK_CACHE_SIZE = 8
+
+
+class EngineDeck:
+    """
+    Thrust and SFC of an engine, tabulated over Mach number, altitude and thrust rate, and
+    optionally over engine setting.
+
+    Thrust rate is the ratio between thrust and maximum thrust, so thrust for thrust rate 1.0
+    is expected to be the maximum thrust of the engine in given conditions.
+
+    Decks can be read from files:
+
+    - CSV files have one row per grid node, with columns "mach", "altitude", "thrust_rate",
+      "thrust", "sfc" and optionally "engine_setting" (names or values of
+      :class:`~fastoad.constants.EngineSetting`). Rows can be in any order, but all
+      nodes of the grid must be provided.
+    - NPZ files contain arrays "mach", "altitude", "thrust_rate", optionally "engine_setting"
+      (values of :class:`~fastoad.constants.EngineSetting`), and tables "thrust" and "sfc" of
+      shape ([engine setting count, ] Mach count, altitude count, thrust rate count). When
+      stored uncompressed (see :meth:`save_npz`), tables are memory-mapped instead of being
+      loaded.
+
+    Between nodes, values are interpolated linearly. Mach numbers and altitudes are kept
+    within grid bounds, while thrust rates are extrapolated linearly.
+    """
+
+    def __init__(
+        self,
+        machs: Sequence[float],
+        altitudes: Sequence[float],
+        thrust_rates: Sequence[float],
+        thrust: np.ndarray,
+        sfc: np.ndarray,
+        engine_settings: Optional[Sequence[int]] = None,
+    ):
+        """
+        :param machs: Mach numbers of grid nodes, in ascending order
+        :param altitudes: (unit=m) altitudes of grid nodes, in ascending order
+        :param thrust_rates: thrust rates of grid nodes, in ascending order
+        :param thrust: (unit=N) thrust values, with shape
+                       ([len(engine_settings), ] len(machs), len(altitudes), len(thrust_rates))
+        :param sfc: (unit=kg/s/N) SFC values, with same shape as thrust
+        :param engine_settings: values of :class:`~fastoad.constants.EngineSetting` that match
+                                the first dimension of tables. If None, tables have no engine
+                                setting dimension and are used for all engine settings.
+        """
+        #: Mach numbers of grid nodes.
+        self.machs = np.asarray(machs, dtype=float)
+
+        #: Altitudes of grid nodes, in meters.
+        self.altitudes = np.asarray(altitudes, dtype=float)
+
+        #: Thrust rates of grid nodes.
+        self.thrust_rates = np.asarray(thrust_rates, dtype=float)
+
+        #: Engine settings that match the first dimension of tables (None if tables are used
+        #: for all engine settings).
+        self.engine_settings = None
+
+        axes = [self.machs, self.altitudes, self.thrust_rates]
+        for name, axis in zip(AXIS_NAMES, axes):
+            if axis.ndim != 1 or len(axis) < 2 or np.any(np.diff(axis) <= 0.0):
+                raise FastTabularEngineDeckError(
+                    'Axis "%s" should have at least 2 values in ascending order.' % name
+                )
+
+        shape = tuple(len(axis) for axis in axes)
+        if engine_settings is not None:
+            self.engine_settings = np.asarray(engine_settings, dtype=int)
+            shape = (len(self.engine_settings),) + shape
+        for name, table in zip(TABLE_NAMES, [thrust, sfc]):
+            if np.shape(table)[-len(shape) :] != shape or np.ndim(table) != len(shape):
+                raise FastTabularEngineDeckError('Table "%s" should have shape %s.' % (name, shape))
+
+        #: Thrust values, in N, with one dimension per axis.
+        self.thrust = thrust
+
+        #: SFC values, in kg/s/N, with one dimension per axis.
+        self.sfc = sfc
+
+        # Tables are flattened for gathering values of nodes. np.asarray() keeps memory maps,
+        # but avoids the indexing overhead of np.memmap instances.
+        self._thrust_values = np.asarray(thrust).reshape(-1)
+        self._sfc_values = np.asarray(sfc).reshape(-1)
+
+        self._table_lookup = None
+        if self.engine_settings is not None:
+            # Unknown engine settings, including out of bounds ones, are mapped to -1.
+            self._table_lookup = np.full(max(EngineSetting) + 2, -1)
+            self._table_lookup[self.engine_settings] = np.arange(len(self.engine_settings))
+
+    @classmethod
+    def get(cls, file_path: str) -> "EngineDeck":
+        """
+        Provides the deck in provided file, loaded with :meth:`load`.
+
+        The last :data:`DECK_CACHE_SIZE` decks are kept, so a file is loaded only once as long
+        as it is not modified.
+
+        :param file_path: path of a CSV or NPZ file
+        :return: the deck
+        """
+        file_path = pth.abspath(file_path)
+        key = (file_path, os.stat(file_path).st_mtime_ns)
+        deck = _DECKS.get(key)
+        if deck is None:
+            deck = cls.load(file_path)
+            _DECKS[key] = deck
+            if len(_DECKS) > DECK_CACHE_SIZE:
+                _DECKS.popitem(last=False)
+        else:
+            _DECKS.move_to_end(key)
+        return deck
+
+    @classmethod
+    def load(cls, file_path: str) -> "EngineDeck":
+        """
+        :param file_path: path of a CSV or NPZ file (format is deduced from file extension)
+        :return: the deck in provided file
+        """
+        extension = pth.splitext(file_path)[1].lower()
+        if extension == ".csv":
+            return cls.read_csv(file_path)
+        if extension == ".npz":
+            return cls.read_npz(file_path)
+        raise FastTabularEngineDeckError(
+            'Engine deck "%s" should be a CSV or a NPZ file.' % file_path
+        )
+
+    @classmethod
+    def read_csv(cls, file_path: str) -> "EngineDeck":
+        """
+        :param file_path: path of a CSV file
+        :return: the deck in provided file
+        """
+        data = pd.read_csv(file_path)
+        missing_columns = [
+            name for name in AXIS_NAMES + TABLE_NAMES if name not in data.columns.tolist()
+        ]
+        if missing_columns:
+            raise FastTabularEngineDeckError(
+                'Engine deck "%s" misses columns %s.' % (file_path, missing_columns)
+            )
+
+        axis_names = list(AXIS_NAMES)
+        engine_settings = None
+        if ENGINE_SETTING_NAME in data.columns:
+            data[ENGINE_SETTING_NAME] = [
+                EngineSetting[value.upper()] if isinstance(value, str) else int(value)
+                for value in data[ENGINE_SETTING_NAME]
+            ]
+            engine_settings = np.unique(data[ENGINE_SETTING_NAME])
+            axis_names.insert(0, ENGINE_SETTING_NAME)
+
+        axes = [np.unique(data[name].values) for name in axis_names]
+        shape = tuple(len(axis) for axis in axes)
+        node_indices = tuple(
+            np.searchsorted(axis, data[name].values) for name, axis in zip(axis_names, axes)
+        )
+        if len(data) != np.prod(shape) or len(
+            np.unique(np.ravel_multi_index(node_indices, shape))
+        ) != len(data):
+            raise FastTabularEngineDeckError(
+                'Engine deck "%s" should provide each node of the grid once.' % file_path
+            )
+
+        tables = []
+        for name in TABLE_NAMES:
+            table = np.empty(shape)
+            table[node_indices] = data[name].values
+            tables.append(table)
+
+        return cls(*axes[-3:], *tables, engine_settings=engine_settings)
+
+    @classmethod
+    def read_npz(cls, file_path: str) -> "EngineDeck":
+        """
+        :param file_path: path of a NPZ file
+        :return: the deck in provided file, with memory-mapped tables if they are not
+                 compressed
+        """
+        with np.load(file_path) as npz_file:
+            missing_names = [
+                name for name in AXIS_NAMES + TABLE_NAMES if name not in npz_file.files
+            ]
+            if missing_names:
+                raise FastTabularEngineDeckError(
+                    'Engine deck "%s" misses arrays %s.' % (file_path, missing_names)
+                )
+            axes = [npz_file[name] for name in AXIS_NAMES]
+            engine_settings = (
+                npz_file[ENGINE_SETTING_NAME] if ENGINE_SETTING_NAME in npz_file.files else None
+            )
+            tables = [
+                _memory_map_npz_member(file_path, name)
+                if npz_file.zip.getinfo(name + ".npy").compress_type == zipfile.ZIP_STORED
+                else None
+                for name in TABLE_NAMES
+            ]
+            tables = [
+                npz_file[name] if table is None else table
+                for name, table in zip(TABLE_NAMES, tables)
+            ]
+
+        return cls(*axes, *tables, engine_settings=engine_settings)
+
+    def save_npz(self, file_path: str):
+        """
+        Saves the deck as an uncompressed NPZ file, whose tables can be memory-mapped by
+        :meth:`read_npz`.
+
+        :param file_path: path of the NPZ file
+        """
+        arrays = {name: getattr(self, name) for name in TABLE_NAMES}
+        arrays.update(zip(AXIS_NAMES, [self.machs, self.altitudes, self.thrust_rates]))
+        if self.engine_settings is not None:
+            arrays[ENGINE_SETTING_NAME] = self.engine_settings
+        np.savez(file_path, **arrays)
+
+    def compute(
+        self,
+        engine_setting: Union[int, Sequence[int]],
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        thrust_is_regulated: Union[bool, Sequence[bool]],
+        thrust_rate: Union[float, Sequence[float]],
+        thrust: Union[float, Sequence[float]],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # pylint: disable=too-many-arguments  # they define the trajectory
+        """
+        Computes all provided points at once.
+
+        For points where thrust is regulated, thrust rate is obtained by inverting the
+        thrust variation along the thrust rate axis, that should be monotonic.
+
+        :param engine_setting: values of :class:`~fastoad.constants.EngineSetting`
+        :param mach: Mach numbers
+        :param altitude: (unit=m) altitudes
+        :param thrust_is_regulated: tells if thrust or thrust rate is used, element-wise
+        :param thrust_rate: thrust rates (used where thrust is not regulated)
+        :param thrust: (unit=N) thrust values (used where thrust is regulated)
+        :return: SFC (in kg/s/N), thrust rate, thrust (in N), as 1D arrays
+        """
+        mach, altitude, thrust_is_regulated, thrust_rate, thrust = [
+            np.ravel(values)
+            for values in np.broadcast_arrays(
+                np.asarray(mach, dtype=float),
+                np.asarray(altitude, dtype=float),
+                np.asarray(thrust_is_regulated, dtype=bool),
+                np.asarray(thrust_rate, dtype=float),
+                np.asarray(thrust, dtype=float),
+            )
+        ]
+        point_count = len(mach)
+
+        # Location in the (Mach, altitude) grid
+        i, x = _locate(self.machs, np.minimum(np.maximum(mach, self.machs[0]), self.machs[-1]))
+        j, y = _locate(
+            self.altitudes, np.minimum(np.maximum(altitude, self.altitudes[0]), self.altitudes[-1]),
+        )
+        indices = (
+            (self._get_table_indices(engine_setting, point_count) * len(self.machs) + i)
+            * len(self.altitudes)
+            + j
+        ) * len(self.thrust_rates)
+
+        # Location on the thrust rate axis, from thrust rate...
+        k, weights = _locate(self.thrust_rates, thrust_rate)
+
+        # ... or from thrust, by bisection along the thrust rate axis, assuming thrust
+        # increases with thrust rate
+        regulated = np.flatnonzero(thrust_is_regulated)
+        if len(regulated) > 0:
+            cell_indices = indices[regulated]
+            cell_x = x[regulated]
+            cell_y = y[regulated]
+            regulated_thrust = thrust[regulated]
+            lower_k = np.zeros_like(cell_indices)
+            upper_k = np.full_like(cell_indices, len(self.thrust_rates) - 1)
+            for _ in range(int(np.ceil(np.log2(len(self.thrust_rates) - 1)))):
+                middle_k = (lower_k + upper_k) // 2
+                is_below = (
+                    self._interpolate_cells(
+                        self._thrust_values, cell_indices + middle_k, cell_x, cell_y
+                    )
+                    < regulated_thrust
+                )
+                lower_k = np.where(is_below, middle_k, lower_k)
+                upper_k = np.where(is_below, upper_k, middle_k)
+
+            lower_thrust = self._interpolate_cells(
+                self._thrust_values, cell_indices + lower_k, cell_x, cell_y
+            )
+            upper_thrust = self._interpolate_cells(
+                self._thrust_values, cell_indices + lower_k + 1, cell_x, cell_y
+            )
+            k[regulated] = lower_k
+            weights[regulated] = (regulated_thrust - lower_thrust) / (upper_thrust - lower_thrust)
+
+        indices = indices + k
+        out_thrust_rate = self.thrust_rates[k] + weights * (
+            self.thrust_rates[k + 1] - self.thrust_rates[k]
+        )
+        out_thrust = np.where(
+            thrust_is_regulated,
+            thrust,
+            self._interpolate_nodes(self._thrust_values, indices, x, y, weights),
+        )
+        sfc = self._interpolate_nodes(self._sfc_values, indices, x, y, weights)
+
+        return sfc, out_thrust_rate, out_thrust
+
+    def _interpolate_nodes(
+        self,
+        table_values: np.ndarray,
+        indices: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        weights: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Interpolates trilinearly between the 8 nodes around each point.
+
+        :param table_values: flattened table values
+        :param indices: for each point, index in table_values of the lower node of its cell
+        :param x: relative positions in cells along Mach axis
+        :param y: relative positions in cells along altitude axis
+        :param weights: relative positions in cells along thrust rate axis
+        :return: interpolated values
+        """
+        lower_values = self._interpolate_cells(table_values, indices, x, y)
+        upper_values = self._interpolate_cells(table_values, indices + 1, x, y)
+        return lower_values + weights * (upper_values - lower_values)
+
+    def _interpolate_cells(
+        self, table_values: np.ndarray, indices: np.ndarray, x: np.ndarray, y: np.ndarray
+    ) -> np.ndarray:
+        """
+        Interpolates bilinearly between the 4 nodes around each point, at a given thrust rate
+        node.
+
+        :param table_values: flattened table values
+        :param indices: for each point, index in table_values of the node at lower Mach number
+                        and lower altitude
+        :param x: relative positions in cells along Mach axis
+        :param y: relative positions in cells along altitude axis
+        :return: interpolated values
+        """
+        altitude_stride = len(self.thrust_rates)
+        mach_stride = altitude_stride * len(self.altitudes)
+
+        lower_values = table_values[indices]
+        lower_values = lower_values + x * (table_values[indices + mach_stride] - lower_values)
+        upper_values = table_values[indices + altitude_stride]
+        upper_values = upper_values + x * (
+            table_values[indices + mach_stride + altitude_stride] - upper_values
+        )
+        return lower_values + y * (upper_values - lower_values)
+
+    def _get_table_indices(
+        self, engine_setting: Union[int, Sequence[int]], point_count: int
+    ) -> Union[int, np.ndarray]:
+        """
+        :return: indices in first dimension of tables for provided engine settings
+        """
+        if self._table_lookup is None:
+            return 0
+
+        engine_setting = np.asarray(engine_setting)
+        if engine_setting.dtype == object:
+            engine_setting = engine_setting.astype(int)
+        table_indices = np.broadcast_to(
+            self._table_lookup.take(engine_setting, mode="clip"), (point_count,),
+        )
+        if np.any(table_indices < 0):
+            raise FastUnknownEngineSettingError(
+                "Engine deck has no data for engine settings %s."
+                % np.unique(np.broadcast_to(engine_setting, (point_count,))[table_indices < 0])
+            )
+        return table_indices
+
+
+_DECKS = OrderedDict()
+
+
+class TabularEngine(AbstractFuelPropulsion):
+    def __init__(self, deck: Union[EngineDeck, str], thrust_scale_factor: float = 1.0):
+        """
+        Engine model where thrust and SFC are interpolated in an :class:`EngineDeck`.
+
+        All flight points, including points where thrust is regulated, are computed in one
+        vectorized pass.
+
+        :param deck: the engine deck, or the path of a file that contains it (see
+                     :meth:`EngineDeck.get`)
+        :param thrust_scale_factor: thrust values of the deck are multiplied by this factor,
+                                    while SFC values are kept
+        """
+        if not isinstance(deck, EngineDeck):
+            deck = EngineDeck.get(deck)
+
+        #: The engine deck.
+        self.deck = deck
+
+        #: Factor applied to thrust values of the deck.
+        self.thrust_scale_factor = thrust_scale_factor
+
+    def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
+        thrust_is_regulated = flight_points.thrust_is_regulated
+        thrust_rate = flight_points.thrust_rate
+        thrust = flight_points.thrust
+        if thrust_is_regulated is None:
+            if thrust_rate is None and thrust is None:
+                raise FastTabularEngineDeckError(
+                    "When thrust_is_regulated is None, either thrust_rate or thrust should be "
+                    "provided."
+                )
+            thrust_is_regulated = thrust_rate is None
+        else:
+            # As OpenMDAO may provide floats that could be slightly different
+            # from 0. or 1., a rounding operation is needed before converting
+            # to booleans
+            thrust_is_regulated = np.round(thrust_is_regulated, 0)
+
+        sfc, thrust_rate, thrust = self.deck.compute(
+            flight_points.engine_setting,
+            flight_points.mach,
+            flight_points.altitude,
+            thrust_is_regulated,
+            np.nan if thrust_rate is None else thrust_rate,
+            np.nan if thrust is None else np.asarray(thrust) / self.thrust_scale_factor,
+        )
+        thrust = thrust * self.thrust_scale_factor
+
+        if isinstance(flight_points, pd.DataFrame):
+            # flight_points.sfc = sfc raises a warning if flight_points is a DataFrame that has
+            # not already this field, so we add needed fields before setting values
+            new_column_names = flight_points.columns.tolist()
+            for name in ["sfc", "thrust_rate", "thrust"]:
+                if name not in new_column_names:
+                    flight_points.insert(len(flight_points.columns), name, value=np.nan)
+        elif np.shape(flight_points.mach) == ():
+            sfc, thrust_rate, thrust = float(sfc), float(thrust_rate), float(thrust)
+
+        flight_points.sfc = sfc
+        flight_points.thrust_rate = thrust_rate
+        flight_points.thrust = thrust
+
+
+def _locate(nodes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param nodes: node values, in ascending order
+    :param values: values to locate
+    :return: indices of lower nodes of cells and relative positions in cells (values out of
+             node bounds are located in the first or last cell)
+    """
+    indices = np.searchsorted(nodes[1:-1], values, side="right")
+    return indices, (values - nodes[indices]) / (nodes[indices + 1] - nodes[indices])
+
+
+def _memory_map_npz_member(file_path: str, name: str) -> np.memmap:
+    """
+    :param file_path: path of a NPZ file
+    :param name: name of an array stored without compression in the NPZ file
+    :return: the array, as a read-only memory map
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        header_offset = archive.getinfo(name + ".npy").header_offset
+
+    with open(file_path, "rb") as file:
+        # The local header of the zip member has a fixed size of 30 bytes, followed by the
+        # member name and an extra field whose lengths are at its end.
+        file.seek(header_offset)
+        name_length, extra_length = struct.unpack("<HH", file.read(30)[26:])
+        file.seek(header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+
+    return np.memmap(
+        file_path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
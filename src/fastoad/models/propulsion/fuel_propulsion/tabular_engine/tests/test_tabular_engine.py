@@ -0,0 +1,224 @@
+"""
+Test module for tabular_engine.py
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import os.path as pth
+from shutil import rmtree
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from fastoad.constants import EngineSetting
+from fastoad.exceptions import FastUnknownEngineSettingError
+from fastoad.model_base import FlightPoint
+from fastoad.module_management.service_registry import RegisterPropulsion
+from ..exceptions import FastTabularEngineDeckError
+from ..openmdao import OMTabularEngineWrapper
+from ..tabular_engine import EngineDeck, TabularEngine
+from ...rubber_engine import RubberEngine
+
+RESULTS_FOLDER_PATH = pth.join(pth.dirname(__file__), "results")
+
+ENGINE_PARAMETERS = [5, 30, 1500, 100000, 0.95, 10000]
+
+ENGINE_SETTINGS = [EngineSetting.TAKEOFF, EngineSetting.CLIMB, EngineSetting.CRUISE]
+MACHS = np.linspace(0.0, 1.0, 11)
+ALTITUDES = np.linspace(0.0, 13000.0, 27)
+THRUST_RATES = np.linspace(0.0, 1.0, 11)
+
+
+@pytest.fixture(scope="module")
+def cleanup():
+    rmtree(RESULTS_FOLDER_PATH, ignore_errors=True)
+    os.makedirs(RESULTS_FOLDER_PATH)
+
+
+@pytest.fixture(scope="module")
+def deck_data() -> pd.DataFrame:
+    """Nodes of an engine deck, computed with RubberEngine, in order of table dimensions."""
+    grid = np.meshgrid(ENGINE_SETTINGS, MACHS, ALTITUDES, THRUST_RATES, indexing="ij")
+    data = pd.DataFrame(
+        {
+            "engine_setting": grid[0].ravel(),
+            "mach": grid[1].ravel(),
+            "altitude": grid[2].ravel(),
+            "thrust_is_regulated": False,
+            "thrust_rate": grid[3].ravel(),
+            "thrust": 0.0,
+        }
+    )
+    RubberEngine(*ENGINE_PARAMETERS).compute_flight_points(data)
+    # Thrust rates are recomputed by RubberEngine, with round-off errors
+    data["thrust_rate"] = grid[3].ravel()
+    return data[["engine_setting", "mach", "altitude", "thrust_rate", "thrust", "sfc"]]
+
+
+@pytest.fixture(scope="module")
+def deck(deck_data) -> EngineDeck:
+    shape = (len(ENGINE_SETTINGS), len(MACHS), len(ALTITUDES), len(THRUST_RATES))
+    return EngineDeck(
+        MACHS,
+        ALTITUDES,
+        THRUST_RATES,
+        deck_data.thrust.values.reshape(shape),
+        deck_data.sfc.values.reshape(shape),
+        ENGINE_SETTINGS,
+    )
+
+
+def test_deck_files(cleanup, deck, deck_data):
+    # NPZ files are memory-mapped
+    npz_file_path = pth.join(RESULTS_FOLDER_PATH, "deck.npz")
+    deck.save_npz(npz_file_path)
+    npz_deck = EngineDeck.load(npz_file_path)
+    assert isinstance(npz_deck.thrust, np.memmap)
+    assert isinstance(npz_deck.sfc, np.memmap)
+    assert_allclose(npz_deck.thrust, deck.thrust, rtol=0.0)
+    assert_allclose(npz_deck.sfc, deck.sfc, rtol=0.0)
+    assert_allclose(npz_deck.engine_settings, ENGINE_SETTINGS)
+
+    # ... unless they are compressed
+    compressed_file_path = pth.join(RESULTS_FOLDER_PATH, "compressed_deck.npz")
+    np.savez_compressed(
+        compressed_file_path,
+        mach=MACHS,
+        altitude=ALTITUDES,
+        thrust_rate=THRUST_RATES,
+        thrust=deck.thrust[0],
+        sfc=deck.sfc[0],
+    )
+    compressed_deck = EngineDeck.load(compressed_file_path)
+    assert not isinstance(compressed_deck.thrust, np.memmap)
+    assert compressed_deck.engine_settings is None
+    assert_allclose(compressed_deck.thrust, deck.thrust[0], rtol=0.0)
+
+    # CSV rows can be in any order, and engine settings can be given by name
+    csv_file_path = pth.join(RESULTS_FOLDER_PATH, "deck.csv")
+    csv_data = deck_data.sample(frac=1.0, random_state=0)
+    csv_data["engine_setting"] = [EngineSetting(value).name for value in csv_data.engine_setting]
+    csv_data.to_csv(csv_file_path, index=False)
+    csv_deck = EngineDeck.load(csv_file_path)
+    assert_allclose(csv_deck.thrust, deck.thrust, rtol=1e-15)
+    assert_allclose(csv_deck.sfc, deck.sfc, rtol=1e-15)
+    assert_allclose(csv_deck.altitudes, ALTITUDES)
+
+    # Decks are loaded once
+    assert EngineDeck.get(npz_file_path) is EngineDeck.get(npz_file_path)
+
+    # Errors
+    deck_data.iloc[1:].to_csv(csv_file_path, index=False)
+    with pytest.raises(FastTabularEngineDeckError):
+        EngineDeck.load(csv_file_path)
+    deck_data.drop(columns="sfc").to_csv(csv_file_path, index=False)
+    with pytest.raises(FastTabularEngineDeckError):
+        EngineDeck.load(csv_file_path)
+    with pytest.raises(FastTabularEngineDeckError):
+        EngineDeck.load(pth.join(RESULTS_FOLDER_PATH, "deck.xml"))
+    with pytest.raises(FastTabularEngineDeckError):
+        EngineDeck(MACHS[::-1], ALTITUDES, THRUST_RATES, deck.thrust[0], deck.sfc[0])
+    with pytest.raises(FastTabularEngineDeckError):
+        EngineDeck(MACHS, ALTITUDES, THRUST_RATES, deck.thrust, deck.sfc)
+
+
+def test_compute_flight_points(deck):
+    engine = RubberEngine(*ENGINE_PARAMETERS)
+    tabular_engine = TabularEngine(deck)
+
+    np.random.seed(42)
+    size = 1000
+    flight_points = pd.DataFrame(
+        {
+            "mach": np.random.uniform(0.1, 0.9, size),
+            "altitude": np.random.uniform(0.0, 12000.0, size),
+            "engine_setting": np.random.choice([EngineSetting.CLIMB, EngineSetting.CRUISE], size),
+            "thrust_is_regulated": np.random.choice([True, False], size),
+            "thrust_rate": np.random.uniform(0.3, 1.0, size),
+            "thrust": np.random.uniform(5000.0, 20000.0, size),
+        }
+    )
+    expected = flight_points.copy()
+    engine.compute_flight_points(expected)
+    tabular_engine.compute_flight_points(flight_points)
+    assert_allclose(flight_points.thrust, expected.thrust, rtol=1e-2)
+    assert_allclose(flight_points.thrust_rate, expected.thrust_rate, rtol=1e-2)
+    # SFC of RubberEngine varies sharply with altitude and low thrust rates
+    assert_allclose(flight_points.sfc, expected.sfc, rtol=1e-1)
+
+    # Regulated thrust and thrust rate are consistent
+    regulated_points = flight_points.copy()
+    regulated_points["thrust_is_regulated"] = True
+    regulated_points["thrust_rate"] = np.nan
+    tabular_engine.compute_flight_points(regulated_points)
+    assert_allclose(regulated_points.thrust_rate, flight_points.thrust_rate, rtol=1e-10)
+    assert_allclose(regulated_points.sfc, flight_points.sfc, rtol=1e-10)
+
+    # Single flight points give the same results as DataFrame rows
+    for i in range(5):
+        flight_point = FlightPoint(
+            mach=flight_points.mach[i],
+            altitude=flight_points.altitude[i],
+            engine_setting=flight_points.engine_setting[i],
+            thrust_is_regulated=flight_points.thrust_is_regulated[i],
+            thrust_rate=flight_points.thrust_rate[i],
+            thrust=flight_points.thrust[i],
+        )
+        tabular_engine.compute_flight_points(flight_point)
+        assert isinstance(flight_point.sfc, float)
+        assert_allclose(flight_point.sfc, flight_points.sfc[i], rtol=1e-12)
+        assert_allclose(flight_point.thrust, flight_points.thrust[i], rtol=1e-12)
+
+    # Thrust scale factor
+    scaled_points = regulated_points.copy()
+    scaled_points["thrust"] *= 2.0
+    TabularEngine(deck, 2.0).compute_flight_points(scaled_points)
+    assert_allclose(scaled_points.thrust_rate, regulated_points.thrust_rate, rtol=1e-10)
+    assert_allclose(scaled_points.sfc, regulated_points.sfc, rtol=1e-10)
+
+    # Errors
+    with pytest.raises(FastUnknownEngineSettingError):
+        tabular_engine.compute_flight_points(
+            FlightPoint(mach=0.5, altitude=0.0, engine_setting=EngineSetting.IDLE, thrust_rate=0.5)
+        )
+    with pytest.raises(FastTabularEngineDeckError):
+        tabular_engine.compute_flight_points(
+            FlightPoint(mach=0.5, altitude=0.0, engine_setting=EngineSetting.CLIMB)
+        )
+
+
+def test_wrapper(cleanup, deck):
+    deck_file_path = pth.join(RESULTS_FOLDER_PATH, "wrapper_deck.npz")
+    deck.save_npz(deck_file_path)
+    inputs = {"data:propulsion:tabular_engine:thrust_scale_factor": 2.0}
+
+    wrapper = OMTabularEngineWrapper()
+    with pytest.raises(FastTabularEngineDeckError):
+        wrapper.get_model(inputs)
+    wrapper.deck_file = deck_file_path
+    engine = wrapper.get_model(inputs)
+    assert isinstance(engine, TabularEngine)
+    assert engine.thrust_scale_factor == 2.0
+
+    # Classes of registered wrappers are loaded separately by the bundle loader, so they are
+    # checked by name.
+    wrapper = RegisterPropulsion.get_provider(
+        "fastoad.wrapper.propulsion.tabular_engine", {"deck_file": deck_file_path}
+    )
+    engine = wrapper.get_model(inputs)
+    assert type(engine).__name__ == "TabularEngine"
+    assert engine.thrust_scale_factor == 2.0
+    assert_allclose(engine.deck.thrust, deck.thrust, rtol=0.0)
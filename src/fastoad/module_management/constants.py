@@ -23,6 +23,9 @@ OPTION_PROPERTY_NAME = "OPTIONS"
 DESCRIPTION_PROPERTY_NAME = "DESCRIPTION"
 DOMAIN_PROPERTY_NAME = "DOMAIN"
 
+# Option that is accepted by any system obtained through RegisterOpenMDAOSystem
+FD_PROCESS_COUNT_OPTION = "fd_process_count"
+
 
 # Definition of model domains
 class ModelDomain(Enum):
@@ -13,27 +13,34 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+from collections import OrderedDict
 from types import MethodType
-from typing import Any, List, Type, TypeVar, Union
+from typing import Any, Callable, Hashable, List, Type, TypeVar, Union
 
+import numpy as np
 from openmdao.core.system import System
 
 from ._bundle_loader import BundleLoader
 from .constants import (
     DESCRIPTION_PROPERTY_NAME,
     DOMAIN_PROPERTY_NAME,
+    FD_PROCESS_COUNT_OPTION,
     ModelDomain,
     OPTION_PROPERTY_NAME,
     SERVICE_OPENMDAO_SYSTEM,
     SERVICE_PROPULSION_WRAPPER,
 )
 from .exceptions import FastBadSystemOptionError, FastIncompatibleServiceClassError
-from ..model_base.propulsion import IOMPropulsionWrapper
+from ..model_base.propulsion import IOMPropulsionWrapper, IPropulsion
+from ..openmdao.parallel_fd import use_parallel_fd
 from ..openmdao.variables import Variable
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
 T = TypeVar("T")
 
+#: Default maximum number of models kept in :attr:`RegisterPropulsion.model_cache`.
+DEFAULT_PROPULSION_MODEL_CACHE_SIZE = 16
+
 
 class RegisterService:
     """
@@ -196,6 +203,67 @@ class _RegisterOpenMDAOService(RegisterService):
         return super().__call__(service_class)
 
 
+class PropulsionModelCache:
+    """
+    Cache of propulsion models, as provided by
+    :meth:`~fastoad.model_base.propulsion.IOMPropulsionWrapper.get_model`.
+
+    Keys are computed by the caller from the values that define the model. Reusing a model
+    also reuses any data that the model has precomputed, like engine decks.
+
+    When the cache is full, the least recently used model is removed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_PROPULSION_MODEL_CACHE_SIZE):
+        """
+        :param max_size: maximum number of models kept in cache
+        """
+        #: Maximum number of models kept in cache.
+        self.max_size = max_size
+
+        #: Number of calls to :meth:`get` that returned an existing model.
+        self.hits = 0
+
+        #: Number of calls to :meth:`get` that needed to build a new model.
+        self.misses = 0
+
+        self._models = OrderedDict()
+
+    def __len__(self):
+        return len(self._models)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of :attr:`hits` among all calls to :meth:`get` (0. if no call yet)."""
+        call_count = self.hits + self.misses
+        return self.hits / call_count if call_count else 0.0
+
+    def get(self, key: Hashable, build_model: Callable[[], IPropulsion]) -> IPropulsion:
+        """
+        :param key: identifies the model
+        :param build_model: builds the model if it is not in cache
+        :return: the model for provided key, from cache if possible
+        """
+        model = self._models.get(key)
+        if model is not None:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return model
+
+        self.misses += 1
+        model = build_model()
+        self._models[key] = model
+        if len(self._models) > self.max_size:
+            self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        """Removes all models from cache and resets counters."""
+        self._models.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class RegisterPropulsion(
     _RegisterOpenMDAOService,
     base_class=IOMPropulsionWrapper,
@@ -204,8 +272,32 @@ class RegisterPropulsion(
 ):
     """
     Decorator class for registering an OpenMDAO wrapper of a propulsion-dedicated model.
+
+    Wrappers provided by :meth:`get_provider` reuse the models they have already built
+    (see :attr:`model_cache`), as long as the OpenMDAO inputs they have declared in their
+    :meth:`~fastoad.model_base.propulsion.IOMPropulsionWrapper.setup` have bit-identical
+    values.
     """
 
+    #: Cache of models built by wrappers provided by :meth:`get_provider`. Its
+    #: :attr:`~PropulsionModelCache.hits` and :attr:`~PropulsionModelCache.misses` give hit
+    #: statistics.
+    model_cache = PropulsionModelCache()
+
+    @classmethod
+    def get_provider(cls, service_provider_id: str, options: dict = None) -> IOMPropulsionWrapper:
+        """
+        Instantiates the desired propulsion wrapper.
+
+        Its models are cached in :attr:`model_cache`.
+
+        :param service_provider_id: identifier of a registered propulsion wrapper
+        :param options: options that should be associated to the created instance
+        :return: the created instance
+        """
+        wrapper = super().get_provider(service_provider_id, options)
+        return _model_cache_decorator(wrapper, service_provider_id, cls.model_cache)
+
 
 class RegisterOpenMDAOSystem(
     _RegisterOpenMDAOService, base_class=System, service_id=SERVICE_OPENMDAO_SYSTEM
@@ -215,6 +307,13 @@ class RegisterOpenMDAOSystem(
 
     If a variable_descriptions.txt file is in the same folder as the class module, its
     content is loaded (once, even if several classes are registered at the same level).
+
+    Besides the OpenMDAO options of the registered class, any system accepts the option
+    `fd_process_count`. If provided, finite difference approximations of the system and of
+    its subsystems are computed in parallel, using at most this number of processes (see
+    :class:`~fastoad.openmdao.parallel_fd.ParallelFiniteDifference`). It has no effect on
+    partials that are not declared with `method="fd"` (e.g. the mission model needs its
+    `approximate_partials` option to be activated).
     """
 
     @classmethod
@@ -248,10 +347,17 @@ class RegisterOpenMDAOSystem(
         # check that options are valid to avoid failure at setup()
         options = getattr(system, "_" + OPTION_PROPERTY_NAME, None)
         if options:
-            invalid_options = [name for name in options if name not in system.options]
+            invalid_options = [
+                name
+                for name in options
+                if name not in system.options and name != FD_PROCESS_COUNT_OPTION
+            ]
             if invalid_options:
                 raise FastBadSystemOptionError(identifier, invalid_options)
 
+            if FD_PROCESS_COUNT_OPTION in options:
+                use_parallel_fd(system, options[FD_PROCESS_COUNT_OPTION])
+
         decorated_system = _option_decorator(system)
         return decorated_system
 
@@ -293,7 +399,8 @@ def _option_decorator(instance: System) -> System:
         option_dict = getattr(self, "_" + OPTION_PROPERTY_NAME, None)
         if option_dict:
             for name, value in option_dict.items():
-                self.options[name] = value
+                if name != FD_PROCESS_COUNT_OPTION:
+                    self.options[name] = value
 
         # Call the original setup method
         self.__setup_before_option_decorator()
@@ -306,3 +413,67 @@ def _option_decorator(instance: System) -> System:
     setattr(instance, "setup", setup_method)
 
     return instance
+
+
+def _model_cache_decorator(
+    instance: IOMPropulsionWrapper, provider_id: str, cache: PropulsionModelCache
+) -> IOMPropulsionWrapper:
+    """
+    Decorates provided propulsion wrapper so that its models are taken from provided cache.
+
+    Models are identified by the provider identifier, the provider options, the public
+    non-callable attributes of the instance and the values of the inputs the wrapper has
+    added in its `setup()`.
+
+    :param instance: the instance to decorate
+    :param provider_id: identifier of the registered wrapper
+    :param cache: the cache of models
+    :return: the decorated instance
+    """
+
+    # As in _option_decorator(), original methods are kept as attributes of the instance and
+    # called from the new methods.
+
+    def setup(self, component):
+        """ Will replace the original setup() method"""
+        input_names = []
+        add_input = component.add_input
+
+        def recording_add_input(name, *args, **kwargs):
+            input_names.append(name)
+            return add_input(name, *args, **kwargs)
+
+        component.add_input = recording_add_input
+        try:
+            self.__setup_before_model_cache(component)
+        finally:
+            del component.add_input
+        self.__model_input_names = input_names
+
+    def get_model(self, inputs) -> IPropulsion:
+        """ Will replace the original get_model() method"""
+        input_names = self.__model_input_names
+        if input_names is None:
+            # setup() has not been run, so defining inputs are unknown
+            return self.__get_model_before_model_cache(inputs)
+
+        # Shapes of inputs are set at setup, so concatenated contents identify values.
+        key = (
+            provider_id,
+            repr(getattr(self, "_" + OPTION_PROPERTY_NAME, None)),
+            tuple(
+                (name, repr(value))
+                for name, value in sorted(vars(self).items())
+                if not name.startswith("_") and not callable(value)
+            ),
+            b"".join([np.asarray(inputs[name]).tobytes() for name in input_names]),
+        )
+        return cache.get(key, lambda: self.__get_model_before_model_cache(inputs))
+
+    setattr(instance, "__setup_before_model_cache", instance.setup)
+    setattr(instance, "__get_model_before_model_cache", instance.get_model)
+    setattr(instance, "__model_input_names", None)
+    instance.setup = MethodType(setup, instance)
+    instance.get_model = MethodType(get_model, instance)
+
+    return instance
@@ -29,6 +29,7 @@ from ..exceptions import (
     FastBundleLoaderUnknownFactoryNameError,
 )
 from ..service_registry import RegisterOpenMDAOSystem
+from ...openmdao.parallel_fd import ParallelFiniteDifference
 from ...openmdao.variables import Variable
 
 _LOGGER = logging.getLogger(__name__)  # Logger for this module
@@ -111,6 +112,15 @@ def test_get_system(load):
     disc2_component.compute({"z": [10.0, 10.0], "y1": 4.0}, outputs)
     assert outputs["y2"] == 22.0
 
+    # Option for parallel finite differences is accepted by any system
+    disc2_component = RegisterOpenMDAOSystem.get_system(
+        "module_management_test.sellar.disc2", options={"answer": -1, "fd_process_count": 2}
+    )
+    assert isinstance(disc2_component._approx_schemes["fd"], ParallelFiniteDifference)
+    assert disc2_component._approx_schemes["fd"].process_count == 2
+    disc2_component.setup()
+    assert disc2_component.options["answer"] == -1
+
     # Get component 2 bis #####################################################
     # Tests the transmission of options at registration
     with pytest.raises(FastBadSystemOptionError):
@@ -13,13 +13,18 @@
 
 import os.path as pth
 
+import openmdao.api as om
 import pytest
 
 from fastoad.module_management.exceptions import (
     FastBundleLoaderUnknownFactoryNameError,
     FastIncompatibleServiceClassError,
 )
-from fastoad.module_management.service_registry import RegisterService
+from fastoad.module_management.service_registry import (
+    PropulsionModelCache,
+    RegisterPropulsion,
+    RegisterService,
+)
 
 DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
 
@@ -81,3 +86,75 @@ def test_get_provider(load):
 
     my_dummy2: DummyBase = RegisterDummyServiceA.get_provider("dummy.provider.2")
     assert my_dummy2.my_class() == "Dummy2"
+
+
+def test_propulsion_model_cache():
+    class EngineUser(om.ExplicitComponent):
+        def initialize(self):
+            self.options.declare("propulsion_id", types=str)
+            self.models = []
+
+        def setup(self):
+            self.wrapper = RegisterPropulsion.get_provider(self.options["propulsion_id"])
+            self.wrapper.setup(self)
+            self.add_output("dummy")
+
+        def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+            self.models.append(self.wrapper.get_model(inputs))
+
+    RegisterPropulsion.model_cache.clear()
+
+    problem = om.Problem()
+    ivc = problem.model.add_subsystem("ivc", om.IndepVarComp(), promotes=["*"])
+    ivc.add_output("data:propulsion:rubber_engine:bypass_ratio", 5.0)
+    ivc.add_output("data:propulsion:rubber_engine:overall_pressure_ratio", 30.0)
+    ivc.add_output("data:propulsion:rubber_engine:turbine_inlet_temperature", 1500.0, units="K")
+    ivc.add_output("data:propulsion:MTO_thrust", 100000.0, units="N")
+    ivc.add_output("data:propulsion:rubber_engine:maximum_mach", 0.95)
+    ivc.add_output("data:propulsion:rubber_engine:design_altitude", 10000.0, units="m")
+    for name, propulsion_id in [
+        ("user_1", "fastoad.wrapper.propulsion.rubber_engine"),
+        ("user_2", "fastoad.wrapper.propulsion.rubber_engine"),
+        ("user_3", "fastoad.wrapper.propulsion.tabulated_rubber_engine"),
+    ]:
+        problem.model.add_subsystem(
+            name, EngineUser(propulsion_id=propulsion_id), promotes_inputs=["*"]
+        )
+    problem.setup()
+
+    problem.run_model()
+    problem.run_model()
+    user_1, user_2, user_3 = [problem.model.user_1, problem.model.user_2, problem.model.user_3]
+
+    # The model is shared between wrappers of same identifier, and reused as long as inputs
+    # are the same.
+    assert user_1.models[0] is user_1.models[1] is user_2.models[0] is user_2.models[1]
+    assert user_3.models[0] is user_3.models[1]
+    assert user_3.models[0] is not user_1.models[0]
+    assert RegisterPropulsion.model_cache.misses == 2
+    assert RegisterPropulsion.model_cache.hits == 4
+
+    # Changing attributes of wrapper gives another model
+    user_1.wrapper.use_engine_deck = True
+    problem.run_model()
+    assert user_1.models[2] is not user_1.models[1]
+    assert user_2.models[2] is user_2.models[1]
+
+    # Changing an input gives another model
+    problem["data:propulsion:rubber_engine:bypass_ratio"] = 5.0 + 1.0e-15
+    problem.run_model()
+    assert user_2.models[3] is not user_2.models[2]
+    assert user_2.models[3].bypass_ratio == 5.0 + 1.0e-15
+
+    # Cache size is limited
+    cache = PropulsionModelCache(max_size=2)
+    for i in range(3):
+        cache.get(i, lambda: object())
+    assert len(cache) == 2
+    assert cache.misses == 3
+    assert cache.hit_rate == 0.0
+    cache.get(2, lambda: object())
+    assert cache.hit_rate == 0.25
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == 0
@@ -0,0 +1,247 @@
+"""
+Finite difference approximation of partial derivatives using a pool of processes.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import inspect
+import logging
+import multiprocessing
+import os
+from types import MethodType
+from typing import List, Optional
+
+import numpy as np
+from openmdao import __version__ as om_version
+from openmdao.approximation_schemes.finite_difference import FiniteDifference
+from openmdao.core.component import Component
+from openmdao.core.system import System
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+# State of the approximation that is shared with forked processes.
+_FORKED_STATE = None
+
+# Private methods of FiniteDifference that are overridden, with their expected parameters.
+# The method that computes all points of an approximation depends on the OpenMDAO version.
+_RUN_POINT_PARAMETERS = ["self", "system", "idx_info", "data", "results_array", "total"]
+_COMPUTATION_HOOKS = {
+    "_compute_approximations": ["self", "system", "jac", "total", "under_cs"],  # < 3.9
+    "_compute_approx_col_iter": ["self", "system", "total", "under_cs"],  # >= 3.9
+}
+
+
+def _get_parameter_names(method_name: str) -> Optional[List[str]]:
+    method = getattr(FiniteDifference, method_name, None)
+    if method is None:
+        return None
+    return list(inspect.signature(method).parameters)
+
+
+#: True if the installed OpenMDAO version allows to compute finite difference points in
+#: parallel. If False, :class:`ParallelFiniteDifference` computes points serially.
+PARALLEL_FD_SUPPORTED = _get_parameter_names("_run_point") == _RUN_POINT_PARAMETERS and any(
+    _get_parameter_names(name) == parameters for name, parameters in _COMPUTATION_HOOKS.items()
+)
+
+
+class ParallelFiniteDifference(FiniteDifference):
+    """
+    Finite difference approximation where perturbed points are computed in a pool of
+    processes.
+
+    Processes are forked from the current one for each evaluation of the Jacobian, so each of
+    them starts with the current state of the system. Points are computed serially if
+    forking processes is not available on current platform, if :attr:`process_count`
+    is 1, or if the installed OpenMDAO version is not supported (see
+    :data:`PARALLEL_FD_SUPPORTED`).
+    """
+
+    def __init__(self, process_count: Optional[int] = None):
+        """
+        :param process_count: maximum number of processes. If None, the number of CPUs is used.
+        """
+        super().__init__()
+
+        #: Maximum number of processes for computing perturbed points.
+        self.process_count = process_count if process_count else os.cpu_count()
+
+        self._recorded_points = None
+        self._point_results = None
+
+    def _is_parallel(self) -> bool:
+        return (
+            PARALLEL_FD_SUPPORTED
+            and self.process_count > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+        )
+
+    def _compute_approximations(self, system, jac, total, under_cs):
+        # Used with OpenMDAO < 3.9
+        if not self._is_parallel():
+            super()._compute_approximations(system, jac, total, under_cs)
+            return
+
+        # A first pass records the points to compute, without running the system.
+        self._recorded_points = []
+        try:
+            super()._compute_approximations(system, jac, total, under_cs)
+            points = self._recorded_points
+        finally:
+            self._recorded_points = None
+
+        results = self._compute_points(system, points)
+
+        # A second pass fills the Jacobian with computed results.
+        self._point_results = iter(results)
+        try:
+            super()._compute_approximations(system, jac, total, under_cs)
+        finally:
+            self._point_results = None
+
+    def _compute_approx_col_iter(self, system, total, under_cs):
+        # Used with OpenMDAO >= 3.9, where Jacobian columns are generated
+        if not self._is_parallel():
+            yield from super()._compute_approx_col_iter(system, total, under_cs)
+            return
+
+        # A first pass records the points to compute, without running the system.
+        self._recorded_points = []
+        try:
+            for _ in super()._compute_approx_col_iter(system, total, under_cs):
+                pass
+            points = self._recorded_points
+        finally:
+            self._recorded_points = None
+
+        results = self._compute_points(system, points)
+
+        # A second pass generates the columns with computed results.
+        self._point_results = iter(results)
+        try:
+            yield from super()._compute_approx_col_iter(system, total, under_cs)
+        finally:
+            self._point_results = None
+
+    def _run_point(self, system, idx_info, data, results_array, total):
+        if self._recorded_points is not None:
+            self._recorded_points.append((idx_info, data, results_array.shape, total))
+            return np.zeros_like(results_array)
+        if self._point_results is not None:
+            return next(self._point_results)
+        return super()._run_point(system, idx_info, data, results_array, total)
+
+    def _compute_points(self, system: System, points: list) -> List[np.ndarray]:
+        """
+        Runs the system for each point, in forked processes.
+
+        :param system: the system having its derivatives approximated
+        :param points: arguments of :meth:`_run_point` for each point
+        :return: the results for each point
+        """
+        global _FORKED_STATE  # pylint: disable=global-statement
+
+        process_count = min(self.process_count, len(points))
+        if process_count <= 1:
+            return [_run_forked_point(i, (self, system, points)) for i in range(len(points))]
+
+        _LOGGER.debug(
+            'Computing %i finite difference points of "%s" with %i processes.',
+            len(points),
+            system.pathname,
+            process_count,
+        )
+        _FORKED_STATE = (self, system, points)
+        try:
+            with multiprocessing.get_context("fork").Pool(process_count) as pool:
+                return pool.map(_run_forked_point, range(len(points)))
+        finally:
+            _FORKED_STATE = None
+
+
+def _run_forked_point(index: int, state: tuple = None) -> np.ndarray:
+    """
+    Computes one perturbed point.
+
+    :param index: index of the point
+    :param state: the approximation scheme, the system and the point list. In forked
+                  processes, it is taken from the state of the parent process.
+    :return: result of the point
+    """
+    scheme, system, points = state if state is not None else _FORKED_STATE
+    idx_info, data, shape, total = points[index]
+    return FiniteDifference._run_point(
+        scheme, system, idx_info, data, np.zeros(shape), total
+    ).copy()
+
+
+def use_parallel_fd(system: System, process_count: Optional[int] = None):
+    """
+    Makes finite difference approximations of provided system and of its subsystems use
+    :class:`ParallelFiniteDifference`.
+
+    It should be called before setup of the system. For a group, subsystems are processed
+    at the end of the group setup.
+
+    A warning is issued if the installed OpenMDAO version does not allow parallel
+    computation of points (see :data:`PARALLEL_FD_SUPPORTED`).
+
+    :param system: the OpenMDAO system
+    :param process_count: maximum number of processes. If None, the number of CPUs is used.
+    """
+    if not PARALLEL_FD_SUPPORTED and process_count != 1:
+        _LOGGER.warning(
+            'Parallel finite differences of "%s" are not supported with OpenMDAO %s. Points '
+            "will be computed serially.",
+            system.name or type(system).__name__,
+            om_version,
+        )
+    _set_parallel_fd(system, process_count)
+
+
+def _set_parallel_fd(system: System, process_count: Optional[int]):
+    is_processed = hasattr(system, "_fd_process_count")
+    system._fd_process_count = process_count
+
+    if isinstance(system, Component):
+        system._approx_schemes["fd"] = ParallelFiniteDifference(process_count)
+        return
+
+    if is_processed:
+        return
+
+    def setup(self):
+        """ Will replace the original setup() method"""
+        self.__setup_before_parallel_fd()
+
+        # approx_totals() may have created a default scheme
+        if "fd" in self._approx_schemes:
+            self._approx_schemes["fd"] = ParallelFiniteDifference(self._fd_process_count)
+        for subsystem in _get_subsystems(self):
+            _set_parallel_fd(subsystem, self._fd_process_count)
+
+    setattr(system, "__setup_before_parallel_fd", system.setup)
+    system.setup = MethodType(setup, system)
+
+
+def _get_subsystems(group) -> List[System]:
+    """
+    :return: subsystems that have been added to provided group, including during its setup
+    """
+    subsystems = []
+    for attribute_name in ["_static_subsystems_allprocs", "_subsystems_allprocs"]:
+        infos = getattr(group, attribute_name, {})
+        if isinstance(infos, dict):
+            infos = infos.values()
+        subsystems += [getattr(info, "system", info) for info in infos]
+    return subsystems
@@ -14,6 +14,7 @@
 import openmdao.api as om
 
 from fastoad.io import VariableIO
+from fastoad.openmdao.result_cache import ResultCache
 from fastoad.openmdao.validity_checker import ValidityDomainChecker
 from fastoad.openmdao.variables import VariableList
 
@@ -26,6 +27,9 @@ class FASTOADProblem(om.Problem):
     It also runs :class:`~fastoad.openmdao.validity_checker.ValidityDomainChecker`
     after each :meth:`run_model` or :meth:`run_driver`
     (but it does nothing if no check has been registered).
+
+    Hit statistics of result caches of systems (see
+    :class:`~fastoad.openmdao.result_cache.ResultCache`) are logged at the same time.
     """
 
     def __init__(self, *args, **kwargs):
@@ -40,11 +44,13 @@ class FASTOADProblem(om.Problem):
     def run_model(self, case_prefix=None, reset_iter_counts=True):
         status = super().run_model(case_prefix, reset_iter_counts)
         ValidityDomainChecker.check_problem_variables(self)
+        ResultCache.log_statistics(self)
         return status
 
     def run_driver(self, case_prefix=None, reset_iter_counts=True):
         status = super().run_driver(case_prefix, reset_iter_counts)
         ValidityDomainChecker.check_problem_variables(self)
+        ResultCache.log_statistics(self)
         return status
 
     def write_outputs(self):
@@ -0,0 +1,208 @@
+"""
+Cache of computation results of OpenMDAO systems.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import logging
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+import numpy as np
+import openmdao.api as om
+import pandas as pd
+
+_LOGGER = logging.getLogger(__name__)  # Logger for this module
+
+#: Default maximum number of results kept in a :class:`ResultCache`.
+DEFAULT_RESULT_CACHE_SIZE = 16
+
+#: Default maximum memory used by results kept in a :class:`ResultCache`, in bytes.
+DEFAULT_RESULT_CACHE_MEMORY = 100 * 2 ** 20
+
+
+class ResultCache:
+    """
+    Cache of results of an OpenMDAO system, where keys are computed from input values.
+
+    A result is made of output values and of an optional object (e.g. a pandas DataFrame
+    with detailed results). When the cache exceeds :attr:`max_size` results or
+    :attr:`max_memory` bytes, the least recently used results are removed.
+
+    A system that uses such cache should provide it as `result_cache` attribute, so that
+    statistics are logged by :meth:`log_statistics` at the end of a problem run.
+
+    Usage in the compute() method of an OpenMDAO component:
+
+    .. code-block::
+
+        >>> key = self.result_cache.get_key(inputs)
+        >>> result = self.result_cache.get(key)
+        >>> if result is None:
+        >>>     ... # usual computation
+        >>>     self.result_cache.add(key, outputs, data)
+        >>> else:
+        >>>     data = self.result_cache.restore(result, outputs)
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_RESULT_CACHE_SIZE,
+        max_memory: float = DEFAULT_RESULT_CACHE_MEMORY,
+    ):
+        """
+        :param max_size: maximum number of results kept in cache
+        :param max_memory: maximum memory used by results kept in cache, in bytes
+        """
+        #: Maximum number of results kept in cache.
+        self.max_size = max_size
+
+        #: Maximum memory used by results kept in cache, in bytes.
+        self.max_memory = max_memory
+
+        #: Number of calls to :meth:`get` that returned a result.
+        self.hits = 0
+
+        #: Number of calls to :meth:`get` that did not find a result.
+        self.misses = 0
+
+        self._results = OrderedDict()
+        self._memory = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of :attr:`hits` among all calls to :meth:`get` (0. if no call yet)."""
+        call_count = self.hits + self.misses
+        return self.hits / call_count if call_count else 0.0
+
+    @property
+    def memory(self) -> int:
+        """Estimated memory used by results kept in cache, in bytes."""
+        return self._memory
+
+    @staticmethod
+    def get_key(inputs: Mapping, discrete_inputs: Optional[Mapping] = None) -> Hashable:
+        """
+        :param inputs: input values (e.g. the inputs vector of an OpenMDAO component)
+        :param discrete_inputs: discrete input values, that should be representable as strings
+        :return: a key that depends only on names and values of provided inputs
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for name in inputs.keys():
+            value = np.ascontiguousarray(inputs[name], dtype=float)
+            digest.update(name.encode())
+            digest.update(str(value.shape).encode())
+            digest.update(value.tobytes())
+        if discrete_inputs:
+            for name in discrete_inputs.keys():
+                digest.update(name.encode())
+                digest.update(repr(discrete_inputs[name]).encode())
+        return digest.digest()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Dict[str, np.ndarray], Any]]:
+        """
+        :param key: a key obtained with :meth:`get_key`
+        :return: output values and associated data, or None if key is not in cache
+        """
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._results.move_to_end(key)
+        output_values, data, _ = result
+        return output_values, data
+
+    def add(self, key: Hashable, outputs: Mapping, data: Any = None):
+        """
+        Stores a copy of output values, along with provided data.
+
+        Data object is stored as is, so it should not be modified afterwards.
+
+        :param key: a key obtained with :meth:`get_key`
+        :param outputs: output values (e.g. the outputs vector of an OpenMDAO component)
+        :param data: any object that should be provided with output values
+        """
+        output_values = {name: np.array(outputs[name]) for name in outputs.keys()}
+        size = sum(value.nbytes for value in output_values.values()) + self._get_size(data)
+        if size > self.max_memory or self.max_size <= 0:
+            return
+
+        if key in self._results:
+            self._remove(key)
+        self._results[key] = (output_values, data, size)
+        self._memory += size
+
+        while len(self._results) > self.max_size or self._memory > self.max_memory:
+            self._remove(next(iter(self._results)))
+
+    @staticmethod
+    def restore(result: Tuple[Dict[str, np.ndarray], Any], outputs) -> Any:
+        """
+        Writes output values of provided result in outputs.
+
+        :param result: a result obtained with :meth:`get`
+        :param outputs: output vector (or any mutable mapping) to be filled
+        :return: the data associated to result
+        """
+        output_values, data = result
+        for name, value in output_values.items():
+            outputs[name] = value
+        return data
+
+    def clear(self):
+        """Removes all results from cache and resets counters."""
+        self._results.clear()
+        self._memory = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def log_statistics(problem: om.Problem):
+        """
+        Logs hit statistics of result caches of all systems of provided problem.
+
+        Result caches are the ones provided as `result_cache` attribute of systems.
+
+        :param problem: the OpenMDAO problem
+        """
+        for system in problem.model.system_iter(include_self=True, recurse=True):
+            cache = getattr(system, "result_cache", None)
+            if isinstance(cache, ResultCache) and cache.hits + cache.misses > 0:
+                _LOGGER.info(
+                    'Result cache of "%s": %i hits, %i misses (hit rate: %.1f%%).',
+                    system.pathname,
+                    cache.hits,
+                    cache.misses,
+                    100.0 * cache.hit_rate,
+                )
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._results.pop(key)
+        self._memory -= size
+
+    @staticmethod
+    def _get_size(data: Any) -> int:
+        if data is None:
+            return 0
+        if isinstance(data, pd.DataFrame):
+            return int(data.memory_usage(deep=True).sum())
+        if isinstance(data, np.ndarray):
+            return data.nbytes
+        return sys.getsizeof(data)
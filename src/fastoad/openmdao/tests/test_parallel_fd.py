@@ -0,0 +1,93 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+import openmdao.api as om
+import pytest
+from numpy.testing import assert_allclose
+
+from fastoad.openmdao import parallel_fd
+from fastoad.openmdao.parallel_fd import (
+    PARALLEL_FD_SUPPORTED,
+    ParallelFiniteDifference,
+    use_parallel_fd,
+)
+from .openmdao_sellar_example.sellar import Sellar
+
+
+def _compute_totals(process_count=None):
+    problem = om.Problem()
+    sellar = problem.model.add_subsystem("sellar", Sellar(), promotes=["*"])
+    if process_count:
+        use_parallel_fd(sellar, process_count)
+    problem.model.linear_solver = om.DirectSolver()
+    problem.setup()
+    problem.run_model()
+    totals = problem.compute_totals(["f", "g1", "g2"], ["x", "z"])
+    return problem, totals
+
+
+def _count_computed_points(monkeypatch) -> list:
+    """:return: a list that will get the number of points of each parallel computation"""
+    point_counts = []
+    compute_points = ParallelFiniteDifference._compute_points
+
+    def _compute_points(self, system, points):
+        point_counts.append(len(points))
+        return compute_points(self, system, points)
+
+    monkeypatch.setattr(ParallelFiniteDifference, "_compute_points", _compute_points)
+    return point_counts
+
+
+@pytest.mark.skipif(
+    not PARALLEL_FD_SUPPORTED, reason="Parallel FD not supported by installed OpenMDAO"
+)
+def test_parallel_fd(monkeypatch):
+    _, reference_totals = _compute_totals()
+
+    for process_count in [1, 3]:
+        point_counts = _count_computed_points(monkeypatch)
+        problem, totals = _compute_totals(process_count)
+        assert bool(point_counts) == (process_count > 1)
+
+        # Parallel scheme has been used in subsystems that have been added during group setup.
+        for component in problem.model.system_iter(recurse=True, typ=om.ExplicitComponent):
+            scheme = component._approx_schemes["fd"]
+            assert isinstance(scheme, ParallelFiniteDifference)
+            assert scheme.process_count == process_count
+
+        # Results are the same as with serial finite differences.
+        assert totals.keys() == reference_totals.keys()
+        for key, value in totals.items():
+            assert_allclose(value, reference_totals[key], rtol=1e-12)
+
+        # Problem is still usable after forking
+        problem["x"] = 3.0
+        problem.run_model()
+        assert problem["f"] != reference_totals[("f", "x")]
+
+
+def test_parallel_fd_not_supported(monkeypatch, caplog):
+    monkeypatch.setattr(parallel_fd, "PARALLEL_FD_SUPPORTED", False)
+    point_counts = _count_computed_points(monkeypatch)
+    _, reference_totals = _compute_totals()
+
+    # Points are computed serially, with a warning
+    with caplog.at_level(logging.WARNING, logger=parallel_fd.__name__):
+        _, totals = _compute_totals(3)
+    assert "not supported" in caplog.text
+    assert not point_counts
+    for key, value in totals.items():
+        assert_allclose(value, reference_totals[key], rtol=1e-12)
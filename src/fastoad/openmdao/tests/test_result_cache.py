@@ -0,0 +1,112 @@
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+import numpy as np
+import openmdao.api as om
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from fastoad.openmdao.problem import FASTOADProblem
+from fastoad.openmdao.result_cache import ResultCache
+
+
+class CachedParaboloid(om.ExplicitComponent):
+    """Computes f = (x - 3)**2, with results in cache."""
+
+    def initialize(self):
+        self.compute_count = 0
+        self.result_cache = ResultCache()
+
+    def setup(self):
+        self.add_input("x", 0.0)
+        self.add_output("f")
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        key = self.result_cache.get_key(inputs)
+        result = self.result_cache.get(key)
+        if result is None:
+            self.compute_count += 1
+            outputs["f"] = (inputs["x"] - 3.0) ** 2
+            self.result_cache.add(key, outputs)
+        else:
+            self.result_cache.restore(result, outputs)
+
+
+def test_result_cache():
+    cache = ResultCache(max_size=2)
+
+    key1 = cache.get_key({"a": np.array([1.0]), "b": np.array([2.0, 3.0])})
+    assert cache.get_key({"a": [1.0], "b": (2.0, 3.0)}) == key1
+    assert cache.get_key({"a": [1.0], "b": [2.0, 3.01]}) != key1
+    assert cache.get_key({"a": [1.0], "c": [2.0, 3.0]}) != key1
+    assert cache.get_key({"a": [1.0], "b": [2.0, 3.0]}, {"d": "foo"}) != key1
+
+    assert cache.get(key1) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    outputs = {"y": np.array([5.0])}
+    data = pd.DataFrame({"z": [1.0, 2.0]})
+    cache.add(key1, outputs, data)
+
+    # Output values are copied
+    outputs["y"][0] = 0.0
+    restored_outputs = {}
+    assert cache.restore(cache.get(key1), restored_outputs) is data
+    assert_allclose(restored_outputs["y"], 5.0)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+    # Least recently used result is removed when cache is full
+    cache.add(b"key2", outputs)
+    cache.get(key1)
+    cache.add(b"key3", outputs)
+    assert len(cache) == 2
+    assert cache.get(b"key2") is None
+    assert cache.get(key1) is not None
+
+    # Memory cap
+    memory = cache.memory
+    assert memory > 0
+    cache.max_memory = memory
+    cache.add(b"key4", outputs)
+    assert len(cache) == 2
+    assert cache.get(b"key3") is None
+    assert cache.memory <= memory
+    cache.add(b"key5", {"y": np.zeros(int(memory))})
+    assert cache.get(b"key5") is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.memory == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_result_cache_statistics(caplog):
+    problem = FASTOADProblem()
+    problem.model.add_subsystem("paraboloid", CachedParaboloid(), promotes=["*"])
+    problem.setup()
+
+    with caplog.at_level(logging.INFO, logger="fastoad.openmdao.result_cache"):
+        problem["x"] = 1.0
+        problem.run_model()
+        problem.run_model()
+        problem["x"] = 2.0
+        problem.run_model()
+        problem["x"] = 1.0
+        problem.run_model()
+
+    assert_allclose(problem["f"], 4.0)
+    assert problem.model.paraboloid.compute_count == 2
+    assert 'Result cache of "paraboloid": 2 hits, 2 misses (hit rate: 50.0%).' in caplog.messages
@@ -0,0 +1,125 @@
+"""
+Micro-benchmark of atmosphere computations for one altitude, as done at each time step of
+flight segments.
+
+Compares the vectorized :class:`~fastoad.model_base.atmosphere.AtmosphereSI` and the scalar
+:class:`~fastoad.model_base.atmosphere.ScalarAtmosphereSI`, then the per-step cost of
+:meth:`~fastoad.models.performances.mission.segments.base.FlightSegment.complete_flight_point`
+when each of them is used.
+
+Then, for a large array of altitudes, compares the vectorized
+:class:`~fastoad.model_base.atmosphere.AtmosphereSI` and the table-backed
+:class:`~fastoad.model_base.atmosphere.TabulatedAtmosphereSI`.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from timeit import repeat
+from unittest.mock import patch
+
+import numpy as np
+
+from fastoad.model_base import (
+    AtmosphereSI,
+    AtmosphereTable,
+    FlightPoint,
+    ScalarAtmosphereSI,
+    TabulatedAtmosphereSI,
+)
+from fastoad.model_base.propulsion import FuelEngineSet
+from fastoad.models.performances.mission.polar import Polar
+from fastoad.models.performances.mission.segments.base import FlightSegment
+from fastoad.models.performances.mission.segments.cruise import CruiseSegment
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import RubberEngine
+
+NUMBER = 2000
+REPEAT = 5
+
+ARRAY_SIZE = 1000000
+ARRAY_NUMBER = 5
+
+
+def _time_per_call(statement) -> float:
+    """:return: best time for one call of statement, in microseconds"""
+    return min(repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1.0e6
+
+
+def _use_atmosphere(atm):
+    atm.mach = 0.78
+    return 0.5 * atm.density * atm.true_airspeed ** 2, atm.equivalent_airspeed
+
+
+def _get_properties(atm):
+    return [getattr(atm, name) for name in AtmosphereTable.PROPERTIES]
+
+
+def main():
+    segment = CruiseSegment(
+        target=FlightPoint(ground_distance=1.0e6),
+        propulsion=FuelEngineSet(RubberEngine(5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0), 2),
+        reference_area=120.0,
+        polar=Polar(np.linspace(0.0, 1.5, 10), 0.02 + 0.04 * np.linspace(0.0, 1.5, 10) ** 2),
+    )
+
+    def complete_flight_point():
+        segment.complete_flight_point(
+            FlightPoint(altitude=10000.0, mass=70000.0, mach=0.78, thrust_rate=0.8)
+        )
+
+    print()
+    print("%-50s %12s" % ("operation", "time (µs)"))
+    print(
+        "%-50s %12.2f"
+        % ("AtmosphereSI", _time_per_call(lambda: _use_atmosphere(AtmosphereSI(10000.0))))
+    )
+    print(
+        "%-50s %12.2f"
+        % (
+            "ScalarAtmosphereSI",
+            _time_per_call(lambda: _use_atmosphere(ScalarAtmosphereSI(10000.0))),
+        )
+    )
+
+    with patch.object(FlightSegment, "_get_atmosphere", staticmethod(AtmosphereSI)):
+        print(
+            "%-50s %12.2f"
+            % ("complete_flight_point() with AtmosphereSI", _time_per_call(complete_flight_point))
+        )
+    print(
+        "%-50s %12.2f"
+        % (
+            "complete_flight_point() with ScalarAtmosphereSI",
+            _time_per_call(complete_flight_point),
+        )
+    )
+
+    altitudes = np.linspace(0.0, 20000.0, ARRAY_SIZE)
+    print()
+    print("%-50s %12s" % ("all properties for %i altitudes" % ARRAY_SIZE, "time (ms)"))
+    for name, atmosphere_class in [
+        ("AtmosphereSI", AtmosphereSI),
+        ("TabulatedAtmosphereSI", TabulatedAtmosphereSI),
+    ]:
+        duration = min(
+            repeat(
+                lambda: _get_properties(atmosphere_class(altitudes)),
+                number=ARRAY_NUMBER,
+                repeat=REPEAT,
+            )
+        )
+        print("%-50s %12.2f" % (name, duration / ARRAY_NUMBER * 1.0e3))
+    print("(table max relative error: %.2g)" % TabulatedAtmosphereSI(0.0).table.max_relative_error)
+
+
+if __name__ == "__main__":
+    main()
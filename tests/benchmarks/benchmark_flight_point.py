@@ -0,0 +1,142 @@
+"""
+Micro-benchmark of :class:`~fastoad.model_base.flight_point.FlightPoint`.
+
+Compares per-instance memory and the cost of common operations of FlightPoint, whose
+fields are stored in slots, with the ones of an equivalent regular dataclass, where fields
+are stored in an instance `__dict__`.
+
+Then gives the cost of the ways to create FlightPoint instances from rows of columnar data.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import tracemalloc
+from copy import copy
+from dataclasses import asdict, fields, make_dataclass
+from timeit import repeat
+
+import numpy as np
+
+from fastoad.model_base import FlightPoint
+from fastoad.models.performances.mission.trajectory import TrajectoryBuffer
+
+NUMBER = 20000
+REPEAT = 5
+
+INSTANCE_COUNT = 100000
+
+VALUES = dict(
+    time=100.0,
+    altitude=1000.0,
+    ground_distance=20000.0,
+    mass=70000.0,
+    true_airspeed=150.0,
+    mach=0.45,
+    thrust=50000.0,
+    thrust_rate=0.9,
+    thrust_is_regulated=False,
+    sfc=1.5e-5,
+    name="climb",
+)
+
+
+def _get_dict_class():
+    """Regular dataclass with the same fields as FlightPoint."""
+    return make_dataclass(
+        "DictFlightPoint",
+        [(field.name, field.type, field.default) for field in fields(FlightPoint)],
+    )
+
+
+def _measure_memory(cls) -> float:
+    """:return: memory in bytes used by one instance, for a large number of instances"""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    instances = [cls(**VALUES) for _ in range(INSTANCE_COUNT)]
+    size = (tracemalloc.get_traced_memory()[0] - start) / len(instances)
+    tracemalloc.stop()
+    return size
+
+
+def _time(statement) -> float:
+    """:return: time in µs for one call"""
+    return min(repeat(statement, number=NUMBER, repeat=REPEAT)) / NUMBER * 1.0e6
+
+
+def _scalarize(flight_point):
+    """Behaviour of FlightPoint.scalarize() for regular dataclasses."""
+    for field_name, value in asdict(flight_point).items():
+        if np.size(value) == 1:
+            setattr(flight_point, field_name, np.asarray(value).item())
+
+
+def _compare_classes():
+    dict_class = _get_dict_class()
+    print()
+    print("%-50s %12s %12s" % ("", "dataclass", "FlightPoint"))
+    print(
+        "%-50s %12.0f %12.0f"
+        % ("memory per instance (bytes)", _measure_memory(dict_class), _measure_memory(FlightPoint))
+    )
+
+    operations = [
+        ("instantiation (µs)", lambda cls: lambda: cls(**VALUES)),
+        ("copy() (µs)", lambda cls: lambda point=cls(**VALUES): copy(point)),
+        (
+            "scalarize() (µs)",
+            lambda cls: lambda point=cls(**VALUES): point.scalarize()
+            if isinstance(point, FlightPoint)
+            else _scalarize(point),
+        ),
+    ]
+    for title, get_statement in operations:
+        print(
+            "%-50s %12.2f %12.2f"
+            % (title, _time(get_statement(dict_class)), _time(get_statement(FlightPoint)))
+        )
+
+
+def _compare_creations():
+    trajectory = TrajectoryBuffer()
+    for _ in range(10):
+        trajectory.append(FlightPoint(**VALUES))
+    data = trajectory.to_dataframe()
+    row = data.iloc[5]
+    names = list(data.columns)
+    values = [data[name].values[5] for name in names]
+
+    print()
+    print("%-50s %12s" % ("FlightPoint creation from a row", "time (µs)"))
+    print("%-50s %12.2f" % ("FlightPoint.create(dict)", _time(lambda: FlightPoint.create(VALUES))))
+    print(
+        "%-50s %12.2f"
+        % ("FlightPoint.create(pandas Series)", _time(lambda: FlightPoint.create(row)))
+    )
+    print(
+        "%-50s %12.2f"
+        % (
+            "FlightPoint.create_from_values(names, values)",
+            _time(lambda: FlightPoint.create_from_values(names, values)),
+        )
+    )
+    # pylint: disable=protected-access  # Points are cached when using trajectory[5]
+    print("%-50s %12.2f" % ("TrajectoryBuffer row", _time(lambda: trajectory._build_point(5))))
+
+
+def main():
+    _compare_classes()
+    _compare_creations()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Compares time integration schemes of flight segments on the sizing mission.
+
+For each scheme, the number of computed flight points, the computation time and the
+error on consumed fuel are reported. The reference is obtained with the explicit
+Euler scheme where time steps of the mission file are divided by REFERENCE_STEP_DIVIDER.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os.path as pth
+from time import perf_counter
+
+from scipy.constants import foot, knot, nautical_mile
+
+from fastoad.io import DataFile
+from fastoad.model_base import FlightPoint
+from fastoad.model_base.propulsion import FuelEngineSet
+from fastoad.models.performances.mission.base import FlightSequence, IFlightPart
+from fastoad.models.performances.mission.mission_definition.mission_builder import MissionBuilder
+from fastoad.models.performances.mission.mission_definition.schema import (
+    INTEGRATOR_TAG,
+    MISSION_DEFINITION_TAG,
+)
+from fastoad.models.performances.mission.segments.base import FlightSegment
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import RubberEngine
+from .. import root_folder_path
+
+MISSION_FOLDER_PATH = pth.join(
+    root_folder_path, "src", "fastoad", "models", "performances", "mission", "openmdao"
+)
+MISSION_FILE_PATH = pth.join(MISSION_FOLDER_PATH, "resources", "sizing_mission.yml")
+INPUT_FILE_PATH = pth.join(MISSION_FOLDER_PATH, "tests", "data", "test_mission.xml")
+
+REFERENCE_STEP_DIVIDER = 20.0
+
+#: Compared integrators, as they would be defined in mission file.
+INTEGRATORS = {
+    "euler": None,
+    "heun_euler": "heun_euler",
+    "bogacki_shampine": "bogacki_shampine",
+    "bogacki_shampine (relaxed)": {
+        "method": "bogacki_shampine",
+        "mass_tolerance": 0.1,
+        "distance_tolerance": 10.0,
+    },
+}
+
+
+def get_inputs() -> dict:
+    """Mission inputs, in base units."""
+    input_data = DataFile(INPUT_FILE_PATH)
+    inputs = {
+        "data:TLAR:range": 2000.0 * nautical_mile,
+        "data:TLAR:cruise_mach": 0.78,
+        "data:mission:sizing:climb:thrust_rate": 0.93,
+        "data:mission:sizing:descent:thrust_rate": 0.18,
+        "data:mission:sizing:diversion:distance": 200.0 * nautical_mile,
+        "data:mission:sizing:holding:duration": 2700.0,
+        "data:mission:sizing:taxi_in:thrust_rate": 0.3,
+        "data:mission:sizing:taxi_in:duration": 300.0,
+    }
+    for name in [
+        "data:aerodynamics:aircraft:takeoff:CL",
+        "data:aerodynamics:aircraft:takeoff:CD",
+        "data:aerodynamics:aircraft:cruise:CL",
+        "data:aerodynamics:aircraft:cruise:CD",
+    ]:
+        inputs[name] = input_data[name].value
+
+    return inputs
+
+
+def build_mission(integrator_definition, time_step_divider: float = 1.0) -> IFlightPart:
+    """
+    :param integrator_definition: mission-wide integrator setting, as in mission file
+    :param time_step_divider: time step of each segment is divided by this value
+    :return: the sizing mission
+    """
+    builder = MissionBuilder(
+        MISSION_FILE_PATH,
+        propulsion=FuelEngineSet(RubberEngine(5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0), 2),
+        reference_area=120.0,
+    )
+    if integrator_definition:
+        definition = builder.definition
+        definition[MISSION_DEFINITION_TAG]["sizing"][INTEGRATOR_TAG] = integrator_definition
+        builder.definition = definition
+
+    mission = builder.build(get_inputs(), "sizing")
+    _divide_time_steps(mission, time_step_divider)
+    return mission
+
+
+def _divide_time_steps(part: IFlightPart, divider: float):
+    if isinstance(part, FlightSegment):
+        part.time_step /= divider
+    elif isinstance(part, FlightSequence):
+        for sub_part in part.flight_sequence:
+            _divide_time_steps(sub_part, divider)
+
+
+def run_mission(mission: IFlightPart):
+    """
+    :return: computed flight points and computation time in seconds
+    """
+    start = FlightPoint(
+        time=0.0,
+        altitude=35.0 * foot,
+        ground_distance=0.0,
+        mass=70000.0,
+        true_airspeed=150.0 * knot,
+    )
+    start_time = perf_counter()
+    flight_points = mission.compute_trajectory(start)
+    return flight_points, perf_counter() - start_time
+
+
+def main():
+    reference_points, reference_duration = run_mission(build_mission(None, REFERENCE_STEP_DIVIDER))
+    mass = reference_points.column("mass")
+    reference_fuel = mass[0] - mass[-1]
+
+    print()
+    print("Sizing mission, reference fuel = %.2f kg" % reference_fuel)
+    print(
+        "(Euler scheme with time steps divided by %g: %i points, %.2f s)"
+        % (REFERENCE_STEP_DIVIDER, len(reference_points), reference_duration)
+    )
+    print()
+    print("%-28s %8s %10s %12s %10s" % ("integrator", "points", "time (s)", "fuel (kg)", "error"))
+    for name, integrator_definition in INTEGRATORS.items():
+        flight_points, duration = run_mission(build_mission(integrator_definition))
+        mass = flight_points.column("mass")
+        fuel = mass[0] - mass[-1]
+        print(
+            "%-28s %8i %10.3f %12.2f %9.4f%%"
+            % (
+                name,
+                len(flight_points),
+                duration,
+                fuel,
+                100.0 * (fuel - reference_fuel) / reference_fuel,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Micro-benchmark of
+:meth:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine.\
+compute_flight_points`.
+
+First compares the per-call cost of the scalar path, used for one FlightPoint instance, and of
+the vectorized path, used for DataFrame instances of 1, 10, 1000 and 100000 flight points.
+
+Then compares the analytic
+:class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`
+and the
+:class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.engine_deck.TabulatedRubberEngine`,
+for one flight point and for a large array of flight points, and gives the interpolation
+error of the engine deck.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from timeit import repeat
+
+import numpy as np
+import pandas as pd
+
+from fastoad.constants import EngineSetting
+from fastoad.model_base import FlightPoint
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import (
+    RubberEngine,
+    TabulatedRubberEngine,
+)
+
+ENGINE_PARAMETERS = [5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0]
+
+NUMBER = 2000
+REPEAT = 5
+
+ARRAY_SIZE = 100000
+ARRAY_NUMBER = 20
+
+PATH_SIZES = [1, 10, 1000, 100000]
+
+
+def _get_engines():
+    return [
+        ("RubberEngine", RubberEngine(*ENGINE_PARAMETERS)),
+        ("TabulatedRubberEngine (linear)", TabulatedRubberEngine(*ENGINE_PARAMETERS)),
+        (
+            "TabulatedRubberEngine (cubic)",
+            TabulatedRubberEngine(*ENGINE_PARAMETERS, deck_method="cubic"),
+        ),
+    ]
+
+
+def _get_flight_points(size: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "mach": np.random.uniform(0.1, 0.9, size),
+            "altitude": np.random.uniform(0.0, 12000.0, size),
+            "engine_setting": np.random.choice([EngineSetting.CLIMB, EngineSetting.CRUISE], size),
+            "thrust_is_regulated": False,
+            "thrust_rate": np.random.uniform(0.3, 1.0, size),
+            "thrust": 0.0,
+        }
+    )
+
+
+def _compare_paths():
+    engine = RubberEngine(*ENGINE_PARAMETERS)
+    flight_point = FlightPoint(
+        mach=0.78,
+        altitude=10000.0,
+        engine_setting=EngineSetting.CRUISE,
+        thrust_is_regulated=False,
+        thrust_rate=0.8,
+    )
+
+    print()
+    print("%-50s %12s %12s" % ("RubberEngine.compute_flight_points()", "µs/call", "µs/point"))
+    duration = (
+        min(
+            repeat(lambda: engine.compute_flight_points(flight_point), number=NUMBER, repeat=REPEAT)
+        )
+        / NUMBER
+        * 1.0e6
+    )
+    print("%-50s %12.2f %12.4f" % ("1 flight point (scalar path)", duration, duration))
+    for size in PATH_SIZES:
+        flight_points = _get_flight_points(size)
+        number = max(1, NUMBER // size)
+        duration = (
+            min(
+                repeat(
+                    lambda: engine.compute_flight_points(flight_points),
+                    number=number,
+                    repeat=REPEAT,
+                )
+            )
+            / number
+            * 1.0e6
+        )
+        print(
+            "%-50s %12.2f %12.4f"
+            % ("%i flight point(s) (vectorized path)" % size, duration, duration / size)
+        )
+
+
+def main():
+    np.random.seed(0)
+    _compare_paths()
+
+    flight_point = FlightPoint(
+        mach=0.78,
+        altitude=10000.0,
+        engine_setting=EngineSetting.CRUISE,
+        thrust_is_regulated=False,
+        thrust_rate=0.8,
+    )
+    print()
+    print("%-50s %12s" % ("compute_flight_points() for 1 point", "time (µs)"))
+    for name, engine in _get_engines():
+        duration = min(
+            repeat(
+                lambda: engine.compute_flight_points(flight_point), number=NUMBER, repeat=REPEAT,
+            )
+        )
+        print("%-50s %12.2f" % (name, duration / NUMBER * 1.0e6))
+
+    flight_points = _get_flight_points(ARRAY_SIZE)
+
+    print()
+    print(
+        "%-50s %12s %12s"
+        % ("compute_flight_points() for %i points" % ARRAY_SIZE, "time (ms)", "max rel. err.")
+    )
+    reference_sfc = None
+    for name, engine in _get_engines():
+        duration = min(
+            repeat(
+                lambda: engine.compute_flight_points(flight_points),
+                number=ARRAY_NUMBER,
+                repeat=REPEAT,
+            )
+        )
+        engine.compute_flight_points(flight_points)
+        sfc, thrust = flight_points.sfc.values.copy(), flight_points.thrust.values.copy()
+        if reference_sfc is None:
+            reference_sfc, reference_thrust = sfc, thrust
+        error = max(
+            np.max(np.abs(sfc / reference_sfc - 1.0)),
+            np.max(np.abs(thrust / reference_thrust - 1.0)),
+        )
+        print("%-50s %12.2f %12.2g" % (name, duration / ARRAY_NUMBER * 1.0e3, error))
+
+    for name, engine in _get_engines()[1:]:
+        print("(%s deck max relative error: %.2g)" % (name, engine.deck.max_relative_error))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Micro-benchmark of
+:meth:`~fastoad.models.propulsion.fuel_propulsion.tabular_engine.tabular_engine.TabularEngine.\
+compute_flight_points`.
+
+An engine deck is computed with
+:class:`~fastoad.models.propulsion.fuel_propulsion.rubber_engine.rubber_engine.RubberEngine`
+and saved as CSV and NPZ files, whose loading times are compared.
+
+Then batch evaluation of the tabular engine is compared to the one of RubberEngine, for
+flight points where thrust rate is imposed, where thrust is regulated, and for a mix of both.
+"""
+#  This file is part of FAST-OAD : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2021 ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os.path as pth
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+import numpy as np
+import pandas as pd
+
+from fastoad.constants import EngineSetting
+from fastoad.model_base import FlightPoint
+from fastoad.models.propulsion.fuel_propulsion.rubber_engine import RubberEngine
+from fastoad.models.propulsion.fuel_propulsion.tabular_engine import EngineDeck, TabularEngine
+
+ENGINE_PARAMETERS = [5.0, 30.0, 1500.0, 1.0e5, 0.95, 10000.0]
+
+ENGINE_SETTINGS = [EngineSetting.CLIMB, EngineSetting.CRUISE]
+MACHS = np.linspace(0.0, 1.0, 21)
+ALTITUDES = np.linspace(0.0, 13000.0, 53)
+THRUST_RATES = np.linspace(0.0, 1.0, 21)
+
+NUMBER = 2000
+REPEAT = 5
+
+ARRAY_SIZE = 100000
+ARRAY_NUMBER = 20
+
+LOAD_NUMBER = 5
+
+
+def _get_deck_data() -> pd.DataFrame:
+    grid = np.meshgrid(ENGINE_SETTINGS, MACHS, ALTITUDES, THRUST_RATES, indexing="ij")
+    data = pd.DataFrame(
+        {
+            "engine_setting": grid[0].ravel(),
+            "mach": grid[1].ravel(),
+            "altitude": grid[2].ravel(),
+            "thrust_is_regulated": False,
+            "thrust_rate": grid[3].ravel(),
+            "thrust": 0.0,
+        }
+    )
+    RubberEngine(*ENGINE_PARAMETERS).compute_flight_points(data)
+    data["thrust_rate"] = grid[3].ravel()
+    return data[["engine_setting", "mach", "altitude", "thrust_rate", "thrust", "sfc"]]
+
+
+def _get_flight_points(size: int, regulated_ratio: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "mach": np.random.uniform(0.1, 0.9, size),
+            "altitude": np.random.uniform(0.0, 12000.0, size),
+            "engine_setting": np.random.choice(ENGINE_SETTINGS, size),
+            "thrust_is_regulated": np.random.uniform(0.0, 1.0, size) < regulated_ratio,
+            "thrust_rate": np.random.uniform(0.3, 1.0, size),
+            "thrust": np.random.uniform(5000.0, 20000.0, size),
+        }
+    )
+
+
+def _compare_loading(folder_path: str) -> str:
+    data = _get_deck_data()
+    shape = (len(ENGINE_SETTINGS), len(MACHS), len(ALTITUDES), len(THRUST_RATES))
+    deck = EngineDeck(
+        MACHS,
+        ALTITUDES,
+        THRUST_RATES,
+        data.thrust.values.reshape(shape),
+        data.sfc.values.reshape(shape),
+        ENGINE_SETTINGS,
+    )
+    csv_file_path = pth.join(folder_path, "deck.csv")
+    npz_file_path = pth.join(folder_path, "deck.npz")
+    data.to_csv(csv_file_path, index=False)
+    deck.save_npz(npz_file_path)
+
+    print()
+    print("%-50s %12s" % ("EngineDeck.load() for %i nodes" % len(data), "time (ms)"))
+    for name, file_path in [
+        ("CSV file", csv_file_path),
+        ("NPZ file (memory-mapped)", npz_file_path),
+    ]:
+        duration = min(
+            repeat(lambda: EngineDeck.load(file_path), number=LOAD_NUMBER, repeat=REPEAT)
+        )
+        print("%-50s %12.2f" % (name, duration / LOAD_NUMBER * 1.0e3))
+
+    return npz_file_path
+
+
+def main():
+    np.random.seed(0)
+    with TemporaryDirectory() as folder_path:
+        deck_file_path = _compare_loading(folder_path)
+        engines = [
+            ("RubberEngine", RubberEngine(*ENGINE_PARAMETERS)),
+            ("TabularEngine", TabularEngine(EngineDeck.load(deck_file_path))),
+        ]
+
+        flight_point = FlightPoint(
+            mach=0.78, altitude=10000.0, engine_setting=EngineSetting.CRUISE, thrust=15000.0,
+        )
+        print()
+        print("%-50s %12s" % ("compute_flight_points() for 1 regulated point", "time (µs)"))
+        for name, engine in engines:
+            duration = min(
+                repeat(
+                    lambda: engine.compute_flight_points(flight_point),
+                    number=NUMBER,
+                    repeat=REPEAT,
+                )
+            )
+            print("%-50s %12.2f" % (name, duration / NUMBER * 1.0e6))
+
+        for title, regulated_ratio in [
+            ("thrust rate imposed", 0.0),
+            ("thrust regulated", 1.0),
+            ("mixed", 0.5),
+        ]:
+            flight_points = _get_flight_points(ARRAY_SIZE, regulated_ratio)
+            print()
+            print(
+                "%-50s %12s %12s"
+                % (
+                    "compute_flight_points() for %i points (%s)" % (ARRAY_SIZE, title),
+                    "time (ms)",
+                    "max rel. err.",
+                )
+            )
+            reference_thrust = None
+            for name, engine in engines:
+                points = flight_points.copy()
+                duration = min(
+                    repeat(
+                        lambda: engine.compute_flight_points(points),
+                        number=ARRAY_NUMBER,
+                        repeat=REPEAT,
+                    )
+                )
+                points = flight_points.copy()
+                engine.compute_flight_points(points)
+                thrust = points.thrust.values
+                if reference_thrust is None:
+                    reference_thrust, reference_sfc = thrust, points.sfc.values
+                error = max(
+                    np.max(np.abs(thrust / reference_thrust - 1.0)),
+                    np.max(np.abs(points.sfc.values / reference_sfc - 1.0)),
+                )
+                print("%-50s %12.2f %12.2g" % (name, duration / ARRAY_NUMBER * 1.0e3, error))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ import shutil
 from dataclasses import dataclass
 from platform import system
 from shutil import rmtree
+from typing import List, Tuple
 
 import numpy as np
 import openmdao.api as om
@@ -109,6 +110,79 @@ def test_non_regression_mission(cleanup):
     )
 
 
+def test_mission_fidelity_schedule(cleanup):
+    """
+    Converged results of the sizing loop are the same with or without the fidelity schedule
+    of mission computations.
+    """
+    problem, _ = _run_mission_problem("mission_full_fidelity", fidelity_level_count=1)
+    scheduled_problem, levels = _run_mission_problem(
+        "mission_fidelity_schedule", fidelity_level_count=3
+    )
+
+    # Coarse levels have been used, and the last mission computation is a nominal one
+    schedule = scheduled_problem.model.performance.mission_computation.fidelity_schedule
+    assert schedule.computation_counts[0] > 0
+    assert levels[-1] == schedule.nominal_level
+
+    # Results match within the relative tolerance of the sizing loop
+    _check_weight_performance_loop(scheduled_problem)
+    ref_data = DataFile(pth.join(DATA_FOLDER_PATH, "CeRAS01_legacy_mission_result.xml"))
+    for ref_var in ref_data:
+        try:
+            value = scheduled_problem.get_val(ref_var.name, units=ref_var.units)
+        except KeyError:
+            continue
+        ref_value = problem.get_val(ref_var.name, units=ref_var.units)
+        assert_allclose(value, ref_value, rtol=1.0e-4, atol=1.0e-10, err_msg=ref_var.name)
+
+
+def _run_mission_problem(result_dir, fidelity_level_count) -> Tuple[om.Problem, List[int]]:
+    """
+    Runs the sizing loop of oad_process_mission.yml.
+
+    :param result_dir: relative name, folder will be in RESULTS_FOLDER_PATH
+    :param fidelity_level_count: the fidelity_level_count option of mission component
+    :return: the problem, after run, and the fidelity level of each mission computation
+    """
+    conf_file = "oad_process_mission.yml"
+    configuration_file_path = pth.join(RESULTS_FOLDER_PATH, result_dir, conf_file)
+    api.generate_configuration_file(configuration_file_path)  # just ensure folders are created...
+    shutil.copy(pth.join(DATA_FOLDER_PATH, conf_file), configuration_file_path)
+    configurator = FASTOADProblemConfigurator(configuration_file_path)
+    configurator._set_configuration_modifier(FidelityConfigurator(fidelity_level_count))
+
+    configurator.write_needed_inputs(
+        pth.join(DATA_FOLDER_PATH, "CeRAS01_legacy_mission_result.xml")
+    )
+    problem = configurator.get_problem(read_inputs=True)
+    problem.setup()
+
+    # Fidelity level is recorded for each actual mission computation
+    levels = []
+    component = problem.model.performance.mission_computation
+    compute_mission = component._compute_mission_with_stats
+
+    def _compute_mission_with_stats(inputs, outputs):
+        levels.append(component.fidelity_level)
+        compute_mission(inputs, outputs)
+
+    component._compute_mission_with_stats = _compute_mission_with_stats
+
+    problem.run_model()
+    return problem, levels
+
+
+@dataclass
+class FidelityConfigurator(_IConfigurationModifier):
+    """Overwrite fidelity schedule setting of mission component"""
+
+    fidelity_level_count: int
+
+    def modify(self, problem: om.Problem):
+        problem.model.performance._OPTIONS["fidelity_level_count"] = self.fidelity_level_count
+
+
 @dataclass
 class XFOILConfigurator(_IConfigurationModifier):
     """Overwrite XFOIL usage setting of configuration file"""